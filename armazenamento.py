@@ -0,0 +1,92 @@
+import sqlite3
+import threading
+from typing import Iterable, Iterator, Optional
+
+from modelos import CAMPOS_PESSOA, Pessoa
+
+COLUNAS = ("id",) + CAMPOS_PESSOA
+UPSERT = """
+INSERT INTO pessoas (id, nome, idade, sexo, cargo, abdominal, flexao, corrida)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    nome = excluded.nome,
+    idade = excluded.idade,
+    sexo = excluded.sexo,
+    cargo = excluded.cargo,
+    abdominal = excluded.abdominal,
+    flexao = excluded.flexao,
+    corrida = excluded.corrida
+"""
+
+
+class ArmazenamentoPessoas:
+    """Persistência dos candidatos em SQLite (modo WAL), gravando uma linha por alteração."""
+
+    def __init__(self, caminho: str, tamanho_lote: int = 500):
+        self.caminho = caminho
+        self.tamanho_lote = tamanho_lote
+        self._conexao: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()  # Os handlers do Flet rodam em threads diferentes
+
+    @property
+    def conexao(self) -> sqlite3.Connection:
+        """Abre o banco só no primeiro uso, para não atrasar a abertura do app."""
+        if self._conexao is None:
+            conexao = sqlite3.connect(self.caminho, check_same_thread=False)
+            conexao.execute("PRAGMA journal_mode=WAL")
+            conexao.execute("PRAGMA synchronous=NORMAL")
+            conexao.execute(
+                """
+                CREATE TABLE IF NOT EXISTS pessoas (
+                    id TEXT PRIMARY KEY,
+                    nome TEXT NOT NULL,
+                    idade INTEGER NOT NULL,
+                    sexo TEXT NOT NULL,
+                    cargo TEXT NOT NULL,
+                    abdominal INTEGER,
+                    flexao INTEGER,
+                    corrida INTEGER
+                )
+                """
+            )
+            conexao.commit()
+            self._conexao = conexao
+        return self._conexao
+
+    def salvar(self, pessoa: Pessoa):
+        """Insere ou atualiza (upsert) apenas a linha da pessoa informada."""
+        with self._lock, self.conexao:
+            self.conexao.execute(
+                UPSERT,
+                (pessoa.id, pessoa.nome, pessoa.idade, pessoa.sexo, pessoa.cargo,
+                 pessoa.abdominal, pessoa.flexao, pessoa.corrida),
+            )
+
+    def salvar_lote(self, pessoas: Iterable[Pessoa]):
+        """Grava várias pessoas numa única transação (usado na importação)."""
+        with self._lock, self.conexao:
+            self.conexao.executemany(
+                UPSERT,
+                ((p.id, p.nome, p.idade, p.sexo, p.cargo, p.abdominal, p.flexao, p.corrida) for p in pessoas),
+            )
+
+    def excluir(self, pessoa: Pessoa):
+        with self._lock, self.conexao:
+            self.conexao.execute("DELETE FROM pessoas WHERE id = ?", (pessoa.id,))
+
+    def carregar(self) -> Iterator[Pessoa]:
+        """Lê as pessoas em lotes, na ordem de cadastro, sem montar tudo em memória de uma vez."""
+        with self._lock:
+            cursor = self.conexao.execute(f"SELECT {', '.join(COLUNAS)} FROM pessoas ORDER BY rowid")
+            linhas = cursor.fetchmany(self.tamanho_lote)
+        while linhas:
+            for id_, nome, idade, sexo, cargo, abdominal, flexao, corrida in linhas:
+                yield Pessoa(nome, idade, sexo, cargo, abdominal, flexao, corrida, id=id_)
+            with self._lock:
+                linhas = cursor.fetchmany(self.tamanho_lote)
+
+    def fechar(self):
+        with self._lock:
+            if self._conexao is not None:
+                self._conexao.close()
+                self._conexao = None
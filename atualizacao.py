@@ -0,0 +1,74 @@
+import threading
+from typing import Dict, Optional
+
+import flet as ft
+
+from instrumentacao import Instrumentacao
+
+
+class AgendadorAtualizacoes:
+    """Junta os pedidos de atualização de uma sessão num único page.update() por volta do loop.
+
+    Os handlers marcam o que alteraram em vez de chamar update(); o envio fica para a próxima
+    volta do loop de eventos, quando tudo o que foi marcado segue num só lote. Marcar a página
+    inteira engloba os controles marcados. Com a instrumentação ligada, os contadores
+    "atualizacoes.pedidas" e "atualizacoes.enviadas" mostram quantos envios foram poupados.
+    """
+
+    def __init__(self, page: ft.Page, instrumentacao: Optional[Instrumentacao] = None):
+        self.page = page
+        self.instrumentacao = instrumentacao
+        self.pedidos = 0
+        self.envios = 0
+        self._controles: Dict[ft.Control, None] = {}  # Na ordem em que foram marcados
+        self._pagina = False
+        self._agendado = False
+        self._lock = threading.Lock()
+
+    @property
+    def economizados(self) -> int:
+        return self.pedidos - self.envios
+
+    def _acumular(self, controles: tuple):
+        self.pedidos += 1
+        if controles:
+            self._controles.update(dict.fromkeys(controles))
+        else:
+            self._pagina = True
+        if self.instrumentacao is not None:
+            self.instrumentacao.contar("atualizacoes.pedidas")
+
+    def marcar(self, *controles: ft.Control):
+        """Envia os controles (sem argumentos, a página inteira) na próxima volta do loop."""
+        with self._lock:
+            self._acumular(controles)
+            if self._agendado:
+                return
+            self._agendado = True
+        # O envio roda no contexto de quem marcou primeiro: a instrumentação o atribui a esse handler
+        self.page.loop.call_soon_threadsafe(self._enviar_pendentes)
+
+    def enviar(self, *controles: ft.Control):
+        """Como `marcar`, mas envia já, junto com o que estava pendente.
+
+        Para quando o cliente precisa ter os controles antes do próximo passo (um focus(), por exemplo).
+        """
+        with self._lock:
+            self._acumular(controles)
+        self._enviar_pendentes()
+
+    def _enviar_pendentes(self):
+        with self._lock:
+            self._agendado = False
+            pagina, controles = self._pagina, [c for c in self._controles if c.page is not None]
+            self._pagina = False
+            self._controles = {}
+            if not pagina and not controles:
+                return
+            self.envios += 1
+        if self.instrumentacao is not None:
+            self.instrumentacao.contar("atualizacoes.enviadas")
+        if pagina:
+            self.page.update()
+        else:
+            self.page.update(*controles)
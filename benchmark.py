@@ -0,0 +1,284 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+import flet as ft
+from flet.core.connection import Connection
+from flet.core.protocol import PageCommandResponsePayload, PageCommandsBatchResponsePayload
+from flet.core.pubsub.pubsub_hub import PubSubHub
+
+from armazenamento import ArmazenamentoPessoas
+from busca import IndiceBusca
+from cadastro import CadastroPessoas
+from modelos import Pessoa
+from ordenacao import IndiceOrdenado
+
+TAMANHOS_PADRAO = [100, 10_000, 100_000]
+REPETICOES_PADRAO = 3
+TOLERANCIA_PADRAO = 0.25  # Aumento relativo aceito em relação à base antes de acusar regressão
+TERMO_BUSCA = "silva"
+ROTAS = ["/", "/selecao_taf", "/cadastro", "/lista", "/dados", "/dados_todos"]
+
+# Tempo máximo (mediana, em segundos) de cada caso, em qualquer tamanho de cohort.
+# A lista e a tabela são paginadas, então não devem crescer com o cohort.
+LIMITES_SEGUNDOS = {
+    "lista": 0.25,
+    "lista_busca": 0.5,
+    "tabela": 0.5,
+    **{f"rota:{rota}": 1.0 for rota in ROTAS},
+}
+# A exportação cresce com o cohort: um custo fixo (processo filho) mais um tanto por 1000 candidatos
+LIMITE_EXPORTACAO_FIXO = 1.0
+LIMITE_EXPORTACAO_POR_MIL = 0.25
+
+NOMES = ["Ana", "Bruno", "Carla", "Diego", "Elisa", "Fábio", "Gabriela", "Hugo", "Íris", "João",
+         "Larissa", "Marcos", "Natália", "Otávio", "Paula", "Rafael", "Sônia", "Tiago", "Vera", "Wagner"]
+SOBRENOMES = ["Silva", "Santos", "Oliveira", "Souza", "Lima", "Pereira", "Costa", "Ferreira",
+              "Rodrigues", "Almeida", "Nascimento", "Araújo", "Gonçalves", "Ribeiro", "Conceição"]
+CARGOS = ["Soldado", "Cabo", "Sargento", "Tenente", "Capitão"]
+
+
+class ConexaoFalsa(Connection):
+    """Conexão sem cliente: aceita os comandos do Flet e conta o que seria enviado."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        super().__init__()
+        self.page_url = "http://localhost"
+        self.pubsubhub = PubSubHub(loop)
+        self.bytes_enviados = 0
+        self._ids = 0
+
+    def send_command(self, session_id: str, command):
+        return PageCommandResponsePayload(result="", error="")
+
+    def send_commands(self, session_id: str, commands: List):
+        resultados = []
+        for comando in commands:
+            self.bytes_enviados += len(json.dumps(comando, default=vars))
+            if comando.name == "add":
+                ids = []
+                for _ in comando.commands:
+                    self._ids += 1
+                    ids.append(f"_{self._ids}")
+                resultados.append(" ".join(ids))
+        return PageCommandsBatchResponsePayload(results=resultados, error="")
+
+
+def gerar_pessoas(quantidade: int, semente: int = 0) -> List[Pessoa]:
+    """Cohort sintético; cerca de um quinto dos resultados ainda não foi lançado."""
+    aleatorio = random.Random(semente)
+
+    def resultado(minimo: int, maximo: int) -> Optional[int]:
+        return None if aleatorio.random() < 0.2 else aleatorio.randint(minimo, maximo)
+
+    return [
+        Pessoa(
+            f"{aleatorio.choice(NOMES)} {aleatorio.choice(SOBRENOMES)} {aleatorio.choice(SOBRENOMES)}",
+            aleatorio.randint(18, 55),
+            aleatorio.choice(["masculino", "feminino"]),
+            aleatorio.choice(CARGOS),
+            resultado(10, 60),
+            resultado(0, 45),
+            resultado(540, 900),
+        )
+        for _ in range(quantidade)
+    ]
+
+
+def instalar_cohort(app, pessoas: List[Pessoa], caminho_banco: str):
+    """Troca o cadastro compartilhado do app por um novo, gravado em `caminho_banco`."""
+    cadastro = CadastroPessoas(ArmazenamentoPessoas(caminho_banco))
+    app.indice_busca = IndiceBusca()
+    app.indice_ordenado = IndiceOrdenado()
+    cadastro.ouvir(app.indice_busca)
+    cadastro.ouvir(app.indice_ordenado)
+    cadastro.adicionar_lote(pessoas)
+    app.cadastro = cadastro
+    # Caches do app ligados ao cadastro anterior
+    app._pontuacao = app._estatisticas = app._ranking = None
+
+
+class Bancada:
+    """Abre sessões do app numa página falsa e mede tempo, memória e bytes de cada ação."""
+
+    def __init__(self, app, repeticoes: int):
+        self.app = app
+        self.repeticoes = repeticoes
+        self.loop = asyncio.get_running_loop()
+
+    async def nova_sessao(self, rota: str):
+        """Abre uma sessão já na `rota` e espera a navegação inicial de main() terminar."""
+        conexao = ConexaoFalsa(self.loop)
+        page = ft.Page(conexao, "benchmark", loop=self.loop)
+        page.route = rota
+        sessao = self.app.main(page)
+        while not page.views or page.views[-1].route != rota:
+            await asyncio.sleep(0.001)
+        return page, conexao, sessao
+
+    async def medir(self, caso: str, tamanho: int, rota: str, acao: Callable) -> dict:
+        """Roda `acao(page, sessao)` numa sessão nova, aberta em `rota`, a cada repetição.
+
+        O tempo vem das repetições sem tracemalloc; o pico de memória, de uma execução extra
+        com tracemalloc (só deste processo: a exportação grava num processo filho).
+        """
+        tempos = []
+        bytes_enviados = 0
+        for _ in range(self.repeticoes):
+            page, conexao, sessao = await self.nova_sessao(rota)
+            conexao.bytes_enviados = 0
+            inicio = time.perf_counter()
+            await acao(page, sessao)
+            await asyncio.sleep(0)  # O que a ação marcou é enviado na volta seguinte do loop
+            tempos.append(time.perf_counter() - inicio)
+            bytes_enviados = conexao.bytes_enviados
+
+        page, conexao, sessao = await self.nova_sessao(rota)
+        tracemalloc.start()
+        await acao(page, sessao)
+        await asyncio.sleep(0)
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return {
+            "caso": caso,
+            "tamanho": tamanho,
+            "segundos": statistics.median(tempos),
+            "primeira": tempos[0],
+            "melhor": min(tempos),
+            "pico_memoria_kb": round(pico / 1024),
+            "bytes_enviados": bytes_enviados,
+        }
+
+
+async def _lista(page, sessao):
+    sessao.search_field.value = ""
+    sessao.atualizar_lista_pessoas()
+
+
+async def _lista_busca(page, sessao):
+    sessao.search_field.value = TERMO_BUSCA
+    sessao.atualizar_lista_pessoas()
+
+
+async def _tabela(page, sessao):
+    sessao.generate_data_table()
+
+
+async def _exportacao(page, sessao):
+    await sessao.export_to_excel(None)
+
+
+def _rota(rota: str):
+    async def acao(page, sessao):
+        page.route = rota
+        await sessao.route_change(None)
+    return acao
+
+
+# caso: (rota em que a sessão é aberta, ação medida)
+CASOS: Dict[str, Tuple[str, Callable]] = {
+    "lista": ("/lista", _lista),
+    "lista_busca": ("/lista", _lista_busca),
+    "tabela": ("/", _tabela),  # Página montada do zero, com a pontuação já calculada
+    "exportacao": ("/dados_todos", _exportacao),
+    **{f"rota:{rota}": ("/", _rota(rota)) for rota in ROTAS},
+}
+
+
+async def executar(tamanhos: List[int], repeticoes: int, casos: List[str], pasta: str) -> List[dict]:
+    import main as app  # Importado depois do chdir: o banco e o XLSX ficam na pasta temporária
+
+    bancada = Bancada(app, repeticoes)
+    resultados = []
+    try:
+        for tamanho in tamanhos:
+            inicio = time.perf_counter()
+            instalar_cohort(app, gerar_pessoas(tamanho), os.path.join(pasta, f"cohort_{tamanho}.db"))
+            print(f"cohort de {tamanho}: gerado em {time.perf_counter() - inicio:.2f}s", file=sys.stderr)
+            for caso in casos:
+                resultado = await bancada.medir(caso, tamanho, *CASOS[caso])
+                print(
+                    f"  {caso:<20} {resultado['segundos'] * 1000:10.1f} ms"
+                    f" {resultado['pico_memoria_kb']:10d} KB {resultado['bytes_enviados']:10d} B",
+                    file=sys.stderr,
+                )
+                resultados.append(resultado)
+            app.cadastro.armazenamento.fechar()
+    finally:
+        app.tarefas.encerrar()
+    return resultados
+
+
+def limite_segundos(caso: str, tamanho: int) -> Optional[float]:
+    if caso == "exportacao":
+        return LIMITE_EXPORTACAO_FIXO + tamanho / 1000 * LIMITE_EXPORTACAO_POR_MIL
+    return LIMITES_SEGUNDOS.get(caso)
+
+
+def verificar(resultados: List[dict], base: Optional[List[dict]], tolerancia: float) -> List[str]:
+    """Casos acima do limite absoluto ou mais lentos que a base além da tolerância."""
+    falhas = []
+    anteriores = {(r["caso"], r["tamanho"]): r for r in base or []}
+    for resultado in resultados:
+        chave = (resultado["caso"], resultado["tamanho"])
+        nome = f"{resultado['caso']} ({resultado['tamanho']})"
+        limite = limite_segundos(*chave)
+        if limite is not None and resultado["segundos"] > limite:
+            falhas.append(f"{nome}: {resultado['segundos']:.3f}s acima do limite de {limite:.3f}s")
+        anterior = anteriores.get(chave)
+        if anterior is not None:
+            for medida in ("segundos", "pico_memoria_kb"):
+                if resultado[medida] > anterior[medida] * (1 + tolerancia):
+                    falhas.append(f"{nome}: {medida} foi de {anterior[medida]} para {resultado[medida]}")
+    return falhas
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark sem interface das telas do TAF App")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=TAMANHOS_PADRAO,
+                        help="tamanhos dos cohorts sintéticos (padrão: 100 10000 100000)")
+    parser.add_argument("--repeticoes", type=int, default=REPETICOES_PADRAO, help="execuções cronometradas por caso")
+    parser.add_argument("--casos", nargs="+", choices=list(CASOS), default=list(CASOS), help="casos a medir")
+    parser.add_argument("--saida", default="benchmark.json", help="arquivo JSON com os resultados")
+    parser.add_argument("--base", help="resultados anteriores (JSON) para comparar")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA_PADRAO,
+                        help="piora relativa aceita em relação à base (padrão: 0.25)")
+    args = parser.parse_args()
+
+    saida = os.path.abspath(args.saida)
+    base = None
+    if args.base:
+        with open(args.base, encoding="utf-8") as arquivo:
+            base = json.load(arquivo)["resultados"]
+
+    with tempfile.TemporaryDirectory(prefix="taf_benchmark_") as pasta:
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        os.chdir(pasta)
+        resultados = asyncio.run(executar(args.tamanhos, args.repeticoes, args.casos, pasta))
+
+    falhas = verificar(resultados, base, args.tolerancia)
+    with open(saida, "w", encoding="utf-8") as arquivo:
+        json.dump(
+            {
+                "python": sys.version.split()[0],
+                "flet": ft.version.version,
+                "repeticoes": args.repeticoes,
+                "resultados": resultados,
+                "falhas": falhas,
+            },
+            arquivo,
+            indent=2,
+            ensure_ascii=False,
+        )
+    for falha in falhas:
+        print(f"REGRESSÃO: {falha}", file=sys.stderr)
+    sys.exit(1 if falhas else 0)
@@ -0,0 +1,99 @@
+import threading
+import unicodedata
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple
+
+from modelos import Pessoa
+
+
+def normalizar(texto: str) -> str:
+    """Remove acentos e caixa para comparar textos digitados de formas diferentes."""
+    if texto.isascii():  # Sem acentos não há o que decompor; é o caso da maioria dos nomes
+        return texto.casefold().strip()
+    decomposto = unicodedata.normalize("NFKD", texto)
+    return "".join(c for c in decomposto if not unicodedata.combining(c)).casefold().strip()
+
+
+class IndiceBusca:
+    """Índice de n-gramas sobre nome e cargo, mantido a cada cadastro, edição e exclusão."""
+
+    def __init__(self, n: int = 3):
+        self.n = n
+        self._pessoas: Dict[str, Pessoa] = {}
+        self._chaves: Dict[str, Tuple[str, str]] = {}  # id -> (nome, cargo) normalizados
+        self._ordem: Dict[str, int] = {}  # id -> posição de cadastro, para manter a ordem da lista
+        self._postagens: Dict[str, Set[str]] = defaultdict(set)  # n-grama -> ids
+        self._proxima_ordem = 0
+        self._lock = threading.RLock()  # Buscas de várias sessões enquanto outras alteram o cadastro
+
+    def __len__(self) -> int:
+        return len(self._pessoas)
+
+    def _ngramas(self, texto: str) -> Set[str]:
+        return {texto[i:i + self.n] for i in range(len(texto) - self.n + 1)}
+
+    def _indexar(self, pessoa: Pessoa):
+        chaves = (normalizar(pessoa.nome), normalizar(pessoa.cargo))
+        self._chaves[pessoa.id] = chaves
+        for chave in chaves:
+            for ngrama in self._ngramas(chave):
+                self._postagens[ngrama].add(pessoa.id)
+
+    def _desindexar(self, id_pessoa: str):
+        for chave in self._chaves.pop(id_pessoa, ()):
+            for ngrama in self._ngramas(chave):
+                ids = self._postagens.get(ngrama)
+                if ids is not None:
+                    ids.discard(id_pessoa)
+                    if not ids:
+                        del self._postagens[ngrama]
+
+    def adicionar(self, pessoa: Pessoa):
+        with self._lock:
+            if pessoa.id in self._pessoas:
+                self.atualizar(pessoa)
+                return
+            self._pessoas[pessoa.id] = pessoa
+            self._ordem[pessoa.id] = self._proxima_ordem
+            self._proxima_ordem += 1
+            self._indexar(pessoa)
+
+    def atualizar(self, pessoa: Pessoa):
+        """Reindexa a pessoa após uma edição, mantendo sua posição na lista."""
+        with self._lock:
+            if pessoa.id not in self._pessoas:
+                self.adicionar(pessoa)
+                return
+            self._desindexar(pessoa.id)
+            self._pessoas[pessoa.id] = pessoa
+            self._indexar(pessoa)
+
+    def remover(self, pessoa: Pessoa):
+        with self._lock:
+            if self._pessoas.pop(pessoa.id, None) is None:
+                return
+            self._desindexar(pessoa.id)
+            del self._ordem[pessoa.id]
+
+    def buscar(self, termo: str) -> List[Pessoa]:
+        """Retorna, na ordem de cadastro, as pessoas cujo nome ou cargo contém o termo."""
+        with self._lock:
+            termo = normalizar(termo or "")
+            if not termo:
+                return list(self._pessoas.values())
+
+            if len(termo) < self.n:
+                # Termos curtos não têm n-gramas; compara direto com as chaves já normalizadas
+                candidatos = self._chaves.keys()
+            else:
+                postagens = sorted(
+                    (self._postagens.get(ngrama, set()) for ngrama in self._ngramas(termo)), key=len
+                )
+                candidatos = set.intersection(*postagens) if postagens[0] else set()
+
+            encontrados = [
+                id_pessoa for id_pessoa in candidatos
+                if any(termo in chave for chave in self._chaves[id_pessoa])
+            ]
+            encontrados.sort(key=self._ordem.__getitem__)
+            return [self._pessoas[id_pessoa] for id_pessoa in encontrados]
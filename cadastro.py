@@ -0,0 +1,179 @@
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from armazenamento import ArmazenamentoPessoas
+from busca import normalizar
+from modelos import Pessoa
+from sincronizacao import Diario, campos_pessoa
+
+
+def chave_duplicidade(nome: str, idade: int) -> Tuple[str, int]:
+    return normalizar(nome), idade
+
+
+def _adicionar_lote(ouvinte, lote: List[Pessoa]):
+    # Índices com `adicionar_lote` montam a estrutura de uma vez; os demais recebem pessoa a pessoa
+    adicionar_lote = getattr(ouvinte, "adicionar_lote", None)
+    if adicionar_lote is not None:
+        adicionar_lote(lote)
+    else:
+        for pessoa in lote:
+            ouvinte.adicionar(pessoa)
+
+
+class CadastroPessoas:
+    """Fonte única dos candidatos em memória, indexados pelo id.
+
+    Cada alteração é gravada no armazenamento, repassada aos índices registrados com
+    `ouvir` (que têm os métodos adicionar, atualizar e remover, e opcionalmente
+    adicionar_lote para cargas grandes) e incrementa `versao`.
+    É compartilhado por todas as sessões do app. Edições e exclusões gravam no disco
+    dentro do lock, para que uma exclusão nunca seja desfeita por uma edição concorrente;
+    os índices têm locks próprios, então buscas e páginas não esperam pelas gravações.
+    Com um `diario`, cada alteração também vira um evento para a sincronização entre aparelhos.
+    """
+
+    def __init__(self, armazenamento: ArmazenamentoPessoas, diario: Optional[Diario] = None):
+        self.armazenamento = armazenamento
+        self.diario = diario
+        self.versao = 0
+        self._por_id: Dict[str, Pessoa] = {}  # Mantém a ordem de cadastro
+        self._por_chave: Dict[Tuple[str, int], Set[str]] = defaultdict(set)  # (nome, idade) -> ids
+        self._chaves: Dict[str, Tuple[str, int]] = {}
+        self._ouvintes: list = []
+        self._carregado = False
+        self._carregamento_lock = threading.Lock()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._por_id)
+
+    def __iter__(self) -> Iterator[Pessoa]:
+        with self._lock:
+            return iter(list(self._por_id.values()))
+
+    def __contains__(self, id_pessoa: str) -> bool:
+        return id_pessoa in self._por_id
+
+    def ouvir(self, ouvinte):
+        with self._lock:
+            self._ouvintes.append(ouvinte)
+            _adicionar_lote(ouvinte, list(self._por_id.values()))
+
+    def carregar(self):
+        """Carrega do banco as pessoas salvas, apenas na primeira vez em que são necessárias."""
+        with self._carregamento_lock:
+            if self._carregado:
+                return
+            lote = list(self.armazenamento.carregar())
+            with self._lock:
+                self._registrar_lote(lote)
+                self.versao += 1
+            self._carregado = True
+
+    def obter(self, id_pessoa: str) -> Optional[Pessoa]:
+        return self._por_id.get(id_pessoa)
+
+    def duplicatas(self, nome: str, idade: int, ignorar: Optional[str] = None) -> List[Pessoa]:
+        """Pessoas já cadastradas com o mesmo nome (sem acentos/caixa) e idade."""
+        with self._lock:
+            ids = self._por_chave.get(chave_duplicidade(nome, idade), ())
+            return [self._por_id[id_pessoa] for id_pessoa in ids if id_pessoa != ignorar]
+
+    def _indexar_chave(self, pessoa: Pessoa):
+        chave = self._chaves[pessoa.id] = chave_duplicidade(pessoa.nome, pessoa.idade)
+        self._por_chave[chave].add(pessoa.id)
+
+    def _desindexar_chave(self, id_pessoa: str):
+        chave = self._chaves.pop(id_pessoa, None)
+        ids = self._por_chave.get(chave)
+        if ids is not None:
+            ids.discard(id_pessoa)
+            if not ids:
+                del self._por_chave[chave]
+
+    def _registrar(self, pessoa: Pessoa):
+        self._por_id[pessoa.id] = pessoa
+        self._indexar_chave(pessoa)
+        for ouvinte in self._ouvintes:
+            ouvinte.adicionar(pessoa)
+
+    def _registrar_lote(self, lote: List[Pessoa]):
+        for pessoa in lote:
+            self._por_id[pessoa.id] = pessoa
+            self._indexar_chave(pessoa)
+        for ouvinte in self._ouvintes:
+            _adicionar_lote(ouvinte, lote)
+
+    def adicionar(self, pessoa: Pessoa):
+        self.carregar()  # O novo cadastro entra depois dos já salvos
+        self.armazenamento.salvar(pessoa)
+        if self.diario is not None:
+            self.diario.registrar("alterar", pessoa.id, campos_pessoa(pessoa))
+        with self._lock:
+            self._registrar(pessoa)
+            self.versao += 1
+
+    def adicionar_lote(self, lote: List[Pessoa]):
+        self.carregar()
+        self.armazenamento.salvar_lote(lote)
+        if self.diario is not None:
+            self.diario.registrar_lote(lote)
+        with self._lock:
+            self._registrar_lote(lote)
+            self.versao += 1
+
+    def atualizar(self, pessoa: Pessoa, **campos):
+        """Aplica os campos informados (nome, idade, resultados...), grava e reindexa a pessoa."""
+        self.atualizar_lote([(pessoa, campos)])
+
+    def atualizar_lote(self, alteracoes: Iterable[Tuple[Pessoa, dict]]):
+        """Como `atualizar`, para várias pessoas: uma transação no banco e um único incremento de versão.
+
+        Os novos valores são gravados e registrados no diário antes de chegarem às pessoas em
+        memória: se o banco falhar, nada muda e a mesma alteração pode ser repetida por inteiro.
+        """
+        with self._lock:
+            aplicar = []
+            copias = []
+            eventos = []
+            for pessoa, campos in alteracoes:
+                if pessoa.id not in self._por_id:
+                    continue
+                alterados = {campo: valor for campo, valor in campos.items() if getattr(pessoa, campo) != valor}
+                valores = {campo: getattr(pessoa, campo) for campo in Pessoa.__slots__}
+                valores.update(campos)
+                aplicar.append((pessoa, campos))
+                copias.append(Pessoa(**valores))
+                if alterados:
+                    eventos.append((pessoa.id, alterados))
+            if not aplicar:
+                return
+            self.armazenamento.salvar_lote(copias)
+            if self.diario is not None and eventos:
+                self.diario.registrar_alteracoes(eventos)
+            for pessoa, campos in aplicar:
+                for campo, valor in campos.items():
+                    setattr(pessoa, campo, valor)
+                self._desindexar_chave(pessoa.id)
+                self._indexar_chave(pessoa)
+                for ouvinte in self._ouvintes:
+                    ouvinte.atualizar(pessoa)
+            self.versao += 1
+
+    def remover(self, id_pessoa: str) -> Optional[Pessoa]:
+        with self._lock:
+            pessoa = self._por_id.get(id_pessoa)
+            if pessoa is None:
+                return None
+            # Como em atualizar_lote: só sai da memória depois de sair do banco e entrar no diário
+            self.armazenamento.excluir(pessoa)
+            if self.diario is not None:
+                self.diario.registrar("remover", id_pessoa)
+            del self._por_id[id_pessoa]
+            self._desindexar_chave(id_pessoa)
+            for ouvinte in self._ouvintes:
+                ouvinte.remover(pessoa)
+            self.versao += 1
+        return pessoa
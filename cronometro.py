@@ -0,0 +1,57 @@
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+NS_POR_SEGUNDO = 1_000_000_000
+
+
+def segundos(ns: int) -> int:
+    """Tempo de corrida como é gravado no cadastro: segundos inteiros, arredondados."""
+    return (ns + NS_POR_SEGUNDO // 2) // NS_POR_SEGUNDO
+
+
+def formatar_tempo(ns: int) -> str:
+    """mm:ss.d, com décimos, para mostrar na tela durante a bateria."""
+    decimos = ns // (NS_POR_SEGUNDO // 10)
+    minutos, decimos = divmod(decimos, 600)
+    return f"{minutos:02d}:{decimos // 10:02d}.{decimos % 10}"
+
+
+class Bateria:
+    """Uma largada única para vários candidatos, com a chegada de cada um.
+
+    O relógio é monotônico (perf_counter_ns), então ajustes no relógio do aparelho durante
+    a prova não alteram os tempos. As chegadas ficam só em memória até serem confirmadas,
+    todas de uma vez, no cadastro.
+    """
+
+    def __init__(self, ids: Sequence[str], relogio: Callable[[], int] = time.perf_counter_ns):
+        self.ids: List[str] = list(ids)
+        self._participantes = set(self.ids)
+        self._relogio = relogio
+        self.largada: Optional[int] = None
+        self.chegadas: Dict[str, int] = {}  # id -> nanossegundos desde a largada
+
+    @property
+    def em_andamento(self) -> bool:
+        return self.largada is not None
+
+    def largar(self):
+        self.largada = self._relogio()
+        self.chegadas.clear()
+
+    def decorrido(self) -> int:
+        return self._relogio() - self.largada if self.largada is not None else 0
+
+    def registrar_chegada(self, id_pessoa: str) -> Optional[int]:
+        """Marca a chegada agora; devolve o tempo, ou None se não valer (antes da largada, repetida)."""
+        agora = self._relogio()
+        if self.largada is None or id_pessoa not in self._participantes or id_pessoa in self.chegadas:
+            return None
+        tempo = self.chegadas[id_pessoa] = agora - self.largada
+        return tempo
+
+    def desfazer_chegada(self, id_pessoa: str):
+        self.chegadas.pop(id_pessoa, None)
+
+    def tempos_em_segundos(self) -> Dict[str, int]:
+        return {id_pessoa: segundos(tempo) for id_pessoa, tempo in self.chegadas.items()}
@@ -0,0 +1,188 @@
+import threading
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from busca import normalizar
+from modelos import Pessoa
+from pontuacao import APROVADO, PENDENTE, PROVAS, REPROVADO, TabelasTAF
+
+TOTAL = ("total", "Todos")
+# Largura das faixas do histograma de cada prova: repetições exatas, corrida de 5 em 5 segundos
+LARGURA_FAIXA = {"abdominal": 1, "flexao": 1, "corrida": 5}
+QUANTIS = (0.5, 0.9)
+
+
+class Distribuicao:
+    """Contagem, soma e histograma de uma prova num grupo; aceita inclusões e remoções.
+
+    O histograma tem uma entrada por faixa de valor (poucas dezenas por prova), então
+    média e quantis custam o mesmo com 100 ou 100 mil candidatos.
+    """
+
+    __slots__ = ("largura", "contagem", "soma", "faixas")
+
+    def __init__(self, largura: int):
+        self.largura = largura
+        self.contagem = 0
+        self.soma = 0
+        self.faixas: Counter = Counter()
+
+    def incluir(self, valor: int):
+        self.contagem += 1
+        self.soma += valor
+        self.faixas[valor // self.largura] += 1
+
+    def retirar(self, valor: int):
+        self.contagem -= 1
+        self.soma -= valor
+        faixa = valor // self.largura
+        self.faixas[faixa] -= 1
+        if not self.faixas[faixa]:
+            del self.faixas[faixa]
+
+    @property
+    def media(self) -> Optional[float]:
+        return self.soma / self.contagem if self.contagem else None
+
+    def quantil(self, q: float) -> Optional[float]:
+        """Centro da faixa onde cai o quantil (o valor exato, quando a largura é 1)."""
+        if not self.contagem:
+            return None
+        alvo = q * self.contagem
+        acumulado = 0
+        for faixa in sorted(self.faixas):
+            acumulado += self.faixas[faixa]
+            if acumulado >= alvo:
+                return faixa * self.largura + (self.largura - 1) / 2
+        return None
+
+
+class Grupo:
+    __slots__ = ("candidatos", "situacoes", "provas")
+
+    def __init__(self):
+        self.candidatos = 0
+        self.situacoes: Counter = Counter()
+        self.provas = {prova: Distribuicao(LARGURA_FAIXA[prova]) for prova in PROVAS}
+
+
+class LinhaEstatistica(NamedTuple):
+    grupo: str
+    candidatos: int
+    aprovados: int
+    reprovados: int
+    pendentes: int
+    provas: Dict[str, Tuple[Optional[float], ...]]  # prova -> (lançados, média, quantis...)
+
+    @property
+    def taxa_aprovacao(self) -> Optional[float]:
+        """Aprovados entre os que já têm situação definida."""
+        avaliados = self.aprovados + self.reprovados
+        return self.aprovados / avaliados if avaliados else None
+
+
+class EstatisticasCohort:
+    """Médias, quantis e aprovação por cargo, sexo e faixa etária, mantidos a cada alteração.
+
+    Registrada com `cadastro.ouvir`: cada inclusão, edição ou exclusão mexe só nos grupos
+    da pessoa, guardando o que ela somou para poder desfazer depois. Montar o painel
+    percorre os grupos, nunca os candidatos.
+    """
+
+    def __init__(self, tabelas: TabelasTAF):
+        self.tabelas = tabelas
+        self._grupos: Dict[tuple, Grupo] = {}  # (dimensão, valor) -> grupo; faixas pelo índice
+        self._contribuicoes: Dict[str, tuple] = {}  # id -> (chaves dos grupos, resultados, situação)
+        self._nomes_cargo: Dict[str, str] = {}  # cargo normalizado -> nome exibido
+        self._lock = threading.RLock()
+
+    def _rotulo_faixa(self, faixa: int) -> str:
+        limites = self.tabelas.faixas_etarias.tolist()
+        if faixa == 0:
+            return f"até {limites[0] - 1}"
+        if faixa == len(limites):
+            return f"{limites[-1]} ou mais"
+        return f"{limites[faixa - 1]}-{limites[faixa] - 1}"
+
+    def _contribuicao(self, pessoa: Pessoa) -> tuple:
+        # Cargos agrupados como na pontuação e no ranking: "Soldado" e "soldado" são o mesmo
+        cargo = normalizar(pessoa.cargo)
+        self._nomes_cargo.setdefault(cargo, pessoa.cargo)
+        chaves = (
+            TOTAL,
+            ("cargo", cargo),
+            ("sexo", pessoa.sexo),
+            ("faixa", self.tabelas.faixa_etaria(pessoa.idade)),
+        )
+        resultados = tuple(getattr(pessoa, prova) for prova in PROVAS)
+        return chaves, resultados, self.tabelas.pontuar_pessoa(pessoa)[-1]
+
+    def _aplicar(self, contribuicao: tuple, sinal: int):
+        chaves, resultados, situacao = contribuicao
+        for chave in chaves:
+            grupo = self._grupos.get(chave)
+            if grupo is None:
+                grupo = self._grupos[chave] = Grupo()
+            grupo.candidatos += sinal
+            grupo.situacoes[situacao] += sinal
+            for prova, valor in zip(PROVAS, resultados):
+                if valor is not None:
+                    if sinal > 0:
+                        grupo.provas[prova].incluir(valor)
+                    else:
+                        grupo.provas[prova].retirar(valor)
+            if not grupo.candidatos:
+                del self._grupos[chave]
+                if chave[0] == "cargo":
+                    del self._nomes_cargo[chave[1]]
+
+    def adicionar(self, pessoa: Pessoa):
+        with self._lock:
+            if pessoa.id in self._contribuicoes:
+                self.atualizar(pessoa)
+                return
+            contribuicao = self._contribuicoes[pessoa.id] = self._contribuicao(pessoa)
+            self._aplicar(contribuicao, 1)
+
+    def atualizar(self, pessoa: Pessoa):
+        with self._lock:
+            anterior = self._contribuicoes.pop(pessoa.id, None)
+            if anterior is not None:
+                self._aplicar(anterior, -1)
+            contribuicao = self._contribuicoes[pessoa.id] = self._contribuicao(pessoa)
+            self._aplicar(contribuicao, 1)
+
+    def remover(self, pessoa: Pessoa):
+        with self._lock:
+            anterior = self._contribuicoes.pop(pessoa.id, None)
+            if anterior is not None:
+                self._aplicar(anterior, -1)
+
+    def linhas(self, dimensao: str) -> List[LinhaEstatistica]:
+        """Uma linha por grupo da dimensão (cargo, sexo ou faixa), seguida do total."""
+        with self._lock:
+            chaves = sorted(chave for chave in self._grupos if chave[0] == dimensao)
+            if TOTAL in self._grupos:
+                chaves.append(TOTAL)
+            return [self._linha(self._rotulo(tipo, valor), self._grupos[(tipo, valor)]) for tipo, valor in chaves]
+
+    def _rotulo(self, tipo: str, valor) -> str:
+        if tipo == "faixa":
+            return self._rotulo_faixa(valor)
+        if tipo == "cargo":
+            return self._nomes_cargo[valor]
+        return valor
+
+    @staticmethod
+    def _linha(nome: str, grupo: Grupo) -> LinhaEstatistica:
+        return LinhaEstatistica(
+            nome,
+            grupo.candidatos,
+            grupo.situacoes[APROVADO],
+            grupo.situacoes[REPROVADO],
+            grupo.situacoes[PENDENTE],
+            {
+                prova: (distribuicao.contagem, distribuicao.media, *(distribuicao.quantil(q) for q in QUANTIS))
+                for prova, distribuicao in grupo.provas.items()
+            },
+        )
@@ -0,0 +1,217 @@
+import argparse
+import csv
+import os
+import time
+from itertools import chain, islice
+from operator import attrgetter
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Sized
+
+from modelos import CAMPOS_PESSOA, TITULOS_CAMPOS, Pessoa
+from tarefas import Progresso
+
+if TYPE_CHECKING:  # O openpyxl, o pyarrow e o numpy só são carregados quando alguém exporta
+    from pontuacao import Pontuacao
+
+COLUNAS_EXPORTACAO = [TITULOS_CAMPOS[campo] for campo in CAMPOS_PESSOA]
+COLUNAS_PONTUACAO = ["Pontos Abdominal", "Pontos Flexão", "Pontos Corrida", "Pontuação", "Situação"]
+COLUNA_CLASSIFICACAO = "Classificação no Cargo"
+PASSO_PROGRESSO = 500  # Linhas escritas entre duas notificações de progresso
+TAMANHO_BLOCO_EXPORTACAO = 5000  # Linhas montadas por vez no CSV e no Parquet (um row group cada)
+
+# Nome e tipo de cada coluna no Parquet, na mesma ordem das colunas da planilha
+CAMPOS_PARQUET = [
+    ("nome", "texto"), ("idade", "inteiro"), ("sexo", "categoria"), ("cargo", "categoria"),
+    ("abdominal", "inteiro"), ("flexao", "inteiro"), ("corrida", "inteiro"),
+]
+CAMPOS_PARQUET_PONTUACAO = [
+    ("pontos_abdominal", "decimal"), ("pontos_flexao", "decimal"), ("pontos_corrida", "decimal"),
+    ("total", "decimal"), ("situacao", "categoria"),
+]
+CAMPO_PARQUET_CLASSIFICACAO = ("classificacao_cargo", "inteiro")
+
+_campos_exportacao = attrgetter(*CAMPOS_PESSOA)
+
+
+def linha_exportacao(pessoa: Pessoa) -> tuple:
+    return _campos_exportacao(pessoa)
+
+
+def blocos_exportacao(pessoas: Iterable[Pessoa], pontuacao: Optional["Pontuacao"] = None,
+                      classificacao: Optional[Dict[str, int]] = None,
+                      tamanho: int = TAMANHO_BLOCO_EXPORTACAO) -> Iterator[List[tuple]]:
+    """Linhas da exportação em blocos de até `tamanho`; só um bloco fica montado por vez.
+
+    `pessoas` pode ser um iterador (direto do banco); a pontuação, alinhada com `pessoas`,
+    é fatiada junto com cada bloco. `classificacao` (id -> posição no cargo) acrescenta a
+    posição, vazia para quem não foi aprovado.
+    """
+    pessoas = iter(pessoas)
+    inicio = 0
+    while True:
+        bloco = list(islice(pessoas, tamanho))
+        if not bloco:
+            return
+        linhas = map(linha_exportacao, bloco)
+        if pontuacao is not None:
+            linhas = (linha + notas for linha, notas in zip(linhas, pontuacao.linhas(inicio, inicio + len(bloco))))
+        if classificacao is not None:
+            linhas = (linha + (classificacao.get(p.id),) for linha, p in zip(linhas, bloco))
+        yield list(linhas)
+        inicio += len(bloco)
+
+
+def linhas_exportacao(pessoas: Iterable[Pessoa], pontuacao: Optional["Pontuacao"] = None,
+                      classificacao: Optional[Dict[str, int]] = None) -> Iterator[tuple]:
+    """As linhas de `blocos_exportacao`, uma a uma."""
+    return chain.from_iterable(blocos_exportacao(pessoas, pontuacao, classificacao))
+
+
+def cabecalho_exportacao(pontuacao: Optional["Pontuacao"] = None,
+                         classificacao: Optional[Dict[str, int]] = None) -> List[str]:
+    return (COLUNAS_EXPORTACAO + (COLUNAS_PONTUACAO if pontuacao is not None else [])
+            + ([COLUNA_CLASSIFICACAO] if classificacao is not None else []))
+
+
+def larguras_colunas(cabecalho: Sequence[str], linhas: Iterator[tuple]) -> List[int]:
+    """Calcula a largura de cada coluna pelo maior texto, sem criar células."""
+    larguras = [len(str(titulo)) for titulo in cabecalho]
+    for linha in linhas:
+        for i, valor in enumerate(linha):
+            tamanho = len(str(valor)) if valor is not None else 0
+            if tamanho > larguras[i]:
+                larguras[i] = tamanho
+    return larguras
+
+
+def exportar_excel(pessoas: Sequence[Pessoa], caminho: str, progresso: Optional[Progresso] = None,
+                   pontuacao: Optional["Pontuacao"] = None, classificacao: Optional[Dict[str, int]] = None) -> str:
+    """Grava as pessoas em XLSX no modo write-only do openpyxl, linha a linha.
+
+    No modo write-only o openpyxl escreve as larguras antes da primeira linha, por isso
+    elas são medidas antes, percorrendo apenas os valores (sem montar a planilha em memória).
+    """
+    from openpyxl import Workbook
+    from openpyxl.utils import get_column_letter
+
+    total = len(pessoas)
+    cabecalho = cabecalho_exportacao(pontuacao, classificacao)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Dados")
+
+    for col_num, largura in enumerate(larguras_colunas(cabecalho, linhas_exportacao(pessoas, pontuacao, classificacao)), 1):
+        ws.column_dimensions[get_column_letter(col_num)].width = largura + 2
+
+    ws.append(cabecalho)
+    for feitas, linha in enumerate(linhas_exportacao(pessoas, pontuacao, classificacao), 1):
+        ws.append(linha)
+        if progresso and feitas % PASSO_PROGRESSO == 0:
+            progresso(feitas, total)
+
+    wb.save(caminho)
+    if progresso:
+        progresso(total, total)
+    return caminho
+
+
+def exportar_csv(pessoas: Iterable[Pessoa], caminho: str, progresso: Optional[Progresso] = None,
+                 pontuacao: Optional["Pontuacao"] = None, classificacao: Optional[Dict[str, int]] = None) -> str:
+    """Grava em CSV (UTF-8, vírgula), um bloco por vez: a memória não cresce com o cohort.
+
+    Os títulos são os da planilha, então o arquivo pode ser importado de volta pelo app.
+    """
+    total = len(pessoas) if isinstance(pessoas, Sized) else 0
+    feitas = 0
+    with open(caminho, "w", newline="", encoding="utf-8") as arquivo:
+        escritor = csv.writer(arquivo)
+        escritor.writerow(cabecalho_exportacao(pontuacao, classificacao))
+        for bloco in blocos_exportacao(pessoas, pontuacao, classificacao):
+            escritor.writerows(bloco)
+            feitas += len(bloco)
+            if progresso:
+                progresso(feitas, total)
+    return caminho
+
+
+def exportar_parquet(pessoas: Iterable[Pessoa], caminho: str, progresso: Optional[Progresso] = None,
+                     pontuacao: Optional["Pontuacao"] = None, classificacao: Optional[Dict[str, int]] = None) -> str:
+    """Grava em Parquet com colunas tipadas, um row group por bloco (requer o pacote pyarrow).
+
+    Sexo, cargo e situação vão como categorias (dicionário), resultados como inteiros
+    anuláveis e pontos como decimais; ausências viram nulos, não zeros.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("A exportação em Parquet requer o pacote pyarrow (pip install pyarrow).") from None
+
+    tipos = {
+        "texto": pa.string(),
+        "inteiro": pa.int32(),
+        "decimal": pa.float64(),
+        "categoria": pa.dictionary(pa.int32(), pa.string()),
+    }
+    campos = (CAMPOS_PARQUET + (CAMPOS_PARQUET_PONTUACAO if pontuacao is not None else [])
+              + ([CAMPO_PARQUET_CLASSIFICACAO] if classificacao is not None else []))
+    esquema = pa.schema([(nome, tipos[tipo]) for nome, tipo in campos])
+
+    total = len(pessoas) if isinstance(pessoas, Sized) else 0
+    feitas = 0
+    with pq.ParquetWriter(caminho, esquema) as escritor:
+        for bloco in blocos_exportacao(pessoas, pontuacao, classificacao):
+            colunas = [
+                pa.array(valores, pa.string()).dictionary_encode() if tipo == "categoria" else pa.array(valores, tipos[tipo])
+                for (_, tipo), valores in zip(campos, zip(*bloco))
+            ]
+            escritor.write_table(pa.Table.from_arrays(colunas, schema=esquema))
+            feitas += len(bloco)
+            if progresso:
+                progresso(feitas, total)
+    return caminho
+
+
+# Extensão do arquivo de saída -> função que grava naquele formato
+FORMATOS_EXPORTACAO: Dict[str, Callable[..., str]] = {
+    ".xlsx": exportar_excel,
+    ".csv": exportar_csv,
+    ".parquet": exportar_parquet,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Exporta o banco de candidatos sem abrir o app (o formato vem da extensão da saída)"
+    )
+    parser.add_argument("saida", help="arquivo .csv, .parquet ou .xlsx")
+    parser.add_argument("--banco", default="dados_taf.db", help="banco SQLite de origem (padrão: dados_taf.db)")
+    parser.add_argument("--tabelas", default="tabelas_taf.json",
+                        help="tabelas de pontuação (padrão: tabelas_taf.json, ou as tabelas padrão)")
+    parser.add_argument("--vagas", default="vagas_taf.json", help="vagas por cargo (padrão: vagas_taf.json)")
+    parser.add_argument("--sem-pontuacao", action="store_true",
+                        help="só as sete colunas do cadastro, lidas do banco em blocos, sem carregar o cohort")
+    args = parser.parse_args()
+
+    from armazenamento import ArmazenamentoPessoas
+
+    exportar = FORMATOS_EXPORTACAO.get(os.path.splitext(args.saida)[1].lower())
+    if exportar is None:
+        parser.error(f"formato não suportado: {args.saida} (use {', '.join(FORMATOS_EXPORTACAO)})")
+
+    armazenamento = ArmazenamentoPessoas(args.banco)
+    inicio = time.perf_counter()
+    if args.sem_pontuacao:
+        # CSV e Parquet leem o banco em blocos; o XLSX mede as colunas antes e precisa da lista inteira
+        pessoas = armazenamento.carregar()
+        exportar(list(pessoas) if exportar is exportar_excel else pessoas, args.saida)
+    else:
+        from pontuacao import TabelasTAF
+        from ranking import RankingCargos, carregar_vagas
+
+        pessoas = list(armazenamento.carregar())
+        tabelas = TabelasTAF.carregar(args.tabelas)
+        ranking = RankingCargos(tabelas, carregar_vagas(args.vagas))
+        for pessoa in pessoas:
+            ranking.adicionar(pessoa)
+        exportar(pessoas, args.saida, pontuacao=tabelas.pontuar(pessoas), classificacao=ranking.posicoes())
+    armazenamento.fechar()
+    print(f"{args.saida} gravado em {time.perf_counter() - inicio:.2f}s")
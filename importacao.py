@@ -0,0 +1,108 @@
+import csv
+import os
+from typing import Callable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from busca import normalizar
+from lancamento import converter_resultado
+from modelos import CAMPOS_CADASTRO, CAMPOS_RESULTADOS, Pessoa, validar_cadastro
+
+TAMANHO_LOTE_IMPORTACAO = 1000
+
+
+class ResultadoImportacao(NamedTuple):
+    importadas: int
+    rejeitadas: List[Tuple[int, str]]  # (número da linha na planilha, motivo)
+
+
+def _linhas_xlsx(caminho: str) -> Iterator[Sequence]:
+    from openpyxl import load_workbook
+
+    wb = load_workbook(caminho, read_only=True, data_only=True)
+    try:
+        yield from wb.active.iter_rows(values_only=True)
+    finally:
+        wb.close()
+
+
+def _linhas_csv(caminho: str) -> Iterator[Sequence]:
+    with open(caminho, newline="", encoding="utf-8-sig") as arquivo:
+        amostra = arquivo.read(4096)
+        arquivo.seek(0)
+        try:
+            dialeto = csv.Sniffer().sniff(amostra, delimiters=",;\t")
+        except csv.Error:
+            dialeto = csv.excel
+        yield from csv.reader(arquivo, dialeto)
+
+
+def ler_planilha(caminho: str) -> Iterator[Sequence]:
+    """Lê as linhas de um XLSX ou CSV sem carregar o arquivo inteiro."""
+    extensao = os.path.splitext(caminho)[1].lower()
+    if extensao in (".xlsx", ".xlsm"):
+        return _linhas_xlsx(caminho)
+    if extensao == ".csv":
+        return _linhas_csv(caminho)
+    raise ValueError(f"Formato de arquivo não suportado: {extensao or caminho}")
+
+
+def _texto(valor) -> str:
+    return str(valor).strip() if valor is not None else ""
+
+
+def _resultado(valor) -> Optional[int]:
+    # O XLSX traz números como float (40.0); o resto segue as regras da grade de lançamento
+    if isinstance(valor, float) and valor.is_integer():
+        valor = int(valor)
+    return converter_resultado(_texto(valor))
+
+
+def importar_pessoas(caminho: str, ao_importar_lote: Callable[[List[Pessoa]], None],
+                     tamanho_lote: int = TAMANHO_LOTE_IMPORTACAO) -> ResultadoImportacao:
+    """Valida cada linha como no cadastro e entrega as pessoas válidas em lotes.
+
+    A primeira linha deve trazer os títulos das colunas (Nome, Idade, Sexo, Cargo e,
+    opcionalmente, Abdominal, Flexão e Corrida), em qualquer ordem.
+    """
+    linhas = iter(ler_planilha(caminho))
+    cabecalho = [normalizar(_texto(titulo)) for titulo in next(linhas, ())]
+    posicoes = {campo: cabecalho.index(campo) for campo in CAMPOS_CADASTRO + CAMPOS_RESULTADOS
+                if campo in cabecalho}
+    faltando = [campo for campo in CAMPOS_CADASTRO if campo not in posicoes]
+    if faltando:
+        raise ValueError(f"Colunas obrigatórias ausentes: {', '.join(faltando)}")
+
+    importadas = 0
+    rejeitadas: List[Tuple[int, str]] = []
+    lote: List[Pessoa] = []
+    for numero, linha in enumerate(linhas, 2):
+        valores = {campo: linha[i] if i < len(linha) else None for campo, i in posicoes.items()}
+        if not any(_texto(valor) for valor in valores.values()):
+            continue  # Linhas em branco no meio da planilha
+
+        idade = valores["idade"]
+        try:
+            nome, idade, sexo, cargo = validar_cadastro(
+                _texto(valores["nome"]),
+                idade if isinstance(idade, (int, float)) else _texto(idade),
+                _texto(valores["sexo"]),
+                _texto(valores["cargo"]),
+            )
+        except ValueError as erro:
+            rejeitadas.append((numero, str(erro)))
+            continue
+        try:
+            resultados = [_resultado(valores.get(campo)) for campo in CAMPOS_RESULTADOS]
+        except ValueError:
+            rejeitadas.append((numero, "Os campos Abdominal, Flexão e Corrida devem ser números inteiros, sem negativos."))
+            continue
+
+        lote.append(Pessoa(nome, idade, sexo, cargo, *resultados))
+        if len(lote) >= tamanho_lote:
+            ao_importar_lote(lote)
+            importadas += len(lote)
+            lote = []
+
+    if lote:
+        ao_importar_lote(lote)
+        importadas += len(lote)
+    return ResultadoImportacao(importadas, rejeitadas)
@@ -0,0 +1,284 @@
+import asyncio
+import atexit
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Union
+
+import flet as ft
+
+VARIAVEL_ATIVACAO = "TAF_INSTRUMENTACAO"  # "1" liga a instrumentação
+VARIAVEL_ARQUIVO = "TAF_INSTRUMENTACAO_ARQUIVO"
+ARQUIVO_PADRAO = "instrumentacao_taf.json"
+
+# Limites superiores das faixas dos histogramas; a última faixa não tem limite
+LIMITES_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+LIMITES_BYTES = [256, 1024, 4096, 16384, 65536, 262144, 1048576]
+
+# Chamadas medidas em andamento no contexto atual, da mais externa para a mais interna
+_chamadas: contextvars.ContextVar[tuple] = contextvars.ContextVar("chamadas_medidas", default=())
+
+
+class Histograma:
+    """Contagem por faixas fixas, com soma e máximo; os percentis saem das faixas."""
+
+    def __init__(self, limites: List[float]):
+        self.limites = limites
+        self.contagens = [0] * (len(limites) + 1)
+        self.total = 0
+        self.soma = 0.0
+        self.maximo = 0.0
+
+    def registrar(self, valor: float):
+        self.contagens[bisect_left(self.limites, valor)] += 1
+        self.total += 1
+        self.soma += valor
+        self.maximo = max(self.maximo, valor)
+
+    def corrigir(self, antigo: float, novo: float):
+        """Troca um valor já registrado por outro (um envio que chegou depois do fim da chamada)."""
+        self.contagens[bisect_left(self.limites, antigo)] -= 1
+        self.contagens[bisect_left(self.limites, novo)] += 1
+        self.soma += novo - antigo
+        self.maximo = max(self.maximo, novo)
+
+    def percentil(self, fracao: float) -> Optional[float]:
+        """Limite superior da faixa onde cai o percentil, sem passar do máximo observado."""
+        if not self.total:
+            return None
+        alvo = fracao * self.total
+        acumulado = 0
+        for i, contagem in enumerate(self.contagens):
+            acumulado += contagem
+            if acumulado >= alvo:
+                return min(self.limites[i], self.maximo) if i < len(self.limites) else self.maximo
+        return self.maximo
+
+    def para_dicionario(self) -> dict:
+        return {
+            "total": self.total,
+            "soma": self.soma,
+            "media": self.soma / self.total if self.total else None,
+            "p50": self.percentil(0.5),
+            "p95": self.percentil(0.95),
+            "maximo": self.maximo,
+            "faixas": dict(zip([*map(str, self.limites), "mais"], self.contagens)),
+        }
+
+
+class Metrica:
+    """Latência de um trecho (rota, handler ou page.update) e o que ele enviou ao cliente."""
+
+    def __init__(self):
+        self.latencia_ms = Histograma(LIMITES_MS)
+        self.bytes_enviados = Histograma(LIMITES_BYTES)
+        self.controles_criados = 0
+
+    def para_dicionario(self) -> dict:
+        return {
+            "chamadas": self.latencia_ms.total,
+            "latencia_ms": self.latencia_ms.para_dicionario(),
+            "bytes_enviados": self.bytes_enviados.para_dicionario(),
+            "controles_criados": self.controles_criados,
+        }
+
+
+class _Chamada:
+    __slots__ = ("metrica", "inicio", "bytes", "controles", "encerrada")
+
+    def __init__(self, metrica: Metrica):
+        self.metrica = metrica
+        self.inicio = time.perf_counter()
+        self.bytes = 0
+        self.controles = 0
+        self.encerrada = False
+
+
+class Instrumentacao:
+    """Medições opcionais das telas, ligadas pela variável de ambiente TAF_INSTRUMENTACAO=1.
+
+    Desligada, `medir` devolve a própria função e `observar_pagina` não faz nada, então o app
+    não paga nada por ela. Ligada, cada trecho medido acumula a latência, os bytes enviados
+    ao cliente pelos page.update() feitos dentro dele e quantos controles o cliente criou.
+    """
+
+    def __init__(self, arquivo: str = ARQUIVO_PADRAO):
+        self.ativa = False
+        self.arquivo = arquivo
+        self.inicio = time.time()
+        self._metricas: Dict[str, Metrica] = {}
+        self._contadores: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._salvar_ao_sair = False
+
+    @classmethod
+    def do_ambiente(cls) -> "Instrumentacao":
+        instrumentacao = cls(os.environ.get(VARIAVEL_ARQUIVO, ARQUIVO_PADRAO))
+        if os.environ.get(VARIAVEL_ATIVACAO) == "1":
+            instrumentacao.ativar()
+        return instrumentacao
+
+    def ativar(self):
+        """Liga as medições para as sessões abertas daqui em diante e salva o JSON ao sair."""
+        self.ativa = True
+        if not self._salvar_ao_sair:
+            atexit.register(self.salvar)
+            self._salvar_ao_sair = True
+
+    def metrica(self, nome: str) -> Metrica:
+        with self._lock:
+            metrica = self._metricas.get(nome)
+            if metrica is None:
+                metrica = self._metricas[nome] = Metrica()
+            return metrica
+
+    def contar(self, nome: str, quantidade: int = 1):
+        if not self.ativa:
+            return
+        with self._lock:
+            self._contadores[nome] = self._contadores.get(nome, 0) + quantidade
+
+    def _iniciar(self, nome: str):
+        chamada = _Chamada(self.metrica(nome))
+        return chamada, _chamadas.set(_chamadas.get() + (chamada,))
+
+    def _encerrar(self, chamada: _Chamada, token):
+        _chamadas.reset(token)
+        with self._lock:
+            chamada.encerrada = True
+            chamada.metrica.latencia_ms.registrar((time.perf_counter() - chamada.inicio) * 1000)
+            chamada.metrica.bytes_enviados.registrar(chamada.bytes)
+            chamada.metrica.controles_criados += chamada.controles
+
+    def _somar_envio(self, chamada: _Chamada, tamanho: int, controles: int):
+        with self._lock:
+            # Envios adiados (AgendadorAtualizacoes) podem chegar com a chamada já registrada
+            if chamada.encerrada:
+                chamada.metrica.bytes_enviados.corrigir(chamada.bytes, chamada.bytes + tamanho)
+                chamada.metrica.controles_criados += controles
+            chamada.bytes += tamanho
+            chamada.controles += controles
+
+    def medir(self, funcao: Optional[Callable] = None, *, nome: Union[str, Callable[..., str], None] = None):
+        """Decorador que mede cada chamada da função (síncrona ou assíncrona).
+
+        `nome` pode ser uma função dos mesmos argumentos, para separar as medições por
+        chamada (por exemplo, uma por rota em route_change).
+        """
+        if funcao is None:
+            return functools.partial(self.medir, nome=nome)
+        if not self.ativa:
+            return funcao
+
+        def nome_da_chamada(args, kwargs) -> str:
+            if callable(nome):
+                return nome(*args, **kwargs)
+            return nome or funcao.__name__
+
+        if asyncio.iscoroutinefunction(funcao):
+            @functools.wraps(funcao)
+            async def medida_async(*args, **kwargs):
+                chamada, token = self._iniciar(nome_da_chamada(args, kwargs))
+                try:
+                    return await funcao(*args, **kwargs)
+                finally:
+                    self._encerrar(chamada, token)
+            return medida_async
+
+        @functools.wraps(funcao)
+        def medida(*args, **kwargs):
+            chamada, token = self._iniciar(nome_da_chamada(args, kwargs))
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                self._encerrar(chamada, token)
+        return medida
+
+    def observar_pagina(self, page: ft.Page):
+        """Mede cada page.update() da sessão e o tamanho de cada lote enviado ao cliente."""
+        if not self.ativa:
+            return
+        from flet.core.protocol import CommandEncoder  # Módulo interno do flet: só com a instrumentação ligada
+
+        page.update = self.medir(page.update, nome="page.update")
+        conexao = page.connection
+        enviar = conexao.send_commands
+        if getattr(enviar, "instrumentado", False):  # Conexão compartilhada com outra sessão
+            return
+
+        def send_commands(session_id, commands):
+            tamanho = len(json.dumps(commands, cls=CommandEncoder, separators=(",", ":")))
+            # Cada subcomando de um "add" é um controle novo no cliente
+            controles = sum(len(comando.commands) for comando in commands if comando.name == "add")
+            for chamada in _chamadas.get():  # O page.update() e os trechos que o chamaram
+                self._somar_envio(chamada, tamanho, controles)
+            return enviar(session_id, commands)
+
+        send_commands.instrumentado = True
+        conexao.send_commands = send_commands
+
+    def resumo(self) -> dict:
+        with self._lock:
+            return {
+                "inicio": self.inicio,
+                "duracao_s": time.time() - self.inicio,
+                "trechos": {nome: metrica.para_dicionario() for nome, metrica in sorted(self._metricas.items())},
+                "contadores": dict(sorted(self._contadores.items())),
+            }
+
+    def salvar(self, caminho: Optional[str] = None) -> str:
+        caminho = caminho or self.arquivo
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            json.dump(self.resumo(), arquivo, indent=2, ensure_ascii=False)
+        return caminho
+
+    def texto_resumo(self, limite: int = 12) -> str:
+        """Os trechos mais lentos (p95), uma linha cada, para o painel de depuração."""
+        resumo = self.resumo()
+        trechos = resumo["trechos"]
+        ordenados = sorted(trechos.items(), key=lambda item: item[1]["latencia_ms"]["p95"] or 0, reverse=True)
+        linhas = [f"{'trecho':<24}{'n':>6}{'p50 ms':>8}{'p95 ms':>8}{'máx ms':>8}{'KB':>8}{'ctrl':>7}"]
+        for nome, dados in ordenados[:limite]:
+            latencia = dados["latencia_ms"]
+            linhas.append(
+                f"{nome[:24]:<24}{latencia['total']:>6}{latencia['p50']:>8g}{latencia['p95']:>8g}"
+                f"{latencia['maximo']:>8.1f}{dados['bytes_enviados']['soma'] / 1024:>8.1f}"
+                f"{dados['controles_criados']:>7}"
+            )
+        if resumo["contadores"]:
+            linhas.append("  ".join(f"{nome}={valor}" for nome, valor in resumo["contadores"].items()))
+        return "\n".join(linhas)
+
+    def painel(self, page: ft.Page) -> Optional[ft.Control]:
+        """Painel flutuante com o resumo das medições; só existe com a instrumentação ligada."""
+        if not self.ativa:
+            return None
+        texto = ft.Text(self.texto_resumo(), font_family="monospace", size=11, selectable=True)
+
+        def atualizar(e):
+            texto.value = self.texto_resumo()
+            texto.update()
+
+        def salvar(e):
+            texto.value = f"{self.texto_resumo()}\n\nSalvo em {os.path.abspath(self.salvar())}"
+            texto.update()
+
+        return ft.Container(
+            content=ft.Column(
+                [
+                    texto,
+                    ft.Row([ft.TextButton("Atualizar", on_click=atualizar), ft.TextButton("Salvar JSON", on_click=salvar)]),
+                ],
+                tight=True,
+            ),
+            bgcolor=ft.colors.with_opacity(0.9, ft.colors.WHITE),
+            border=ft.border.all(1, ft.colors.BLUE_GREY_400),
+            border_radius=8,
+            padding=8,
+            right=10,
+            bottom=10,
+        )
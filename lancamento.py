@@ -0,0 +1,82 @@
+import sqlite3
+import threading
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from modelos import CAMPOS_RESULTADOS, TITULOS_COM_UNIDADE, Pessoa
+
+if TYPE_CHECKING:
+    from cadastro import CadastroPessoas
+
+CAMPOS_LANCAMENTO = [(TITULOS_COM_UNIDADE[campo], campo) for campo in CAMPOS_RESULTADOS]
+
+
+def converter_resultado(texto: Optional[str]) -> Optional[int]:
+    """Valor de uma célula da grade; vazia apaga o resultado.
+
+    Levanta ValueError com a mensagem curta mostrada embaixo da célula.
+    """
+    texto = (texto or "").strip()
+    if not texto:
+        return None
+    try:
+        valor = int(texto)
+    except ValueError:
+        raise ValueError("Número inteiro") from None
+    if valor < 0:
+        raise ValueError("Não pode ser negativo")
+    return valor
+
+
+class LancamentosPendentes:
+    """Resultados digitados na grade e ainda não gravados, agrupados por candidato.
+
+    Redigitar a mesma célula só troca o valor pendente; `retirar` entrega tudo de uma vez
+    para uma única chamada de cadastro.atualizar_lote, não importa quantas células mudaram.
+    """
+
+    def __init__(self):
+        self._pendentes: Dict[str, Dict[str, Optional[int]]] = {}
+        self._lock = threading.Lock()
+
+    def registrar(self, id_pessoa: str, campo: str, valor: Optional[int]):
+        with self._lock:
+            self._pendentes.setdefault(id_pessoa, {})[campo] = valor
+
+    def valor(self, id_pessoa: str, campo: str, padrao: Optional[int] = None) -> Optional[int]:
+        """O valor pendente da célula, ou `padrao` (o gravado) se ela não foi alterada."""
+        with self._lock:
+            return self._pendentes.get(id_pessoa, {}).get(campo, padrao)
+
+    def retirar(self) -> Dict[str, Dict[str, Optional[int]]]:
+        with self._lock:
+            pendentes, self._pendentes = self._pendentes, {}
+            return pendentes
+
+    def devolver(self, pendentes: Dict[str, Dict[str, Optional[int]]]):
+        """Recoloca o que não pôde ser gravado, sem sobrescrever o que foi digitado depois."""
+        with self._lock:
+            for id_pessoa, campos in pendentes.items():
+                atuais = self._pendentes.setdefault(id_pessoa, {})
+                for campo, valor in campos.items():
+                    atuais.setdefault(campo, valor)
+
+    def gravar(self, cadastro: "CadastroPessoas") -> List[Pessoa]:
+        """Grava tudo o que está pendente numa única chamada de atualizar_lote.
+
+        Devolve as pessoas gravadas. Se o banco falhar, os valores voltam a ficar pendentes
+        para a próxima gravação e o sqlite3.Error segue para quem chamou.
+        """
+        pendentes = self.retirar()
+        alteracoes = [
+            (pessoa, campos)
+            for id_pessoa, campos in pendentes.items()
+            if (pessoa := cadastro.obter(id_pessoa)) is not None
+        ]
+        if not alteracoes:
+            return []
+        try:
+            cadastro.atualizar_lote(alteracoes)
+        except sqlite3.Error:
+            self.devolver(pendentes)
+            raise
+        return [pessoa for pessoa, _ in alteracoes]
@@ -1,23 +1,31 @@
+import time
+
+INICIO = time.perf_counter()  # Antes dos imports, para medir a abertura completa do app
+
 import flet as ft
 from typing import Optional, Dict, List, Union
-from openpyxl import Workbook
-from openpyxl.utils import get_column_letter
+import argparse
+import asyncio
 import os
-
-
-class Pessoa:
-    def __init__(self, nome: str, idade: int, sexo: str, cargo: str, abdominal: Optional[int] = None,
-                 flexao: Optional[int] = None, corrida: Optional[int] = None):
-        self.nome = nome
-        self.idade = idade
-        self.sexo = sexo
-        self.cargo = cargo
-        self.abdominal = abdominal
-        self.flexao = flexao
-        self.corrida = corrida
-
-    def __repr__(self):
-        return f"Pessoa(nome='{self.nome}', idade={self.idade}, sexo='{self.sexo}', cargo='{self.cargo}')"
+import sqlite3
+import threading
+from itertools import islice
+from types import SimpleNamespace
+
+from armazenamento import ArmazenamentoPessoas
+from busca import IndiceBusca
+from cadastro import CadastroPessoas
+from cronometro import Bateria, formatar_tempo
+from exportacao import exportar_csv, exportar_excel, exportar_parquet
+from importacao import importar_pessoas
+from atualizacao import AgendadorAtualizacoes
+from instrumentacao import Instrumentacao
+from lancamento import CAMPOS_LANCAMENTO, LancamentosPendentes, converter_resultado
+from modelos import CAMPOS_PESSOA, CAMPOS_RESULTADOS, TITULOS_CAMPOS, Pessoa, validar_cadastro
+from ordenacao import IndiceOrdenado
+from relatorios import gerar_relatorios, linhas_relatorio
+from sincronizacao import Diario
+from tarefas import ExecutorTarefas
 
 
 # Constantes
@@ -25,10 +33,92 @@ BLUE_ACCENT = ft.colors.BLUE_ACCENT_700
 WHITE = ft.colors.WHITE
 BORDER_RADIUS = 10
 TEXT_FIELD_BORDER_COLOR = ft.colors.BLUE_GREY_400
-
-pessoas: List[Pessoa] = []
-pessoa_selecionada: Optional[Pessoa] = None
-dados_pessoa: Dict[str, Dict[str, Optional[int]]] = {}
+ATRASO_BUSCA = 0.25  # Segundos sem digitar antes de filtrar a lista
+ATRASO_ATUALIZACAO_REMOTA = 0.5  # Agrupa alterações de outros avaliadores numa única atualização
+TAMANHO_PAGINA_LISTA = 50  # Linhas enviadas ao cliente por vez na lista de pessoas
+TAMANHO_PAGINA_TABELA = 25  # Linhas por página na tabela de dados
+TITULOS_TABELA = [TITULOS_CAMPOS[campo] for campo in CAMPOS_PESSOA]
+COLUNAS_TABELA = list(CAMPOS_PESSOA)
+COLUNAS_NUMERICAS = {"idade", *CAMPOS_RESULTADOS}
+MAX_REJEITADAS_EXIBIDAS = 20  # Linhas rejeitadas listadas no diálogo de importação
+MAX_CORREDORES_BATERIA = 100  # Candidatos sem corrida levados da lista filtrada para a bateria
+INTERVALO_RELOGIO = 0.5  # Segundos entre atualizações do relógio da bateria na tela
+TAMANHO_PAGINA_LANCAMENTO = 25  # Candidatos por página na grade de lançamento
+ATRASO_GRAVACAO_LANCAMENTO = 1.0  # Segundos sem lançar nada antes de gravar as células alteradas
+# Dimensões de EstatisticasCohort.linhas; ficam aqui para não trazer o numpy na abertura
+DIMENSOES_ESTATISTICAS = {"cargo": "Cargo", "sexo": "Sexo", "faixa": "Faixa Etária"}
+
+# Telas abertas a partir da lista ficam empilhadas sobre ela: a lista continua montada no
+# cliente e voltar para ela não reenvia nada
+ROTA_ANTERIOR = {
+    "/dados": "/lista", "/dados_todos": "/lista", "/corrida": "/lista", "/estatisticas": "/lista",
+    "/lancamento": "/lista", "/ranking": "/lista",
+}
+
+CAMINHO_BANCO = "dados_taf.db"
+CAMINHO_TABELAS = "tabelas_taf.json"  # Opcional; sem ele valem as tabelas padrão de pontuacao.py
+CAMINHO_VAGAS = "vagas_taf.json"  # Opcional; {"Cargo": vagas} marca o corte na classificação
+TAMANHO_RANKING = 50  # Classificados mostrados por vez na tela de classificação
+PASTA_RELATORIOS = "relatorios_taf"  # Uma planilha por candidato e o resumo do cohort
+PASTA_DIARIO = "."  # diario_<aparelho>.jsonl, mesclado depois com: python sincronizacao.py
+cadastro = CadastroPessoas(ArmazenamentoPessoas(CAMINHO_BANCO), Diario(PASTA_DIARIO))
+indice_busca = IndiceBusca()
+indice_ordenado = IndiceOrdenado()
+cadastro.ouvir(indice_busca)
+cadastro.ouvir(indice_ordenado)
+tarefas = ExecutorTarefas()  # Disco e cálculos pesados rodam fora do loop de eventos
+instrumentacao = Instrumentacao.do_ambiente()  # Desligada, não altera nenhum handler
+_tabelas_taf = None
+_pontuacao = None
+_versao_pontuacao = -1
+_estatisticas = None
+_lock_estatisticas = threading.Lock()
+_ranking = None
+_lock_ranking = threading.Lock()
+
+
+def tabelas_taf():
+    """Tabelas de pontuação, lidas no primeiro uso: pontuacao.py traz o numpy, que a tela inicial não usa."""
+    global _tabelas_taf
+    if _tabelas_taf is None:
+        from pontuacao import TabelasTAF
+        _tabelas_taf = TabelasTAF.carregar(CAMINHO_TABELAS)
+    return _tabelas_taf
+
+
+def pontuacao_atual():
+    """Pontua o cohort inteiro de uma vez e reaproveita o resultado até a próxima alteração."""
+    global _pontuacao, _versao_pontuacao
+    versao = cadastro.versao
+    pontuacao = _pontuacao
+    if pontuacao is None or _versao_pontuacao != versao:
+        pontuacao = _pontuacao = tabelas_taf().pontuar(list(cadastro))
+        _versao_pontuacao = versao
+    return pontuacao
+
+
+def estatisticas_cohort():
+    """Estatísticas do cohort, criadas na primeira visita ao painel e mantidas a cada alteração."""
+    global _estatisticas
+    with _lock_estatisticas:
+        if _estatisticas is None:
+            from estatisticas import EstatisticasCohort
+            estatisticas = EstatisticasCohort(tabelas_taf())
+            cadastro.ouvir(estatisticas)  # Inclui de uma vez quem já está cadastrado
+            _estatisticas = estatisticas
+    return _estatisticas
+
+
+def ranking_cargos():
+    """Classificação por cargo, criada no primeiro uso (tela ou exportação) e mantida a cada alteração."""
+    global _ranking
+    with _lock_ranking:
+        if _ranking is None:
+            from ranking import RankingCargos, carregar_vagas
+            ranking = RankingCargos(tabelas_taf(), carregar_vagas(CAMINHO_VAGAS))
+            cadastro.ouvir(ranking)
+            _ranking = ranking
+    return _ranking
 
 
 def create_text_field(label: str, keyboard_type: Optional[ft.KeyboardType] = None) -> ft.TextField:
@@ -56,6 +146,7 @@ def create_elevated_button(text: str, on_click, width: int = 200) -> ft.Elevated
 
 
 def main(page: ft.Page):
+    inicio_sessao = time.perf_counter()
     page.title = "TAF App"
     page.vertical_alignment = ft.MainAxisAlignment.CENTER
     page.horizontal_alignment = ft.CrossAxisAlignment.CENTER
@@ -64,13 +155,23 @@ def main(page: ft.Page):
     page.window_width = 800
     page.window_height = 900
     page.theme_mode = ft.ThemeMode.LIGHT
+    instrumentacao.observar_pagina(page)
+    # Handlers marcam o que mudou; cada volta do loop envia um único lote ao cliente
+    atualizacoes = AgendadorAtualizacoes(page, instrumentacao)
+
+    # Estado da sessão: no modo servidor cada avaliador tem a sua seleção e os seus formulários
+    pessoa_selecionada: Optional[Pessoa] = None
+    # Entradas (versão do cadastro, busca, seleção...) usadas na última montagem de cada view;
+    # route_change só remonta a view quando elas mudam
+    entradas_views: Dict[str, tuple] = {}
 
     # Tema
+    @instrumentacao.medir
     def change_theme(e):
         page.theme_mode = (
             ft.ThemeMode.DARK if page.theme_mode == ft.ThemeMode.LIGHT else ft.ThemeMode.LIGHT
         )
-        page.update()
+        atualizacoes.marcar()
 
     theme_switch = ft.Switch(
         value=False,
@@ -81,6 +182,7 @@ def main(page: ft.Page):
     #
     # Página Inicial (Homepage)
     #
+    @instrumentacao.medir
     def open_selecao_taf(e):
         page.go("/selecao_taf")
 
@@ -106,34 +208,36 @@ def main(page: ft.Page):
     #
     # Página de Seleção de TAF
     #
+    @instrumentacao.medir
     def open_cadastro(e):
         page.go("/cadastro")
 
-    selecao_taf_view = ft.View(
-        "/selecao_taf",
-        [
-            ft.AppBar(title=ft.Text("Selecione o Tipo de TAF"), actions=[theme_switch]),
-            ft.Column(
-                [
-                    create_elevated_button(
-                        "TAF Convencional",
-                        on_click=open_cadastro,
-                        width=300,
-                    ),
-                    create_elevated_button(
-                        "TAF Especializado",
-                        on_click=open_cadastro,  # Mudar para página de cadastro específica
-                        width=300,
-                    ),
-                ],
-                horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-                tight=True,
-            ),
-        ],
-        vertical_alignment=ft.MainAxisAlignment.CENTER,
-        horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-        appbar=ft.AppBar(title=ft.Text("Selecione o Tipo de TAF"), center_title=True),
-    )
+    def selecao_taf_view() -> ft.View:
+        return ft.View(
+            "/selecao_taf",
+            [
+                ft.AppBar(title=ft.Text("Selecione o Tipo de TAF"), actions=[theme_switch]),
+                ft.Column(
+                    [
+                        create_elevated_button(
+                            "TAF Convencional",
+                            on_click=open_cadastro,
+                            width=300,
+                        ),
+                        create_elevated_button(
+                            "TAF Especializado",
+                            on_click=open_cadastro,  # Mudar para página de cadastro específica
+                            width=300,
+                        ),
+                    ],
+                    horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+                    tight=True,
+                ),
+            ],
+            vertical_alignment=ft.MainAxisAlignment.CENTER,
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+            appbar=ft.AppBar(title=ft.Text("Selecione o Tipo de TAF"), center_title=True),
+        )
 
     #
     # Página de Cadastro
@@ -151,290 +255,508 @@ def main(page: ft.Page):
     )
     cargo_field = create_text_field("Cargo")
 
-    def cadastrar_pessoa(e):
-        global pessoa_selecionada
-        nome = nome_field.value
-        idade = idade_field.value
-        sexo = sexo_radio.value
-        cargo = cargo_field.value
+    duplicado_confirmado: Optional[tuple] = None
 
-        if not all([nome, idade, sexo, cargo]):
-            page.show_snack_bar(
-                ft.SnackBar(ft.Text("Por favor, preencha todos os campos."), open=True)
+    @instrumentacao.medir
+    async def cadastrar_pessoa(e):
+        nonlocal pessoa_selecionada, duplicado_confirmado
+        try:
+            nome, idade, sexo, cargo = validar_cadastro(
+                nome_field.value, idade_field.value, sexo_radio.value, cargo_field.value
             )
+        except ValueError as erro:
+            page.open(ft.SnackBar(ft.Text(str(erro))))
             return
 
-        try:
-            idade = int(idade)
-        except ValueError:
-            page.show_snack_bar(
-                ft.SnackBar(ft.Text("Idade deve ser um número inteiro."), open=True)
+        await tarefas.em_thread(cadastro.carregar)
+        # Mesmo nome e idade de alguém já cadastrado: avisa e só grava se o usuário clicar de novo
+        duplicatas = cadastro.duplicatas(nome, idade, ignorar=pessoa_selecionada.id if pessoa_selecionada else None)
+        chave = (nome, idade, pessoa_selecionada.id if pessoa_selecionada else None)
+        if duplicatas and duplicado_confirmado != chave:
+            duplicado_confirmado = chave
+            page.open(
+                ft.SnackBar(
+                    ft.Text(
+                        f"Já existe {duplicatas[0].nome} com {idade} anos ({duplicatas[0].cargo}). "
+                        "Clique em Cadastrar novamente para confirmar."
+                    )
+                )
             )
             return
+        duplicado_confirmado = None
 
         pessoa = None  # Inicializa pessoa aqui
         if pessoa_selecionada:  # se tiver alguem selecionado atualiza os dados
-            nome_original = pessoa_selecionada.nome  # Guarda o nome original
-
-            pessoa_selecionada.nome = nome
-            pessoa_selecionada.idade = idade
-            pessoa_selecionada.sexo = sexo
-            pessoa_selecionada.cargo = cargo
             pessoa = pessoa_selecionada  # atribui para mostrar no print
-
-            # Preservar os dados de abdominal, flexão e corrida
-            if nome_original in dados_pessoa:
-                dados_pessoa[pessoa_selecionada.nome] = dados_pessoa.pop(
-                    nome_original)  # Atualiza a chave no dicionário dados_pessoa
-                dados_pessoa[pessoa_selecionada.nome]["abdominal"] = pessoa_selecionada.abdominal
-                dados_pessoa[pessoa_selecionada.nome]["flexao"] = pessoa_selecionada.flexao
-                dados_pessoa[pessoa_selecionada.nome]["corrida"] = pessoa_selecionada.corrida
-
+            await tarefas.em_thread(cadastro.atualizar, pessoa, nome=nome, idade=idade, sexo=sexo, cargo=cargo)
+            atualizar_linha_pessoa(pessoa)
+            invalidar_linha_tabela(pessoa)
+            # Abdominal, flexão e corrida ficam na própria pessoa, então não há nada a preservar
 
         else:
             pessoa = Pessoa(nome, idade, sexo, cargo, None, None,
                             None)  # atribui o valor criado a pessoa
-            pessoas.append(pessoa)  # Se não tiver ninguem selecionado adiciona
+            await tarefas.em_thread(cadastro.adicionar, pessoa)  # Se não tiver ninguem selecionado adiciona
 
+        avisar_outras_sessoes("alterada", pessoa.id)
         print(f"Pessoa cadastrada: {pessoa}")
-        page.go("/lista")
 
         nome_field.value = ""
         idade_field.value = ""
         sexo_radio.value = None
         cargo_field.value = ""
         pessoa_selecionada = None  # reseta a seleção
-        page.update()
+        page.go("/lista")  # Envia a troca de rota e o formulário limpo juntos
 
-    cadastro_view = ft.View(
-        "/cadastro",
-        [
-            ft.AppBar(title=ft.Text("Cadastro de Pessoa"), actions=[theme_switch], center_title=True),
-            ft.Column(
-                [
-                    nome_field,
-                    idade_field,
-                    sexo_radio,
-                    cargo_field,
-                    create_elevated_button("Cadastrar", on_click=cadastrar_pessoa),
-                ],
-                horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-            ),
-        ],
-        vertical_alignment=ft.MainAxisAlignment.CENTER,
-        horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-        appbar=ft.AppBar(title=ft.Text("Cadastro de Pessoa"), center_title=True),
-    )
+    def cadastro_view() -> ft.View:
+        return ft.View(
+            "/cadastro",
+            [
+                ft.AppBar(title=ft.Text("Cadastro de Pessoa"), actions=[theme_switch], center_title=True),
+                ft.Column(
+                    [
+                        nome_field,
+                        idade_field,
+                        sexo_radio,
+                        cargo_field,
+                        create_elevated_button("Cadastrar", on_click=cadastrar_pessoa),
+                    ],
+                    horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+                ),
+            ],
+            vertical_alignment=ft.MainAxisAlignment.CENTER,
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+            appbar=ft.AppBar(title=ft.Text("Cadastro de Pessoa"), center_title=True),
+        )
 
     #
     # Página de Lista
     #
+    busca_timer: Optional[threading.Timer] = None
+
+    @instrumentacao.medir
+    def agendar_busca(e):
+        # Espera o usuário parar de digitar para filtrar uma única vez
+        nonlocal busca_timer
+        if busca_timer is not None:
+            busca_timer.cancel()
+        busca_timer = threading.Timer(ATRASO_BUSCA, atualizar_lista_pessoas)
+        busca_timer.daemon = True
+        busca_timer.start()
+
     search_field = ft.TextField(
         label="Buscar",
-        on_change=lambda e: atualizar_lista_pessoas(),
+        on_change=agendar_busca,
         width=150,
         border_color=ft.colors.BLUE_GREY_400,
     )
 
+    # Tabela paginada: as linhas são criadas uma vez por pessoa e descartadas só quando ela muda
+    linhas_tabela: Dict[str, ft.DataRow] = {}
+    pagina_tabela = 0
+
+    def texto_resultado(valor: Optional[int]) -> str:
+        return str(valor) if valor is not None else ""
+
+    def criar_linha_tabela(p: Pessoa) -> ft.DataRow:
+        _, _, _, total, situacao = pontuacao_atual().da_pessoa(p.id) or (None,) * 5
+        return ft.DataRow(
+            [
+                ft.DataCell(ft.Text(p.nome)),
+                ft.DataCell(ft.Text(str(p.idade))),
+                ft.DataCell(ft.Text(p.sexo)),
+                ft.DataCell(ft.Text(p.cargo)),
+                ft.DataCell(ft.Text(texto_resultado(p.abdominal))),
+                ft.DataCell(ft.Text(texto_resultado(p.flexao))),
+                ft.DataCell(ft.Text(texto_resultado(p.corrida))),
+                ft.DataCell(ft.Text(f"{total:g}" if total is not None else "")),
+                ft.DataCell(ft.Text(situacao or "")),
+            ]
+        )
+
+    def linha_tabela(p: Pessoa) -> ft.DataRow:
+        linha = linhas_tabela.get(p.id)
+        if linha is None:
+            linha = linhas_tabela[p.id] = criar_linha_tabela(p)
+        return linha
+
+    def invalidar_linha_tabela(p: Pessoa):
+        linhas_tabela.pop(p.id, None)
+
+    @instrumentacao.medir
+    def ordenar_tabela(e: ft.DataColumnSortEvent):
+        nonlocal pagina_tabela
+        data_table.sort_column_index = e.column_index
+        data_table.sort_ascending = e.ascending
+        pagina_tabela = 0
+        generate_data_table()
+        atualizacoes.marcar(data_table, texto_pagina, botao_pagina_anterior, botao_proxima_pagina)
+
+    @instrumentacao.medir
+    def mudar_pagina_tabela(delta: int):
+        nonlocal pagina_tabela
+        pagina_tabela += delta
+        generate_data_table()
+        atualizacoes.marcar(data_table, texto_pagina, botao_pagina_anterior, botao_proxima_pagina)
+
+    data_table = ft.DataTable(
+        columns=[
+            ft.DataColumn(ft.Text(titulo), on_sort=ordenar_tabela, numeric=coluna in COLUNAS_NUMERICAS)
+            for titulo, coluna in zip(TITULOS_TABELA, COLUNAS_TABELA)
+        ] + [
+            # Colunas calculadas pela pontuação
+            ft.DataColumn(ft.Text("Pontuação"), numeric=True),
+            ft.DataColumn(ft.Text("Situação")),
+        ],
+        sort_ascending=True,
+    )
+    texto_pagina = ft.Text()
+    botao_pagina_anterior = ft.IconButton(
+        icon=ft.icons.CHEVRON_LEFT,
+        tooltip="Página anterior",
+        on_click=lambda e: mudar_pagina_tabela(-1),
+    )
+    botao_proxima_pagina = ft.IconButton(
+        icon=ft.icons.CHEVRON_RIGHT,
+        tooltip="Próxima página",
+        on_click=lambda e: mudar_pagina_tabela(1),
+    )
+
+    @instrumentacao.medir
     def generate_data_table() -> ft.DataTable:
-        data_table = ft.DataTable(
-            columns=[
-                ft.DataColumn(ft.Text("Nome")),
-                ft.DataColumn(ft.Text("Idade")),
-                ft.DataColumn(ft.Text("Sexo")),
-                ft.DataColumn(ft.Text("Cargo")),
-                ft.DataColumn(ft.Text("Abdominal")),
-                ft.DataColumn(ft.Text("Flexão")),
-                ft.DataColumn(ft.Text("Corrida")),
-            ],
-            rows=[
-                ft.DataRow(
-                    [
-                        ft.DataCell(ft.Text(p.nome)),
-                        ft.DataCell(ft.Text(str(p.idade))),
-                        ft.DataCell(ft.Text(p.sexo)),
-                        ft.DataCell(ft.Text(p.cargo)),
-                        ft.DataCell(ft.Text(str(p.abdominal) or "")),
-                        ft.DataCell(ft.Text(str(p.flexao) or "")),
-                        ft.DataCell(ft.Text(str(p.corrida) or "")),
-                    ]
-                )
-                for p in pessoas
-            ],
+        """Preenche a tabela só com a página atual, na ordem da coluna escolhida."""
+        nonlocal pagina_tabela
+        total_paginas = max((len(indice_ordenado) - 1) // TAMANHO_PAGINA_TABELA + 1, 1)
+        pagina_tabela = min(max(pagina_tabela, 0), total_paginas - 1)
+
+        coluna = data_table.sort_column_index
+        pagina = indice_ordenado.pagina(
+            COLUNAS_TABELA[coluna] if coluna is not None else None,
+            data_table.sort_ascending,
+            pagina_tabela * TAMANHO_PAGINA_TABELA,
+            TAMANHO_PAGINA_TABELA,
         )
+        data_table.rows = [linha_tabela(p) for p in pagina]
+
+        texto_pagina.value = f"Página {pagina_tabela + 1} de {total_paginas}"
+        botao_pagina_anterior.disabled = pagina_tabela == 0
+        botao_proxima_pagina.disabled = pagina_tabela >= total_paginas - 1
+        entradas_views["/dados_todos"] = entradas_tabela()
         return data_table
 
+    def entradas_tabela() -> tuple:
+        return cadastro.versao, data_table.sort_column_index, data_table.sort_ascending, pagina_tabela
+
     # Função para exibir a tabela de dados e o botão de impressão
+    @instrumentacao.medir
     def show_data_table(e):
         page.go("/dados_todos")  # Navega para a página dados_todos
 
-    def export_to_excel(e):
-        wb = Workbook()
-        ws = wb.active
-        colunas = ["Nome", "Idade", "Sexo", "Cargo", "Abdominal", "Flexão", "Corrida"]
-
-        # Escreve os cabeçalhos
-        for col_num, column_title in enumerate(colunas, 1):
-            col_letter = get_column_letter(col_num)
-            ws[f"{col_letter}1"] = column_title
-
-        # Escreve os dados
-        for row_num, pessoa in enumerate(pessoas, 2):
-            ws[f"A{row_num}"] = pessoa.nome
-            ws[f"B{row_num}"] = pessoa.idade
-            ws[f"C{row_num}"] = pessoa.sexo
-            ws[f"D{row_num}"] = pessoa.cargo
-            ws[f"E{row_num}"] = pessoa.abdominal
-            ws[f"F{row_num}"] = pessoa.flexao
-            ws[f"G{row_num}"] = pessoa.corrida
-
-        # Ajustar a largura das colunas
-        for column_cells in ws.columns:
-            length = max(len(str(cell.value)) for cell in column_cells)
-            ws.column_dimensions[column_cells[0].column_letter].width = length + 2
-
-        # Salvar o arquivo
-        file_path = "dados_taf.xlsx"
-        wb.save(file_path)
-
-        # Mostrar um diálogo de sucesso
+    async def exportar_dados(file_path: str, exportar):
+        # A gravação roda em outro processo; o diálogo mostra o progresso enquanto isso
+        barra_progresso = ft.ProgressBar(width=300, value=0)
+        dlg = ft.AlertDialog(
+            modal=True,
+            title=ft.Text("Exportando..."),
+            content=barra_progresso,
+        )
+        page.open(dlg)
+
+        def atualizar_progresso(feitas: int, total: int):
+            barra_progresso.value = feitas / total if total else 1
+            atualizacoes.marcar(barra_progresso)
+
+        try:
+            lista = list(cadastro)
+            pontuacao = await tarefas.em_thread(lambda: tabelas_taf().pontuar(lista))
+            classificacao = await tarefas.em_thread(lambda: ranking_cargos().posicoes())
+            await tarefas.em_processo(
+                exportar, lista, file_path, pontuacao=pontuacao, classificacao=classificacao,
+                progresso=atualizar_progresso,
+            )
+        except OSError as erro:
+            dlg.title = ft.Text("Erro na Exportação")
+            dlg.content = ft.Text(f"Não foi possível salvar {file_path}: {erro}")
+        except ImportError as erro:  # Parquet sem o pyarrow instalado
+            dlg.title = ft.Text("Erro na Exportação")
+            dlg.content = ft.Text(str(erro))
+        else:
+            # Mostrar um diálogo de sucesso
+            dlg.title = ft.Text("Exportação Concluída")
+            dlg.content = ft.Text(f"Dados exportados para {file_path}")
+        dlg.actions = [
+            ft.TextButton("OK", on_click=lambda _: page.close(dlg)),
+        ]
+        atualizacoes.marcar(dlg)
+
+    @instrumentacao.medir
+    async def export_to_excel(e):
+        await exportar_dados("dados_taf.xlsx", exportar_excel)
+
+    @instrumentacao.medir
+    async def exportar_para_csv(e):
+        await exportar_dados("dados_taf.csv", exportar_csv)
+
+    @instrumentacao.medir
+    async def exportar_para_parquet(e):
+        await exportar_dados("dados_taf.parquet", exportar_parquet)
+
+    @instrumentacao.medir
+    async def gerar_relatorios_individuais(e):
+        # Os lotes de planilhas rodam no pool de processos; o diálogo mostra o progresso e permite cancelar
+        cancelamento = threading.Event()
+        barra_progresso = ft.ProgressBar(width=300, value=0)
+        texto_progresso = ft.Text("Preparando...")
         dlg = ft.AlertDialog(
             modal=True,
-            title=ft.Text("Exportação Concluída"),
-            content=ft.Text(f"Dados exportados para {file_path}"),
-            actions=[
-                ft.TextButton("OK", on_click=lambda _: page.close_dialog()),
+            title=ft.Text("Gerando Relatórios..."),
+            content=ft.Column([texto_progresso, barra_progresso], tight=True),
+            actions=[ft.TextButton("Cancelar", on_click=lambda _: cancelamento.set())],
+        )
+        page.open(dlg)
+
+        def atualizar_progresso(feitos: int, total: int):
+            barra_progresso.value = feitos / total if total else 1
+            texto_progresso.value = f"{feitos} de {total} candidatos"
+            atualizacoes.marcar(barra_progresso, texto_progresso)
+
+        try:
+            lista = list(cadastro)
+            pontuacao = await tarefas.em_thread(lambda: tabelas_taf().pontuar(lista))
+            resultado = await tarefas.em_thread(
+                gerar_relatorios,
+                linhas_relatorio(lista, pontuacao),
+                PASTA_RELATORIOS,
+                tarefas.pool_cpu,
+                atualizar_progresso,
+                cancelamento,
+            )
+        except OSError as erro:
+            dlg.title = ft.Text("Erro nos Relatórios")
+            dlg.content = ft.Text(f"Não foi possível gravar em {PASTA_RELATORIOS}: {erro}")
+        else:
+            dlg.title = ft.Text("Relatórios Cancelados" if resultado.cancelado else "Relatórios Concluídos")
+            dlg.content = ft.Text(
+                f"{resultado.gerados} de {resultado.total} relatórios gravados em {os.path.abspath(resultado.pasta)}"
+            )
+        dlg.actions = [
+            ft.TextButton("OK", on_click=lambda _: page.close(dlg)),
+        ]
+        atualizacoes.marcar(dlg)
+
+    # Linhas da lista criadas uma única vez por pessoa e reaproveitadas entre buscas e navegações
+    linhas_pessoas: Dict[str, ft.Row] = {}
+    resultado_busca: List[Pessoa] = []
+
+    def criar_linha_pessoa(pessoa: Pessoa) -> ft.Row:
+        return ft.Row(
+            [  # Usando Row para alinhar os botões
+                ft.ElevatedButton(
+                    text=pessoa.nome,
+                    on_click=lambda e, id_pessoa=pessoa.id: selecionar_pessoa(id_pessoa),
+                    width=200,  # Aumentei o tamanho do butão
+                    style=ft.ButtonStyle(
+                        bgcolor=ft.colors.BLUE_ACCENT_700,
+                        color=ft.colors.WHITE,
+                        padding=10,
+                        shape=ft.RoundedRectangleBorder(radius=10),
+                    ),
+                ),
+                ft.IconButton(
+                    icon=ft.icons.EDIT,  # Ícone de edição
+                    tooltip="Editar",
+                    on_click=lambda e, id_pessoa=pessoa.id: editar_pessoa(
+                        id_pessoa),  # Passa o id da pessoa
+                    icon_color=ft.colors.GREEN_500,
+                ),
+                ft.IconButton(
+                    icon=ft.icons.DELETE,  # Ícone de exclusão
+                    tooltip="Excluir",
+                    on_click=lambda e, id_pessoa=pessoa.id: excluir_pessoa(
+                        id_pessoa),  # Passa o id da pessoa
+                    icon_color=ft.colors.RED_500,
+                ),
             ],
+            alignment=ft.MainAxisAlignment.CENTER,  # Alinha os botões na horizontal
         )
-        page.dialog = dlg
-        dlg.open = True
-        page.update()
 
-    def close_dlg():
-        page.dialog.open = False  # Fecha o diálogo
-        page.update()
+    def linha_pessoa(pessoa: Pessoa) -> ft.Row:
+        linha = linhas_pessoas.get(pessoa.id)
+        if linha is None:
+            linha = linhas_pessoas[pessoa.id] = criar_linha_pessoa(pessoa)
+        return linha
+
+    def atualizar_linha_pessoa(pessoa: Pessoa):
+        """Após uma edição, altera só o texto da linha da pessoa (se ela já foi criada)."""
+        linha = linhas_pessoas.get(pessoa.id)
+        if linha is None:
+            return
+        botao = linha.controls[0]
+        botao.text = pessoa.nome
+        atualizacoes.marcar(botao)
 
+    @instrumentacao.medir
     def atualizar_lista_pessoas():
-        list_view.controls = [
-            ft.AppBar(
-                title=ft.Text("Lista de Pessoas"),
-                actions=[theme_switch],
-                center_title=True,
-            ),
-            ft.Row(
-                [  # Adicionando os iconButtons
-                    ft.IconButton(
-                        icon=ft.icons.ADD,
-                        tooltip="Adicionar Candidato",
-                        on_click=open_cadastro,
-                        style=ft.ButtonStyle(
-                            bgcolor=ft.colors.BLUE_ACCENT_700,
-                            color=ft.colors.WHITE,
-                            shape=ft.RoundedRectangleBorder(radius=10),
-                        ),
-                    ),
-                    search_field,
-                    create_elevated_button(
-                        "Ver Dados",
-                        on_click=show_data_table,  # chama a função show_data_table
-                        width=200,
-                    ),
-                ],
-                alignment=ft.MainAxisAlignment.CENTER,
-            ),
+        # Só a primeira página do resultado vai para o cliente; o resto entra conforme a rolagem
+        entradas_views["/lista"] = entradas_lista()
+        resultado_busca[:] = indice_busca.buscar(search_field.value)
+        lista_pessoas.controls = [linha_pessoa(p) for p in resultado_busca[:TAMANHO_PAGINA_LISTA]]
+        atualizacoes.marcar(lista_pessoas)
+
+    def entradas_lista() -> tuple:
+        return cadastro.versao, search_field.value
+
+    @instrumentacao.medir
+    def carregar_mais_pessoas(e: ft.OnScrollEvent):
+        exibidas = len(lista_pessoas.controls)
+        if exibidas >= len(resultado_busca) or e.pixels < e.max_scroll_extent - 200:
+            return
+        lista_pessoas.controls.extend(
+            linha_pessoa(p) for p in resultado_busca[exibidas:exibidas + TAMANHO_PAGINA_LISTA]
+        )
+        atualizacoes.marcar(lista_pessoas)
 
-        ]
+    @instrumentacao.medir
+    def excluir_pessoa(id_pessoa: str):
+        pessoa = cadastro.remover(id_pessoa)
+        if pessoa is None:
+            return
+        invalidar_linha_tabela(pessoa)
+        avisar_outras_sessoes("removida", id_pessoa)
+        # Remove apenas a linha da pessoa, sem reconstruir a lista
+        linha = linhas_pessoas.pop(pessoa.id, None)
+        if pessoa in resultado_busca:
+            resultado_busca.remove(pessoa)
+        if linha in lista_pessoas.controls:
+            lista_pessoas.controls.remove(linha)
+            atualizacoes.marcar(lista_pessoas)
+
+    @instrumentacao.medir
+    async def importar_arquivo(e: ft.FilePickerResultEvent):
+        if not e.files:
+            return
+        caminho = e.files[0].path
+        dlg = ft.AlertDialog(
+            modal=True,
+            title=ft.Text("Importando..."),
+            content=ft.ProgressBar(width=300),
+        )
+        page.open(dlg)
 
-        search_term = search_field.value.lower()
-        for pessoa in pessoas:
-            if search_term in pessoa.nome.lower() or search_term in pessoa.cargo.lower():
-                list_view.controls.append(
-                    ft.Row(
-                        [  # Usando Row para alinhar os botões
-                            ft.ElevatedButton(
-                                text=pessoa.nome,
-                                on_click=lambda e, p=pessoa: selecionar_pessoa(p),
-                                width=200,  # Aumentei o tamanho do butão
-                                style=ft.ButtonStyle(
-                                    bgcolor=ft.colors.BLUE_ACCENT_700,
-                                    color=ft.colors.WHITE,
-                                    padding=10,
-                                    shape=ft.RoundedRectangleBorder(radius=10),
-                                ),
-                            ),
-                            ft.IconButton(
-                                icon=ft.icons.EDIT,  # Ícone de edição
-                                tooltip="Editar",
-                                on_click=lambda e, p=pessoa: editar_pessoa(
-                                    p),  # Passa o objeto pessoa
-                                icon_color=ft.colors.GREEN_500,
-                            ),
-                            ft.IconButton(
-                                icon=ft.icons.DELETE,  # Ícone de exclusão
-                                tooltip="Excluir",
-                                on_click=lambda e, p=pessoa: excluir_pessoa(
-                                    p),  # Passa o objeto pessoa
-                                icon_color=ft.colors.RED_500,
-                            ),
-                        ],
-                        alignment=ft.MainAxisAlignment.CENTER,  # Alinha os botões na horizontal
-                    )
+        try:
+            resultado = await tarefas.em_thread(importar_pessoas, caminho, cadastro.adicionar_lote)
+        except (OSError, ValueError) as erro:
+            dlg.title = ft.Text("Erro na Importação")
+            dlg.content = ft.Text(str(erro))
+        else:
+            mensagens = [f"{resultado.importadas} candidatos importados."]
+            if resultado.rejeitadas:
+                mensagens.append(f"{len(resultado.rejeitadas)} linhas rejeitadas:")
+                mensagens.extend(
+                    f"Linha {numero}: {motivo}" for numero, motivo in resultado.rejeitadas[:MAX_REJEITADAS_EXIBIDAS]
                 )
-        page.update()
-
-    def excluir_pessoa(pessoa: Pessoa):
-        pessoas.remove(pessoa)
-        # Remove também do dicionário dados_pessoa
-        if pessoa.nome in dados_pessoa:
-            del dados_pessoa[pessoa.nome]
+            dlg.title = ft.Text("Importação Concluída")
+            dlg.content = ft.Column([ft.Text(m) for m in mensagens], tight=True, scroll=ft.ScrollMode.AUTO)
+        # A lista é atualizada uma única vez, no fim da importação
         atualizar_lista_pessoas()
-        page.update()
+        avisar_outras_sessoes("importacao")
+        dlg.actions = [
+            ft.TextButton("OK", on_click=lambda _: page.close(dlg)),
+        ]
+        atualizacoes.marcar(dlg)
 
-    def editar_pessoa(pessoa: Pessoa):
-        global pessoa_selecionada
+    seletor_importacao = ft.FilePicker(on_result=importar_arquivo)
+    page.overlay.append(seletor_importacao)
+
+    @instrumentacao.medir
+    def editar_pessoa(id_pessoa: str):
+        nonlocal pessoa_selecionada
+        pessoa = cadastro.obter(id_pessoa)
+        if pessoa is None:
+            return
         pessoa_selecionada = pessoa
         nome_field.value = pessoa.nome
         idade_field.value = str(pessoa.idade)
         sexo_radio.value = pessoa.sexo
         cargo_field.value = pessoa.cargo
-        page.go("/cadastro")
-        page.update()
+        page.go("/cadastro")  # Já envia o formulário preenchido
 
-    list_view = ft.View(
-        "/lista",
-        [
-            ft.AppBar(
-                title=ft.Text("Lista de Pessoas"),
-                actions=[theme_switch],
-                center_title=True,
-            ),
-            ft.Row(
-                [  # Adicionando os iconButtons
-                    ft.IconButton(
-                        icon=ft.icons.ADD,
-                        tooltip="Adicionar Candidato",
-                        on_click=open_cadastro,
-                        style=ft.ButtonStyle(
-                            bgcolor=ft.colors.BLUE_ACCENT_700,
-                            color=ft.colors.WHITE,
-                            shape=ft.RoundedRectangleBorder(radius=10),
-                        ),
-                    ),
-                    search_field,
-                    create_elevated_button(
-                        "Ver Dados",
-                        on_click=show_data_table,  # Chama a função show_data_table
-                        width=200,
-                    ),
-                ],
-                alignment=ft.MainAxisAlignment.CENTER,
-            ),
-        ],
-        vertical_alignment=ft.MainAxisAlignment.START,
-        horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-        appbar=ft.AppBar(title=ft.Text("Lista de Pessoas"), center_title=True),
+    lista_pessoas = ft.ListView(
+        expand=True,
+        spacing=5,
+        on_scroll=carregar_mais_pessoas,
+        on_scroll_interval=100,
     )
 
+    def list_view() -> ft.View:
+        return ft.View(
+            "/lista",
+            [
+                ft.AppBar(
+                    title=ft.Text("Lista de Pessoas"),
+                    actions=[theme_switch],
+                    center_title=True,
+                ),
+                ft.Row(
+                    [  # Adicionando os iconButtons
+                        ft.IconButton(
+                            icon=ft.icons.ADD,
+                            tooltip="Adicionar Candidato",
+                            on_click=open_cadastro,
+                            style=ft.ButtonStyle(
+                                bgcolor=ft.colors.BLUE_ACCENT_700,
+                                color=ft.colors.WHITE,
+                                shape=ft.RoundedRectangleBorder(radius=10),
+                            ),
+                        ),
+                        ft.IconButton(
+                            icon=ft.icons.UPLOAD_FILE,
+                            tooltip="Importar Candidatos (XLSX/CSV)",
+                            on_click=lambda _: seletor_importacao.pick_files(
+                                allowed_extensions=["xlsx", "xlsm", "csv"]
+                            ),
+                            style=ft.ButtonStyle(
+                                bgcolor=ft.colors.BLUE_ACCENT_700,
+                                color=ft.colors.WHITE,
+                                shape=ft.RoundedRectangleBorder(radius=10),
+                            ),
+                        ),
+                        ft.IconButton(
+                            icon=ft.icons.EDIT_NOTE,
+                            tooltip="Lançar Resultados em Grade (candidatos filtrados)",
+                            on_click=abrir_lancamento,
+                            style=ft.ButtonStyle(
+                                bgcolor=ft.colors.BLUE_ACCENT_700,
+                                color=ft.colors.WHITE,
+                                shape=ft.RoundedRectangleBorder(radius=10),
+                            ),
+                        ),
+                        ft.IconButton(
+                            icon=ft.icons.TIMER,
+                            tooltip="Bateria de Corrida (candidatos filtrados sem tempo)",
+                            on_click=abrir_bateria,
+                            style=ft.ButtonStyle(
+                                bgcolor=ft.colors.BLUE_ACCENT_700,
+                                color=ft.colors.WHITE,
+                                shape=ft.RoundedRectangleBorder(radius=10),
+                            ),
+                        ),
+                        search_field,
+                        create_elevated_button(
+                            "Ver Dados",
+                            on_click=show_data_table,  # Chama a função show_data_table
+                            width=200,
+                        ),
+                    ],
+                    alignment=ft.MainAxisAlignment.CENTER,
+                ),
+                lista_pessoas,
+            ],
+            vertical_alignment=ft.MainAxisAlignment.START,
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+            appbar=ft.AppBar(title=ft.Text("Lista de Pessoas"), center_title=True),
+        )
+
     #
     # Página de Dados
     #
@@ -442,90 +764,78 @@ def main(page: ft.Page):
     flexao_field = create_text_field("Flexão")
     corrida_field = create_text_field("Corrida")
 
-    def salvar_dados(e):
-        global pessoa_selecionada, dados_pessoa
-        if pessoa_selecionada:
+    @instrumentacao.medir
+    async def salvar_dados(e):
+        nonlocal pessoa_selecionada
+        if pessoa_selecionada and pessoa_selecionada.id in cadastro:
             try:
-                abdominal = int(abdominal_field.value) if abdominal_field.value else None
-                flexao = int(flexao_field.value) if flexao_field.value else None
-                corrida = int(corrida_field.value) if corrida_field.value else None
+                # A mesma validação das células da grade de lançamento
+                abdominal = converter_resultado(abdominal_field.value)
+                flexao = converter_resultado(flexao_field.value)
+                corrida = converter_resultado(corrida_field.value)
             except ValueError:
                 dialog = ft.AlertDialog(
                     modal=True,
                     title=ft.Text("Erro"),
-                    content=ft.Text(f"Os campos Abdominal, Flexão e Corrida devem ser números inteiros."),
+                    content=ft.Text("Os campos Abdominal, Flexão e Corrida devem ser números inteiros, sem negativos."),
                     actions=[
-                        ft.TextButton("OK", on_click=lambda _: page.close_dialog()),
+                        ft.TextButton("OK", on_click=lambda _: page.close(dialog)),
                     ],
                 )
-                page.dialog = dialog
-                dialog.open = True
-                page.update()
-
+                page.open(dialog)
                 return
 
-            dados_pessoa[pessoa_selecionada.nome] = {
-                "abdominal": abdominal,
-                "flexao": flexao,
-                "corrida": corrida,
-            }
-
-            pessoa_selecionada.abdominal = abdominal
-            pessoa_selecionada.flexao = flexao
-            pessoa_selecionada.corrida = corrida
+            await tarefas.em_thread(
+                cadastro.atualizar, pessoa_selecionada, abdominal=abdominal, flexao=flexao, corrida=corrida
+            )
+            invalidar_linha_tabela(pessoa_selecionada)
+            avisar_outras_sessoes("alterada", pessoa_selecionada.id)
 
             print(
-                f"Dados salvos para {pessoa_selecionada.nome}: {dados_pessoa[pessoa_selecionada.nome]}"
+                f"Dados salvos para {pessoa_selecionada.nome}: {pessoa_selecionada.resultados}"
             )
 
-            page.go("/lista")
             abdominal_field.value = ""
             flexao_field.value = ""
             corrida_field.value = ""
-            page.update()
+            page.go("/lista")
 
     def carregar_dados_existentes():
-        global pessoa_selecionada, dados_pessoa
+        # Quem chama envia a tela; aqui só os campos são preenchidos
+        entradas_views["/dados"] = entradas_dados()
         if pessoa_selecionada:
-            if pessoa_selecionada.nome in dados_pessoa:
-                dados = dados_pessoa[pessoa_selecionada.nome]
-                abdominal_field.value = (
-                    str(dados.get("abdominal", ""))
-                    if dados.get("abdominal") is not None
-                    else ""
-                )
-                flexao_field.value = (
-                    str(dados.get("flexao", "")) if dados.get("flexao") is not None else ""
-                )
-                corrida_field.value = (
-                    str(dados.get("corrida", "")) if dados.get("corrida") is not None else ""
-                )
-            else:
-                abdominal_field.value = ""
-                flexao_field.value = ""
-                corrida_field.value = ""
-        page.update()
-
-    dados_view = ft.View(
-        "/dados",
-        [
-            ft.Column(
-                [
-                    abdominal_field,
-                    flexao_field,
-                    corrida_field,
-                    create_elevated_button("Salvar", on_click=salvar_dados),
-                ],
-                horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-            ),
-        ],
-        vertical_alignment=ft.MainAxisAlignment.CENTER,
-        horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-        appbar=ft.AppBar(title=ft.Text("Dados Físicos"), actions=[theme_switch], center_title=True),
-    )
+            abdominal_field.value = texto_resultado(pessoa_selecionada.abdominal)
+            flexao_field.value = texto_resultado(pessoa_selecionada.flexao)
+            corrida_field.value = texto_resultado(pessoa_selecionada.corrida)
+
+    def entradas_dados() -> tuple:
+        return cadastro.versao, pessoa_selecionada.id if pessoa_selecionada else None
+
+    def dados_view() -> ft.View:
+        return ft.View(
+            "/dados",
+            [
+                ft.Column(
+                    [
+                        abdominal_field,
+                        flexao_field,
+                        corrida_field,
+                        create_elevated_button("Salvar", on_click=salvar_dados),
+                    ],
+                    horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+                ),
+            ],
+            vertical_alignment=ft.MainAxisAlignment.CENTER,
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+            appbar=ft.AppBar(title=ft.Text("Dados Físicos"), actions=[theme_switch], center_title=True),
+        )
 
-    def selecionar_pessoa(pessoa: Pessoa):
-        global pessoa_selecionada
+    @instrumentacao.medir
+    def selecionar_pessoa(id_pessoa: str):
+        nonlocal pessoa_selecionada
+        pessoa = cadastro.obter(id_pessoa)
+        if pessoa is None:
+            return
         pessoa_selecionada = pessoa
         print(f"Pessoa selecionada: {pessoa_selecionada}")
         carregar_dados_existentes()
@@ -535,10 +845,7 @@ def main(page: ft.Page):
     # Página de Dados Todos
     #
     def dados_todos_view():
-        # Função interna para usar o contexto da página
-
-        data_table = generate_data_table()
-
+        # Função interna para usar o contexto da página; a tabela é preenchida em route_change
         return ft.View(
             route="/dados_todos",
             controls=[
@@ -548,45 +855,696 @@ def main(page: ft.Page):
                     scroll=ft.ScrollMode.ALWAYS,
                     width=600,
                 ),
-                create_elevated_button(
-                    "Exportar para Excel",
-                    on_click=export_to_excel,
-                    width=200,
+                ft.Row(
+                    [botao_pagina_anterior, texto_pagina, botao_proxima_pagina],
+                    alignment=ft.MainAxisAlignment.CENTER,
+                ),
+                ft.Row(
+                    [
+                        create_elevated_button(
+                            "Exportar para Excel",
+                            on_click=export_to_excel,
+                            width=200,
+                        ),
+                        create_elevated_button(
+                            "Exportar CSV",
+                            on_click=exportar_para_csv,
+                            width=200,
+                        ),
+                        create_elevated_button(
+                            "Exportar Parquet",
+                            on_click=exportar_para_parquet,
+                            width=200,
+                        ),
+                        create_elevated_button(
+                            "Relatórios Individuais",
+                            on_click=gerar_relatorios_individuais,
+                            width=200,
+                        ),
+                        create_elevated_button(
+                            "Estatísticas",
+                            on_click=lambda e: page.go("/estatisticas"),
+                            width=200,
+                        ),
+                        create_elevated_button(
+                            "Classificação",
+                            on_click=lambda e: page.go("/ranking"),
+                            width=200,
+                        ),
+                    ],
+                    alignment=ft.MainAxisAlignment.CENTER,
+                    wrap=True,
                 ),
             ],
             vertical_alignment=ft.MainAxisAlignment.CENTER,
             horizontal_alignment=ft.CrossAxisAlignment.CENTER,
         )
 
+    #
+    # Página de Corrida (cronômetro de bateria)
+    #
+    bateria: Optional[Bateria] = None
+    relogio_bateria = ft.Text("00:00.0", size=40, weight=ft.FontWeight.BOLD)
+    grade_corredores = ft.GridView(expand=True, max_extent=220, child_aspect_ratio=2.2, spacing=8, run_spacing=8)
+
+    def botao_corredor(pessoa: Pessoa) -> ft.ElevatedButton:
+        return ft.ElevatedButton(
+            text=pessoa.nome,
+            data=pessoa.id,
+            on_click=registrar_chegada,
+            on_long_press=desfazer_chegada,
+            style=ft.ButtonStyle(shape=ft.RoundedRectangleBorder(radius=BORDER_RADIUS)),
+        )
+
+    @instrumentacao.medir
+    def abrir_bateria(e):
+        nonlocal bateria
+        corredores = [p for p in resultado_busca if p.corrida is None][:MAX_CORREDORES_BATERIA]
+        if not corredores:
+            page.open(
+                ft.SnackBar(ft.Text("Nenhum candidato sem tempo de corrida na lista filtrada."))
+            )
+            return
+        bateria = Bateria([p.id for p in corredores])
+        grade_corredores.controls = [botao_corredor(p) for p in corredores]
+        relogio_bateria.value = formatar_tempo(0)
+        botao_largada.disabled = False
+        page.go("/corrida")
+
+    async def atualizar_relogio():
+        # Só o texto do relógio vai para o cliente, nunca a tela inteira
+        while bateria is not None and bateria.em_andamento and relogio_bateria.page:
+            relogio_bateria.value = formatar_tempo(bateria.decorrido())
+            atualizacoes.marcar(relogio_bateria)
+            await asyncio.sleep(INTERVALO_RELOGIO)
+
+    @instrumentacao.medir
+    def largar_bateria(e):
+        if bateria is None or bateria.em_andamento:
+            return
+        bateria.largar()
+        botao_largada.disabled = True
+        atualizacoes.marcar(botao_largada)
+        page.run_task(atualizar_relogio)
+
+    @instrumentacao.medir
+    async def registrar_chegada(e: ft.ControlEvent):
+        # Assíncrono para rodar direto no loop, sem esperar uma thread livre antes de ler o relógio
+        if bateria is None:
+            return
+        tempo = bateria.registrar_chegada(e.control.data)
+        if tempo is None:
+            return
+        pessoa = cadastro.obter(e.control.data)
+        if pessoa is None:
+            bateria.desfazer_chegada(e.control.data)
+            desativar_corredor(e.control)
+            return
+        e.control.text = f"{pessoa.nome}  {formatar_tempo(tempo)}"
+        e.control.bgcolor = ft.colors.GREEN_100
+        atualizacoes.marcar(e.control)
+
+    @instrumentacao.medir
+    def desfazer_chegada(e: ft.ControlEvent):
+        if bateria is None or e.control.data not in bateria.chegadas:
+            return
+        bateria.desfazer_chegada(e.control.data)
+        pessoa = cadastro.obter(e.control.data)
+        if pessoa is None:
+            desativar_corredor(e.control)
+            return
+        e.control.text = pessoa.nome
+        e.control.bgcolor = None
+        atualizacoes.marcar(e.control)
+
+    def desativar_corredor(botao: ft.ElevatedButton):
+        # Excluído em outra sessão durante a bateria: o tempo não tem a quem ser gravado
+        botao.text = "Candidato excluído"
+        botao.bgcolor = None
+        botao.disabled = True
+        atualizacoes.marcar(botao)
+
+    @instrumentacao.medir
+    async def salvar_bateria(e):
+        nonlocal bateria
+        if bateria is None or not bateria.chegadas:
+            return
+        alteracoes = [
+            (pessoa, {"corrida": segundos})
+            for id_pessoa, segundos in bateria.tempos_em_segundos().items()
+            if (pessoa := cadastro.obter(id_pessoa)) is not None
+        ]
+        salva = bateria
+        botao_salvar_bateria.disabled = True  # Um segundo toque não grava os mesmos tempos de novo
+        atualizacoes.enviar(botao_salvar_bateria)
+        try:
+            # Todos os tempos numa única gravação
+            await tarefas.em_thread(cadastro.atualizar_lote, alteracoes)
+        except sqlite3.Error as erro:
+            # As chegadas continuam na bateria para tentar de novo
+            page.open(ft.SnackBar(ft.Text(f"Erro ao gravar os tempos ({erro}); tente salvar de novo.")))
+            return
+        finally:
+            botao_salvar_bateria.disabled = False
+            atualizacoes.marcar(botao_salvar_bateria)
+        if bateria is salva:
+            bateria = None
+        for pessoa, _ in alteracoes:
+            invalidar_linha_tabela(pessoa)
+            avisar_outras_sessoes("alterada", pessoa.id)
+        page.open(ft.SnackBar(ft.Text(f"{len(alteracoes)} tempos de corrida salvos.")))
+        page.go("/lista")
+
+    botao_largada = create_elevated_button("Largada", on_click=largar_bateria)
+    botao_salvar_bateria = create_elevated_button("Salvar Tempos", on_click=salvar_bateria)
+
+    def corrida_view() -> ft.View:
+        return ft.View(
+            "/corrida",
+            [
+                ft.Row(
+                    [relogio_bateria, botao_largada, botao_salvar_bateria],
+                    alignment=ft.MainAxisAlignment.CENTER,
+                ),
+                ft.Text("Toque no candidato ao cruzar a chegada; toque longo desfaz."),
+                grade_corredores,
+            ],
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+            appbar=ft.AppBar(title=ft.Text("Bateria de Corrida"), actions=[theme_switch], center_title=True),
+        )
+
+    #
+    # Página de Lançamento (grade de resultados)
+    #
+    candidatos_lancamento: List[Pessoa] = []
+    pagina_lancamento = 0
+    celulas_lancamento: List[List[ft.TextField]] = []  # [linha][prova] da página exibida
+    pendentes_lancamento = LancamentosPendentes()
+    gravacao_timer: Optional[threading.Timer] = None
+    focar_lancamento = False  # Primeira célula recebe o foco quando a grade chegar ao cliente
+    grade_lancamento = ft.Column(spacing=4, scroll=ft.ScrollMode.AUTO, expand=True)
+    status_lancamento = ft.Text("")
+    texto_pagina_lancamento = ft.Text("")
+
+    def celula_lancamento(pessoa: Pessoa, linha: int, coluna: int, campo: str) -> ft.TextField:
+        # "mostrado" é o valor que a célula tinha ao ser montada: passar por ela sem digitar não grava nada
+        valor = pendentes_lancamento.valor(pessoa.id, campo, getattr(pessoa, campo))
+        return ft.TextField(
+            value=texto_resultado(valor),
+            data={"id": pessoa.id, "campo": campo, "linha": linha, "coluna": coluna, "mostrado": valor},
+            width=110,
+            dense=True,
+            text_align=ft.TextAlign.RIGHT,
+            keyboard_type=ft.KeyboardType.NUMBER,
+            on_blur=validar_celula,
+            on_submit=proxima_celula,
+        )
+
+    def montar_grade_lancamento():
+        inicio = pagina_lancamento * TAMANHO_PAGINA_LANCAMENTO
+        pessoas = candidatos_lancamento[inicio:inicio + TAMANHO_PAGINA_LANCAMENTO]
+        celulas_lancamento[:] = [
+            [celula_lancamento(p, linha, coluna, campo) for coluna, (_, campo) in enumerate(CAMPOS_LANCAMENTO)]
+            for linha, p in enumerate(pessoas)
+        ]
+        grade_lancamento.controls = [
+            ft.Row([ft.Text(p.nome, width=240, no_wrap=True), *celulas])
+            for p, celulas in zip(pessoas, celulas_lancamento)
+        ]
+        total_paginas = max((len(candidatos_lancamento) - 1) // TAMANHO_PAGINA_LANCAMENTO + 1, 1)
+        texto_pagina_lancamento.value = f"Página {pagina_lancamento + 1} de {total_paginas}"
+        botao_lancamento_anterior.disabled = pagina_lancamento == 0
+        botao_lancamento_proximo.disabled = pagina_lancamento >= total_paginas - 1
+
+    def registrar_celula(celula: ft.TextField) -> bool:
+        """Valida a célula e deixa o valor pendente se ele mudou; só a própria célula volta ao cliente."""
+        try:
+            valor = converter_resultado(celula.value)
+        except ValueError as erro:
+            if celula.error_text != str(erro):
+                celula.error_text = str(erro)
+                atualizacoes.marcar(celula)
+            return False
+        if celula.error_text:
+            celula.error_text = None
+            atualizacoes.marcar(celula)
+        if valor != celula.data["mostrado"]:
+            celula.data["mostrado"] = valor
+            pendentes_lancamento.registrar(celula.data["id"], celula.data["campo"], valor)
+            agendar_gravacao()
+        return True
+
+    def registrar_pagina_lancamento() -> bool:
+        """Registra todas as células da página; falso se alguma ainda está inválida."""
+        validas = [registrar_celula(celula) for celulas in celulas_lancamento for celula in celulas]
+        return all(validas)
+
+    @instrumentacao.medir
+    def validar_celula(e: ft.ControlEvent):
+        registrar_celula(e.control)
+
+    @instrumentacao.medir
+    def proxima_celula(e: ft.ControlEvent):
+        # Enter desce na mesma prova, como numa planilha; no fim da página passa para a próxima prova
+        if not registrar_celula(e.control):
+            return
+        linha, coluna = e.control.data["linha"] + 1, e.control.data["coluna"]
+        if linha >= len(celulas_lancamento):
+            linha, coluna = 0, coluna + 1
+        if coluna < len(CAMPOS_LANCAMENTO):
+            celulas_lancamento[linha][coluna].focus()
+        elif not botao_lancamento_proximo.disabled:
+            mudar_pagina_lancamento(1)
+        else:
+            page.run_thread(gravar_lancamentos)
+
+    @instrumentacao.medir
+    def mudar_pagina_lancamento(delta: int):
+        nonlocal pagina_lancamento
+        if not registrar_pagina_lancamento():
+            status_lancamento.value = "Corrija as células marcadas antes de mudar de página."
+            atualizacoes.marcar(status_lancamento)
+            return
+        pagina_lancamento += delta
+        montar_grade_lancamento()
+        atualizacoes.enviar()  # As células novas precisam estar no cliente antes do focus()
+        if celulas_lancamento:
+            celulas_lancamento[0][0].focus()
+
+    def agendar_gravacao():
+        # Várias células lançadas em sequência vão para o banco numa única gravação
+        nonlocal gravacao_timer
+        if gravacao_timer is not None:
+            gravacao_timer.cancel()
+        gravacao_timer = threading.Timer(ATRASO_GRAVACAO_LANCAMENTO, gravar_lancamentos)
+        gravacao_timer.daemon = True
+        gravacao_timer.start()
+
+    @instrumentacao.medir
+    def gravar_lancamentos():
+        nonlocal gravacao_timer
+        if gravacao_timer is not None:
+            gravacao_timer.cancel()
+            gravacao_timer = None
+        try:
+            gravadas = pendentes_lancamento.gravar(cadastro)
+        except sqlite3.Error as erro:
+            # Nada se perde: as células voltaram a ficar pendentes para a próxima gravação
+            status_lancamento.value = f"Erro ao gravar ({erro}); os valores continuam pendentes."
+        else:
+            if not gravadas:
+                return
+            for pessoa in gravadas:
+                invalidar_linha_tabela(pessoa)
+                avisar_outras_sessoes("alterada", pessoa.id)
+            status_lancamento.value = f"{len(gravadas)} candidatos gravados às {time.strftime('%H:%M:%S')}."
+        atualizacoes.marcar(status_lancamento)
+
+    def atualizar_linha_lancamento(pessoa: Pessoa):
+        """Mostra a alteração de outro avaliador nas células da pessoa que não foram mexidas aqui."""
+        for celulas in celulas_lancamento:
+            if celulas[0].data["id"] != pessoa.id:
+                continue
+            for celula in celulas:
+                valor = getattr(pessoa, celula.data["campo"])
+                intocada = celula.value == texto_resultado(celula.data["mostrado"])
+                if intocada and valor != celula.data["mostrado"]:
+                    celula.data["mostrado"] = valor
+                    celula.value = texto_resultado(valor)
+                    atualizacoes.marcar(celula)
+
+    @instrumentacao.medir
+    def abrir_lancamento(e):
+        nonlocal pagina_lancamento, focar_lancamento
+        if not resultado_busca:
+            page.open(ft.SnackBar(ft.Text("Nenhum candidato na lista filtrada.")))
+            return
+        candidatos_lancamento[:] = resultado_busca
+        pagina_lancamento = 0
+        status_lancamento.value = ""
+        montar_grade_lancamento()
+        focar_lancamento = True  # O focus() só vale depois que route_change envia a view ao cliente
+        page.go("/lancamento")
+
+    @instrumentacao.medir
+    async def salvar_lancamentos(e):
+        validas = registrar_pagina_lancamento()
+        await tarefas.em_thread(gravar_lancamentos)
+        if not validas:
+            status_lancamento.value = "Corrija as células marcadas; as demais foram gravadas."
+            atualizacoes.marcar(status_lancamento)
+
+    botao_lancamento_anterior = ft.IconButton(
+        icon=ft.icons.CHEVRON_LEFT,
+        tooltip="Página anterior",
+        on_click=lambda e: mudar_pagina_lancamento(-1),
+    )
+    botao_lancamento_proximo = ft.IconButton(
+        icon=ft.icons.CHEVRON_RIGHT,
+        tooltip="Próxima página",
+        on_click=lambda e: mudar_pagina_lancamento(1),
+    )
+
+    def lancamento_view() -> ft.View:
+        return ft.View(
+            "/lancamento",
+            [
+                ft.Text("Enter desce para o próximo candidato; as alterações são gravadas sozinhas."),
+                ft.Row(
+                    [ft.Text("Nome", width=240, weight=ft.FontWeight.BOLD)]
+                    + [ft.Text(titulo, width=110, weight=ft.FontWeight.BOLD) for titulo, _ in CAMPOS_LANCAMENTO]
+                ),
+                grade_lancamento,
+                ft.Row(
+                    [
+                        botao_lancamento_anterior,
+                        texto_pagina_lancamento,
+                        botao_lancamento_proximo,
+                        create_elevated_button("Salvar", on_click=salvar_lancamentos, width=150),
+                    ],
+                    alignment=ft.MainAxisAlignment.CENTER,
+                ),
+                status_lancamento,
+            ],
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+            appbar=ft.AppBar(title=ft.Text("Lançamento de Resultados"), actions=[theme_switch], center_title=True),
+        )
+
+    #
+    # Página de Estatísticas do cohort
+    #
+    seletor_dimensao = ft.Dropdown(
+        label="Agrupar por",
+        width=200,
+        value="cargo",
+        options=[ft.dropdown.Option(chave, rotulo) for chave, rotulo in DIMENSOES_ESTATISTICAS.items()],
+    )
+    tabela_estatisticas = ft.DataTable(
+        columns=[
+            ft.DataColumn(ft.Text(titulo), numeric=numerica)
+            for titulo, numerica in [
+                ("Grupo", False), ("Candidatos", True), ("Aprovação", True), ("Pendentes", True),
+                ("Abdominal (média / p50 / p90)", True), ("Flexão (média / p50 / p90)", True),
+                ("Corrida s (média / p50 / p90)", True),
+            ]
+        ],
+        rows=[],
+    )
+
+    def formatar_prova(lancados, media, *quantis) -> str:
+        if not lancados:
+            return "-"
+        return " / ".join([f"{media:.1f}", *(f"{q:g}" for q in quantis)])
+
+    @instrumentacao.medir
+    def gerar_tabela_estatisticas():
+        """Monta a tabela a partir dos grupos já agregados; não percorre os candidatos."""
+        linhas = []
+        for linha in estatisticas_cohort().linhas(seletor_dimensao.value):
+            taxa = linha.taxa_aprovacao
+            linhas.append(
+                ft.DataRow(
+                    cells=[
+                        ft.DataCell(ft.Text(linha.grupo, weight=ft.FontWeight.BOLD if linha.grupo == "Todos" else None)),
+                        ft.DataCell(ft.Text(str(linha.candidatos))),
+                        ft.DataCell(ft.Text("-" if taxa is None else f"{taxa:.0%}")),
+                        ft.DataCell(ft.Text(str(linha.pendentes))),
+                        *(ft.DataCell(ft.Text(formatar_prova(*linha.provas[prova]))) for prova in CAMPOS_RESULTADOS),
+                    ]
+                )
+            )
+        tabela_estatisticas.rows = linhas
+        entradas_views["/estatisticas"] = entradas_estatisticas()
+
+    def entradas_estatisticas() -> tuple:
+        return cadastro.versao, seletor_dimensao.value
+
+    @instrumentacao.medir
+    def mudar_dimensao(e):
+        gerar_tabela_estatisticas()
+        atualizacoes.marcar(tabela_estatisticas)
+
+    seletor_dimensao.on_change = mudar_dimensao
+
+    def estatisticas_view() -> ft.View:
+        return ft.View(
+            "/estatisticas",
+            [
+                ft.Row(
+                    [seletor_dimensao, create_elevated_button("Atualizar", on_click=mudar_dimensao, width=150)],
+                    alignment=ft.MainAxisAlignment.CENTER,
+                ),
+                ft.Row([tabela_estatisticas], scroll=ft.ScrollMode.AUTO),
+            ],
+            scroll=ft.ScrollMode.AUTO,
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+            appbar=ft.AppBar(title=ft.Text("Estatísticas do Cohort"), actions=[theme_switch], center_title=True),
+        )
+
+    #
+    # Página de Classificação por cargo
+    #
+    seletor_cargo = ft.Dropdown(label="Cargo", width=200, options=[])
+    busca_ranking = ft.TextField(label="Buscar candidato", width=200, border_color=TEXT_FIELD_BORDER_COLOR)
+    texto_ranking = ft.Text("")
+    tabela_ranking = ft.DataTable(
+        columns=[
+            ft.DataColumn(ft.Text(titulo), numeric=numerica)
+            for titulo, numerica in [
+                ("Posição", True), ("Nome", False), ("Cargo", False), ("Idade", True),
+                ("Pontuação", True), ("Vagas", False),
+            ]
+        ],
+        rows=[],
+    )
+
+    @instrumentacao.medir
+    def gerar_tabela_ranking():
+        """Topo do cargo escolhido ou, com busca, a posição de cada candidato encontrado."""
+        ranking = ranking_cargos()
+        cargos = ranking.cargos()
+        seletor_cargo.options = [ft.dropdown.Option(cargo) for cargo in cargos]
+        if seletor_cargo.value not in cargos:
+            seletor_cargo.value = cargos[0] if cargos else None
+        cargo = seletor_cargo.value
+
+        if busca_ranking.value:
+            encontrados = (ranking.posicao(p.id) for p in indice_busca.buscar(busca_ranking.value))
+            classificados = list(islice(filter(None, encontrados), TAMANHO_RANKING))
+            texto_ranking.value = f"{len(classificados)} aprovados encontrados"
+        elif cargo is not None:
+            classificados = ranking.topo(cargo, TAMANHO_RANKING)
+            vagas = ranking.vagas_do_cargo(cargo)
+            texto_ranking.value = f"{ranking.classificados(cargo)} aprovados em {cargo}" + (
+                f", {vagas} vagas" if vagas is not None else ", sem número de vagas definido"
+            )
+        else:
+            classificados = []
+            texto_ranking.value = "Nenhum candidato aprovado ainda."
+
+        tabela_ranking.rows = [
+            ft.DataRow(
+                cells=[
+                    ft.DataCell(ft.Text(f"{c.posicao}º")),
+                    ft.DataCell(ft.Text(c.pessoa.nome)),
+                    ft.DataCell(ft.Text(c.pessoa.cargo)),
+                    ft.DataCell(ft.Text(str(c.pessoa.idade))),
+                    ft.DataCell(ft.Text(f"{c.total:g}")),
+                    ft.DataCell(ft.Text("-" if c.dentro_das_vagas is None else "Dentro" if c.dentro_das_vagas else "Fora")),
+                ],
+                color=ft.colors.GREEN_50 if c.dentro_das_vagas else None,
+            )
+            for c in classificados
+        ]
+        entradas_views["/ranking"] = entradas_ranking()
+
+    def entradas_ranking() -> tuple:
+        return cadastro.versao, seletor_cargo.value, busca_ranking.value
+
+    @instrumentacao.medir
+    def atualizar_ranking(e):
+        gerar_tabela_ranking()
+        atualizacoes.marcar(seletor_cargo, texto_ranking, tabela_ranking)
+
+    seletor_cargo.on_change = atualizar_ranking
+    busca_ranking.on_submit = atualizar_ranking
+
+    def ranking_view() -> ft.View:
+        return ft.View(
+            "/ranking",
+            [
+                ft.Row(
+                    [seletor_cargo, busca_ranking, create_elevated_button("Atualizar", on_click=atualizar_ranking, width=150)],
+                    alignment=ft.MainAxisAlignment.CENTER,
+                ),
+                texto_ranking,
+                ft.Row([tabela_ranking], scroll=ft.ScrollMode.AUTO),
+            ],
+            scroll=ft.ScrollMode.AUTO,
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+            appbar=ft.AppBar(title=ft.Text("Classificação por Cargo"), actions=[theme_switch], center_title=True),
+        )
+
+    #
+    # Alterações feitas por outros avaliadores (modo servidor)
+    #
+    atualizacao_remota: Optional[threading.Timer] = None
+
+    def avisar_outras_sessoes(tipo: str, id_pessoa: Optional[str] = None):
+        page.pubsub.send_others((tipo, id_pessoa))
+
+    def atualizar_tela_atual():
+        if page.route == "/lista":
+            atualizar_lista_pessoas()
+        elif page.route == "/dados_todos":
+            generate_data_table()
+            atualizacoes.marcar()
+        elif page.route == "/estatisticas":
+            gerar_tabela_estatisticas()
+            atualizacoes.marcar(tabela_estatisticas)
+        elif page.route == "/ranking":
+            gerar_tabela_ranking()
+            atualizacoes.marcar(seletor_cargo, texto_ranking, tabela_ranking)
+
+    @instrumentacao.medir
+    def ao_alterar_cadastro(mensagem):
+        nonlocal pessoa_selecionada, atualizacao_remota
+        tipo, id_pessoa = mensagem
+        if tipo == "removida":
+            linhas_pessoas.pop(id_pessoa, None)
+            linhas_tabela.pop(id_pessoa, None)
+            if pessoa_selecionada and pessoa_selecionada.id == id_pessoa:
+                pessoa_selecionada = None
+        elif id_pessoa is not None:
+            pessoa = cadastro.obter(id_pessoa)
+            if pessoa is not None:
+                atualizar_linha_pessoa(pessoa)
+                invalidar_linha_tabela(pessoa)
+                atualizar_linha_lancamento(pessoa)
+
+        if atualizacao_remota is not None:
+            atualizacao_remota.cancel()
+        atualizacao_remota = threading.Timer(ATRASO_ATUALIZACAO_REMOTA, atualizar_tela_atual)
+        atualizacao_remota.daemon = True
+        atualizacao_remota.start()
+
+    page.pubsub.subscribe(ao_alterar_cadastro)
+
     #
     # Rotas
     #
-    def route_change(route):
-        page.views.clear()
-        page.views.append(home_view)
-        if page.route == "/selecao_taf":
-            page.views.append(selecao_taf_view)
-        elif page.route == "/cadastro":
-            page.views.append(cadastro_view)
-        elif page.route == "/lista":
+    # Só a tela inicial existe antes do primeiro frame; as outras são montadas na primeira visita
+    construtores_views = {
+        "/selecao_taf": selecao_taf_view,
+        "/cadastro": cadastro_view,
+        "/lista": list_view,
+        "/dados": dados_view,
+        "/dados_todos": dados_todos_view,
+        "/corrida": corrida_view,
+        "/estatisticas": estatisticas_view,
+        "/lancamento": lancamento_view,
+        "/ranking": ranking_view,
+    }
+    views_por_rota: Dict[str, ft.View] = {}
+
+    def view_da_rota(rota: str) -> Optional[ft.View]:
+        view = views_por_rota.get(rota)
+        if view is None and rota in construtores_views:
+            view = views_por_rota[rota] = construtores_views[rota]()
+        return view
+
+    async def route_change(route):
+        # Leitura do banco e pontuação rodam fora do loop; a tela é enviada num único page.update()
+        nonlocal focar_lancamento
+        rota = page.route
+        if rota != "/lancamento" and page.views and page.views[-1].route == "/lancamento":
+            # Saindo da grade: grava o que ainda estava pendente antes de mostrar a próxima tela
+            registrar_pagina_lancamento()
+            await tarefas.em_thread(gravar_lancamentos)
+        if rota in ("/lista", "/dados_todos", "/estatisticas", "/ranking"):
+            await tarefas.em_thread(cadastro.carregar)
+
+        # Ir e voltar entre telas sem nenhuma alteração no meio não remonta nada
+        if rota == "/lista" and entradas_views.get(rota) != entradas_lista():
             atualizar_lista_pessoas()
-            page.views.append(list_view)
-        elif page.route == "/dados":
+        elif rota == "/dados" and entradas_views.get(rota) != entradas_dados():
             carregar_dados_existentes()
-            page.views.append(dados_view)
-        elif page.route == "/dados_todos":
-            page.views.append(dados_todos_view())  # Adicionei aqui
-        page.update()
+        elif rota == "/dados_todos" and entradas_views.get(rota) != entradas_tabela():
+            await tarefas.em_thread(pontuacao_atual)
+            generate_data_table()
+        elif rota == "/estatisticas" and entradas_views.get(rota) != entradas_estatisticas():
+            await tarefas.em_thread(estatisticas_cohort)
+            gerar_tabela_estatisticas()
+        elif rota == "/ranking" and entradas_views.get(rota) != entradas_ranking():
+            await tarefas.em_thread(ranking_cargos)
+            gerar_tabela_ranking()
 
+        page.views.clear()
+        page.views.append(home_view)
+        for view in (view_da_rota(ROTA_ANTERIOR.get(rota, "")), view_da_rota(rota)):
+            if view is not None:
+                page.views.append(view)
+        atualizacoes.enviar()  # A nova pilha de views e o que os handlers deixaram marcado, num só lote
+        if rota == "/lancamento" and focar_lancamento and celulas_lancamento:
+            focar_lancamento = False
+            celulas_lancamento[0][0].focus()
+        relatar_inicializacao()
+
+    inicializacao_relatada = False
+
+    def relatar_inicializacao():
+        nonlocal inicializacao_relatada
+        if inicializacao_relatada:
+            return
+        inicializacao_relatada = True
+        agora = time.perf_counter()
+        print(
+            f"Primeira tela em {(agora - INICIO) * 1000:.0f} ms desde o início do processo "
+            f"({(agora - inicio_sessao) * 1000:.0f} ms nesta sessão)"
+        )
+
+    @instrumentacao.medir
     def view_pop(view):
         page.views.pop()
         top_view = page.views[-1]
         page.go(top_view.route)
 
-    page.on_route_change = route_change
+    page.on_route_change = instrumentacao.medir(route_change, nome=lambda e: f"rota {page.route}")
     page.on_view_pop = view_pop
+    painel_instrumentacao = instrumentacao.painel(page)
+    if painel_instrumentacao is not None:
+        page.overlay.append(painel_instrumentacao)
     page.go(page.route)
 
+    # Ações da sessão, para rodar as telas sem interface (benchmark.py)
+    return SimpleNamespace(
+        search_field=search_field,
+        atualizar_lista_pessoas=atualizar_lista_pessoas,
+        generate_data_table=generate_data_table,
+        export_to_excel=export_to_excel,
+        route_change=route_change,
+    )
+
 
 if __name__ == "__main__":
-    ft.app(target=main)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="TAF App")
+    parser.add_argument(
+        "--servidor",
+        action="store_true",
+        help="serve o app pelo navegador, para vários avaliadores lançarem dados ao mesmo tempo",
+    )
+    parser.add_argument("--host", default="0.0.0.0", help="endereço do servidor (padrão: todas as interfaces)")
+    parser.add_argument("--porta", type=int, default=8550, help="porta do servidor (padrão: 8550)")
+    parser.add_argument(
+        "--instrumentar",
+        action="store_true",
+        help="mede rotas, handlers e page.update() e mostra o painel de depuração (o mesmo que TAF_INSTRUMENTACAO=1)",
+    )
+    args = parser.parse_args()
+    if args.instrumentar:
+        instrumentacao.ativar()
+
+    if args.servidor:
+        ft.app(target=main, view=ft.AppView.WEB_BROWSER, host=args.host, port=args.porta)
+    else:
+        ft.app(target=main)
\ No newline at end of file
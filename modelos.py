@@ -0,0 +1,61 @@
+import sys
+import uuid
+from typing import Dict, Optional, Tuple
+
+# Campos de um candidato, na ordem usada no banco, na tabela, nas exportações e no diário
+CAMPOS_CADASTRO = ("nome", "idade", "sexo", "cargo")
+CAMPOS_RESULTADOS = ("abdominal", "flexao", "corrida")
+CAMPOS_PESSOA = CAMPOS_CADASTRO + CAMPOS_RESULTADOS
+TITULOS_CAMPOS = {
+    "nome": "Nome", "idade": "Idade", "sexo": "Sexo", "cargo": "Cargo",
+    "abdominal": "Abdominal", "flexao": "Flexão", "corrida": "Corrida",
+}
+# Nas telas e relatórios a corrida mostra a unidade; as planilhas exportadas não, para poderem ser importadas
+TITULOS_COM_UNIDADE = {**TITULOS_CAMPOS, "corrida": "Corrida (s)"}
+
+
+class Pessoa:
+    # Sem __dict__ por instância: cada candidato ocupa só os campos abaixo
+    __slots__ = ("id",) + CAMPOS_PESSOA
+
+    def __init__(self, nome: str, idade: int, sexo: str, cargo: str, abdominal: Optional[int] = None,
+                 flexao: Optional[int] = None, corrida: Optional[int] = None, id: Optional[str] = None):
+        self.id = id or uuid.uuid4().hex  # Identificador estável usado como chave no banco
+        self.nome = nome
+        self.idade = idade
+        self.sexo = sys.intern(sexo)  # Sexo e cargo se repetem muito; uma única cópia de cada texto
+        self.cargo = sys.intern(cargo)
+        self.abdominal = abdominal
+        self.flexao = flexao
+        self.corrida = corrida
+
+    @property
+    def resultados(self) -> Dict[str, Optional[int]]:
+        return {"abdominal": self.abdominal, "flexao": self.flexao, "corrida": self.corrida}
+
+    def __repr__(self):
+        return f"Pessoa(nome='{self.nome}', idade={self.idade}, sexo='{self.sexo}', cargo='{self.cargo}')"
+
+
+SEXOS = {"m": "masculino", "masculino": "masculino", "f": "feminino", "feminino": "feminino"}
+
+
+def validar_cadastro(nome, idade, sexo, cargo) -> Tuple[str, int, str, str]:
+    """Aplica as regras do formulário de cadastro e devolve os valores já convertidos.
+
+    Levanta ValueError com a mensagem que deve ser mostrada ao usuário.
+    """
+    if not all([nome, idade, sexo, cargo]):
+        raise ValueError("Por favor, preencha todos os campos.")
+
+    if isinstance(idade, float) and not idade.is_integer():
+        raise ValueError("Idade deve ser um número inteiro.")
+    try:
+        idade = int(idade)
+    except ValueError:
+        raise ValueError("Idade deve ser um número inteiro.") from None
+
+    sexo_normalizado = SEXOS.get(str(sexo).strip().lower())
+    if sexo_normalizado is None:
+        raise ValueError("Sexo deve ser masculino ou feminino.")
+    return nome, idade, sexo_normalizado, cargo
@@ -0,0 +1,125 @@
+import threading
+from bisect import bisect_left, insort
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from busca import normalizar
+from modelos import Pessoa
+
+
+def _numero(valor: Optional[int]) -> Tuple[bool, int]:
+    # Resultados ainda não lançados ficam no fim da ordenação crescente
+    return valor is None, valor or 0
+
+
+CHAVES_ORDENACAO: Dict[str, Callable[[Pessoa], Any]] = {
+    "nome": lambda p: normalizar(p.nome),
+    "idade": lambda p: p.idade,
+    "sexo": lambda p: p.sexo,
+    "cargo": lambda p: normalizar(p.cargo),
+    "abdominal": lambda p: _numero(p.abdominal),
+    "flexao": lambda p: _numero(p.flexao),
+    "corrida": lambda p: _numero(p.corrida),
+}
+
+
+class IndiceOrdenado:
+    """Mantém, para cada coluna, as pessoas já ordenadas pela chave daquela coluna.
+
+    Cada alteração reposiciona só a pessoa alterada (busca binária), então pedir uma
+    página ordenada não precisa ordenar o cadastro inteiro. Cargas grandes passam por
+    `adicionar_lote`, que ordena cada coluna uma vez em vez de inserir pessoa a pessoa.
+    """
+
+    def __init__(self, chaves: Dict[str, Callable[[Pessoa], Any]] = CHAVES_ORDENACAO):
+        self.chaves = chaves
+        self._pessoas: Dict[str, Pessoa] = {}
+        self._ordem: Dict[str, int] = {}
+        self._colunas: Dict[str, List[tuple]] = {coluna: [] for coluna in chaves}
+        self._entradas: Dict[str, Dict[str, tuple]] = {}  # id -> coluna -> entrada na lista ordenada
+        self._proxima_ordem = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._pessoas)
+
+    def _inserir(self, pessoa: Pessoa):
+        ordem = self._ordem[pessoa.id]
+        entradas = {}
+        for coluna, chave in self.chaves.items():
+            entrada = (chave(pessoa), ordem, pessoa.id)
+            insort(self._colunas[coluna], entrada)
+            entradas[coluna] = entrada
+        self._entradas[pessoa.id] = entradas
+
+    def _retirar(self, id_pessoa: str):
+        for coluna, entrada in self._entradas.pop(id_pessoa).items():
+            lista = self._colunas[coluna]
+            del lista[bisect_left(lista, entrada)]
+
+    def adicionar(self, pessoa: Pessoa):
+        with self._lock:
+            if pessoa.id in self._pessoas:
+                self.atualizar(pessoa)
+                return
+            self._pessoas[pessoa.id] = pessoa
+            self._ordem[pessoa.id] = self._proxima_ordem
+            self._proxima_ordem += 1
+            self._inserir(pessoa)
+
+    def adicionar_lote(self, pessoas: Iterable[Pessoa]):
+        """Como `adicionar`, para muitas pessoas: cada coluna é ordenada uma vez só.
+
+        Na carga inicial um insort por pessoa custaria O(n) cada; aqui as entradas novas
+        entram no fim de cada lista e um único sort (que junta as duas partes já ordenadas)
+        as põe no lugar.
+        """
+        with self._lock:
+            novas: Dict[str, List[tuple]] = {coluna: [] for coluna in self.chaves}
+            for pessoa in pessoas:
+                if pessoa.id in self._pessoas:
+                    self.atualizar(pessoa)
+                    continue
+                ordem = self._ordem[pessoa.id] = self._proxima_ordem
+                self._proxima_ordem += 1
+                self._pessoas[pessoa.id] = pessoa
+                entradas = self._entradas[pessoa.id] = {}
+                for coluna, chave in self.chaves.items():
+                    entrada = entradas[coluna] = (chave(pessoa), ordem, pessoa.id)
+                    novas[coluna].append(entrada)
+            for coluna, entradas in novas.items():
+                if entradas:
+                    lista = self._colunas[coluna]
+                    lista.extend(entradas)
+                    lista.sort()
+
+    def atualizar(self, pessoa: Pessoa):
+        with self._lock:
+            if pessoa.id not in self._pessoas:
+                self.adicionar(pessoa)
+                return
+            self._retirar(pessoa.id)
+            self._pessoas[pessoa.id] = pessoa
+            self._inserir(pessoa)
+
+    def remover(self, pessoa: Pessoa):
+        with self._lock:
+            if self._pessoas.pop(pessoa.id, None) is None:
+                return
+            self._retirar(pessoa.id)
+            del self._ordem[pessoa.id]
+
+    def pagina(self, coluna: Optional[str], crescente: bool, inicio: int, tamanho: int) -> List[Pessoa]:
+        """Retorna uma página da lista ordenada; sem coluna, usa a ordem de cadastro."""
+        with self._lock:
+            if coluna is None:
+                pessoas = self._pessoas.values()
+                return list(islice(pessoas if crescente else reversed(pessoas), inicio, inicio + tamanho))
+
+            lista = self._colunas[coluna]
+            if crescente:
+                entradas = lista[inicio:inicio + tamanho]
+            else:
+                fim = max(len(lista) - inicio, 0)
+                entradas = lista[max(fim - tamanho, 0):fim][::-1]
+            return [self._pessoas[id_pessoa] for _, _, id_pessoa in entradas]
@@ -0,0 +1,254 @@
+import json
+import os
+from bisect import bisect_right
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from busca import normalizar
+from modelos import CAMPOS_RESULTADOS, Pessoa
+
+PROVAS = CAMPOS_RESULTADOS
+QUALQUER_CARGO = "*"
+CODIGOS_SEXO = {"masculino": 0, "feminino": 1}
+
+# Situação de cada candidato depois da pontuação
+PENDENTE = -1
+REPROVADO = 0
+APROVADO = 1
+TEXTO_SITUACAO = {PENDENTE: "Pendente", REPROVADO: "Reprovado", APROVADO: "Aprovado"}
+
+
+class TabelaProva:
+    """Índices de uma prova por grupo (cargo, sexo, faixa etária).
+
+    Cada grupo tem limites de desempenho e os pontos obtidos ao atingir cada limite.
+    Na corrida (tempo em segundos) vale o contrário: quanto menor, melhor.
+    """
+
+    def __init__(self, maior_melhor: bool, grupos: Dict[Tuple[str, str, int], Tuple[Sequence[float], Sequence[float]]]):
+        self.maior_melhor = maior_melhor
+        self.grupos = grupos
+
+
+class Pontuacao:
+    """Pontos e situação de um cohort, em colunas alinhadas com a lista pontuada."""
+
+    def __init__(self, ids: List[str], pontos: Dict[str, np.ndarray], total: np.ndarray, situacao: np.ndarray):
+        self.ids = ids
+        self.pontos = pontos
+        self.total = total
+        self.situacao = situacao
+        self._posicoes: Optional[Dict[str, int]] = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def posicao(self, id_pessoa: str) -> Optional[int]:
+        if self._posicoes is None:
+            self._posicoes = {id_pessoa: i for i, id_pessoa in enumerate(self.ids)}
+        return self._posicoes.get(id_pessoa)
+
+    def linhas(self, inicio: int = 0, fim: Optional[int] = None) -> List[tuple]:
+        """(pontos por prova..., total, situação) de cada pessoa, com None onde não há nota.
+
+        `inicio` e `fim` limitam a um trecho do cohort, para quem exporta em blocos.
+        """
+        trecho = slice(inicio, fim)
+        colunas = [
+            np.where(np.isnan(self.pontos[prova][trecho]), None, self.pontos[prova][trecho]).tolist()
+            for prova in PROVAS
+        ]
+        colunas.append(np.where(np.isnan(self.total[trecho]), None, self.total[trecho]).tolist())
+        colunas.append([TEXTO_SITUACAO[s] for s in self.situacao[trecho].tolist()])
+        return list(zip(*colunas))
+
+    def da_pessoa(self, id_pessoa: str) -> Optional[tuple]:
+        i = self.posicao(id_pessoa)
+        if i is None:
+            return None
+        pontos = [None if np.isnan(self.pontos[prova][i]) else float(self.pontos[prova][i]) for prova in PROVAS]
+        total = None if np.isnan(self.total[i]) else float(self.total[i])
+        return (*pontos, total, TEXTO_SITUACAO[int(self.situacao[i])])
+
+
+class TabelasTAF:
+    def __init__(self, faixas_etarias: Sequence[int], provas: Dict[str, TabelaProva], nota_minima: float):
+        self.faixas_etarias = np.asarray(sorted(faixas_etarias), dtype=np.int64)
+        self.provas = provas
+        self.nota_minima = nota_minima
+        self._compilar()
+
+    def _compilar(self):
+        """Monta, por prova, matrizes de limites/pontos e o mapa (cargo, sexo, faixa) -> grupo."""
+        cargos = {QUALQUER_CARGO}
+        for tabela in self.provas.values():
+            cargos.update(normalizar(cargo) if cargo != QUALQUER_CARGO else cargo for cargo, _, _ in tabela.grupos)
+        self._cargos = {cargo: i for i, cargo in enumerate(sorted(cargos))}
+        n_faixas = len(self.faixas_etarias) + 1
+
+        self._grupo: Dict[str, np.ndarray] = {}
+        self._limites: Dict[str, np.ndarray] = {}
+        self._valores: Dict[str, np.ndarray] = {}
+        for prova, tabela in self.provas.items():
+            grupo = np.full((len(self._cargos), len(CODIGOS_SEXO), n_faixas), -1, dtype=np.int64)
+            n_limites = max((len(limites) for limites, _ in tabela.grupos.values()), default=1)
+            # Limites não usados ficam impossíveis de atingir
+            limites = np.full((len(tabela.grupos), n_limites), np.inf)
+            valores = np.zeros((len(tabela.grupos), n_limites))
+            for g, ((cargo, sexo, faixa), (lim, pts)) in enumerate(tabela.grupos.items()):
+                # Ordena do índice mais fácil para o mais difícil
+                pares = sorted(zip(lim, pts), reverse=not tabela.maior_melhor)
+                sinal = 1 if tabela.maior_melhor else -1
+                limites[g, :len(pares)] = [sinal * limite for limite, _ in pares]
+                valores[g, :len(pares)] = [pontos for _, pontos in pares]
+                cargo = normalizar(cargo) if cargo != QUALQUER_CARGO else cargo
+                grupo[self._cargos[cargo], CODIGOS_SEXO[sexo], faixa] = g
+            # Cargos sem tabela própria usam a tabela geral
+            geral = grupo[self._cargos[QUALQUER_CARGO]]
+            grupo = np.where(grupo < 0, geral[np.newaxis], grupo)
+            self._grupo[prova] = grupo
+            self._limites[prova] = limites
+            self._valores[prova] = valores
+        # Cópias em listas do Python para pontuar uma pessoa por vez sem o custo do numpy
+        self._grupo_lista = {prova: grupo.tolist() for prova, grupo in self._grupo.items()}
+        self._limites_lista = {prova: limites.tolist() for prova, limites in self._limites.items()}
+        self._valores_lista = {prova: valores.tolist() for prova, valores in self._valores.items()}
+        self._faixas_lista = self.faixas_etarias.tolist()
+        self._indice_cargo: Dict[str, int] = {}
+
+    def faixa_etaria(self, idade: int) -> int:
+        return bisect_right(self._faixas_lista, idade)
+
+    def pontuar_pessoa(self, pessoa: Pessoa) -> tuple:
+        """Mesmo resultado de `pontuar` para uma única pessoa: (pontos por prova..., total, situação).
+
+        Usado por quem acompanha as alterações uma a uma; pontos ausentes são None.
+        """
+        cargo = self._indice_cargo.get(pessoa.cargo)
+        if cargo is None:
+            cargo = self._indice_cargo[pessoa.cargo] = self._cargos.get(
+                normalizar(pessoa.cargo), self._cargos[QUALQUER_CARGO]
+            )
+        sexo = CODIGOS_SEXO.get(pessoa.sexo)
+        faixa = self.faixa_etaria(pessoa.idade)
+
+        pontos = []
+        for prova in PROVAS:
+            valor = getattr(pessoa, prova)
+            if prova not in self.provas or sexo is None or valor is None:
+                pontos.append(None)
+                continue
+            grupo = self._grupo_lista[prova][cargo][sexo][faixa]
+            if grupo < 0:
+                pontos.append(None)
+                continue
+            sinal = 1 if self.provas[prova].maior_melhor else -1
+            atingidos = bisect_right(self._limites_lista[prova][grupo], sinal * valor)
+            pontos.append(self._valores_lista[prova][grupo][atingidos - 1] if atingidos else 0.0)
+
+        notas = [p for p in pontos if p is not None]
+        if any(p < self.nota_minima for p in notas):
+            situacao = REPROVADO
+        elif len(notas) < len(pontos):
+            situacao = PENDENTE
+        else:
+            situacao = APROVADO
+        total = sum(notas) if len(notas) == len(pontos) else None
+        return (*pontos, total, situacao)
+
+    def pontuar(self, pessoas: Sequence[Pessoa]) -> Pontuacao:
+        n = len(pessoas)
+        idade = np.fromiter((p.idade for p in pessoas), dtype=np.int64, count=n)
+        sexo = np.fromiter((CODIGOS_SEXO.get(p.sexo, -1) for p in pessoas), dtype=np.int64, count=n)
+        nomes_cargo, cargo_por_pessoa = np.unique(
+            np.array([p.cargo for p in pessoas], dtype=object).astype(str), return_inverse=True
+        )
+        mapa_cargos = np.array(
+            [self._cargos.get(normalizar(cargo), self._cargos[QUALQUER_CARGO]) for cargo in nomes_cargo],
+            dtype=np.int64,
+        )
+        resultados = {
+            prova: np.fromiter(
+                (np.nan if getattr(p, prova) is None else getattr(p, prova) for p in pessoas),
+                dtype=np.float64,
+                count=n,
+            )
+            for prova in PROVAS
+        }
+        return self.pontuar_colunas(
+            [p.id for p in pessoas], idade, sexo, mapa_cargos[cargo_por_pessoa.reshape(-1)], resultados
+        )
+
+    def pontuar_colunas(self, ids: List[str], idade: np.ndarray, sexo: np.ndarray, cargo: np.ndarray,
+                        resultados: Dict[str, np.ndarray]) -> Pontuacao:
+        """Pontua todo o cohort de uma vez; cargo já vem como índice interno das tabelas."""
+        faixa = np.searchsorted(self.faixas_etarias, idade, side="right")
+        sexo_valido = sexo >= 0
+        sexo_indice = np.where(sexo_valido, sexo, 0)
+
+        pontos: Dict[str, np.ndarray] = {}
+        for prova in PROVAS:
+            valor = resultados[prova]
+            if prova not in self.provas:
+                pontos[prova] = np.full(len(ids), np.nan)
+                continue
+            sinal = 1 if self.provas[prova].maior_melhor else -1
+            grupo = self._grupo[prova][cargo, sexo_indice, faixa]
+            valido = sexo_valido & (grupo >= 0) & ~np.isnan(valor)
+            grupo = np.where(valido, grupo, 0)
+
+            # Quantos limites a pessoa atingiu; os pontos são os do último limite atingido
+            atingidos = (sinal * valor[:, np.newaxis] >= self._limites[prova][grupo]).sum(axis=1)
+            obtidos = self._valores[prova][grupo, np.maximum(atingidos - 1, 0)]
+            pontos[prova] = np.where(valido, np.where(atingidos > 0, obtidos, 0.0), np.nan)
+
+        matriz = np.stack([pontos[prova] for prova in PROVAS])
+        total = matriz.sum(axis=0)  # nan enquanto faltar alguma prova
+        reprovado = (matriz < self.nota_minima).any(axis=0)
+        pendente = np.isnan(matriz).any(axis=0)
+        situacao = np.where(reprovado, REPROVADO, np.where(pendente, PENDENTE, APROVADO)).astype(np.int8)
+        return Pontuacao(list(ids), pontos, total, situacao)
+
+    @classmethod
+    def de_dicionario(cls, dados: dict) -> "TabelasTAF":
+        provas = {}
+        for prova, definicao in dados["provas"].items():
+            grupos = {
+                (tabela.get("cargo", QUALQUER_CARGO), tabela["sexo"], int(tabela["faixa"])):
+                    (tabela["limites"], tabela["pontos"])
+                for tabela in definicao["tabelas"]
+            }
+            provas[prova] = TabelaProva(definicao.get("maior_melhor", True), grupos)
+        return cls(dados["faixas_etarias"], provas, dados.get("nota_minima", 50))
+
+    @classmethod
+    def carregar(cls, caminho: str) -> "TabelasTAF":
+        """Lê as tabelas de um JSON; sem o arquivo, usa as tabelas padrão."""
+        if not os.path.exists(caminho):
+            return tabelas_padrao()
+        with open(caminho, encoding="utf-8") as arquivo:
+            return cls.de_dicionario(json.load(arquivo))
+
+
+def tabelas_padrao() -> TabelasTAF:
+    """Tabelas gerais (qualquer cargo) com 6 faixas etárias: até 24, 25-29, ..., 45 ou mais.
+
+    Abdominal e flexão em repetições; corrida em segundos. O primeiro índice vale a nota mínima.
+    """
+    faixas = [25, 30, 35, 40, 45]
+    pontos = [50, 60, 70, 80, 90, 100]
+    base = {
+        # prova: (maior_melhor, {sexo: limites da primeira faixa}, ajuste por faixa)
+        "abdominal": (True, {"masculino": [30, 34, 38, 42, 46, 50], "feminino": [24, 28, 32, 36, 40, 44]}, -3),
+        "flexao": (True, {"masculino": [20, 24, 28, 32, 36, 40], "feminino": [10, 14, 18, 22, 26, 30]}, -2),
+        "corrida": (False, {"masculino": [720, 690, 660, 630, 600, 570], "feminino": [840, 810, 780, 750, 720, 690]}, 30),
+    }
+    provas = {}
+    for prova, (maior_melhor, limites_por_sexo, ajuste) in base.items():
+        grupos = {}
+        for sexo, limites in limites_por_sexo.items():
+            for faixa in range(len(faixas) + 1):
+                grupos[(QUALQUER_CARGO, sexo, faixa)] = ([limite + ajuste * faixa for limite in limites], pontos)
+        provas[prova] = TabelaProva(maior_melhor, grupos)
+    return TabelasTAF(faixas, provas, nota_minima=pontos[0])
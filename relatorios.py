@@ -0,0 +1,135 @@
+import os
+import re
+import threading
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, Executor, wait
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Sequence
+
+from busca import normalizar
+from modelos import CAMPOS_PESSOA, TITULOS_COM_UNIDADE, Pessoa
+from tarefas import Progresso
+
+if TYPE_CHECKING:
+    from pontuacao import Pontuacao
+
+# Os mesmos campos da tabela de dados, com os pontos de cada prova
+CAMPOS_RELATORIO = [(TITULOS_COM_UNIDADE[campo], campo) for campo in CAMPOS_PESSOA] + [
+    ("Pontos Abdominal", "pontos_abdominal"), ("Pontos Flexão", "pontos_flexao"),
+    ("Pontos Corrida", "pontos_corrida"), ("Pontuação", "total"), ("Situação", "situacao"),
+]
+TAMANHO_LOTE_RELATORIOS = 25  # Candidatos por tarefa enviada ao pool
+ARQUIVO_RESUMO = "resumo_cohort.xlsx"
+
+
+class ResultadoRelatorios(NamedTuple):
+    gerados: int
+    total: int
+    cancelado: bool
+    pasta: str
+
+
+def linhas_relatorio(pessoas: Sequence[Pessoa], pontuacao: "Pontuacao") -> List[tuple]:
+    """(id, valores na ordem de CAMPOS_RELATORIO) de cada pessoa; tuplas simples, baratas de enviar aos processos."""
+    return [
+        (p.id, (p.nome, p.idade, p.sexo, p.cargo, p.abdominal, p.flexao, p.corrida, *notas))
+        for p, notas in zip(pessoas, pontuacao.linhas())
+    ]
+
+
+def nome_arquivo(id_pessoa: str, nome: str) -> str:
+    base = re.sub(r"[^a-z0-9]+", "_", normalizar(nome)).strip("_")[:40] or "candidato"
+    return f"{base}_{id_pessoa[:8]}.xlsx"
+
+
+def _gravar(wb, caminho: str):
+    # Grava num temporário e renomeia: um cancelamento nunca deixa arquivo pela metade
+    temporario = caminho + ".tmp"
+    wb.save(temporario)
+    os.replace(temporario, caminho)
+
+
+def _gerar_lote(lote: List[tuple], pasta: str) -> int:
+    """Roda num processo do pool: uma planilha por candidato, gravada direto no disco."""
+    from openpyxl import Workbook
+    from openpyxl.styles import Font
+
+    negrito = Font(bold=True)
+    for id_pessoa, valores in lote:
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "Resultado"
+        ws.append(["Resultado Individual - TAF"])
+        ws["A1"].font = negrito
+        ws.append([])
+        for (titulo, _), valor in zip(CAMPOS_RELATORIO, valores):
+            ws.append([titulo, "" if valor is None else valor])
+            ws.cell(ws.max_row, 1).font = negrito
+        ws.column_dimensions["A"].width = 20
+        ws.column_dimensions["B"].width = max(len(str(valores[0])), 12) + 2
+        _gravar(wb, os.path.join(pasta, nome_arquivo(id_pessoa, valores[0])))
+    return len(lote)
+
+
+def gravar_resumo(linhas: List[tuple], caminho: str):
+    """Resumo do cohort: situação, pontuação média e médias das provas, por cargo e no total."""
+    from openpyxl import Workbook
+
+    indice = {campo: i for i, (_, campo) in enumerate(CAMPOS_RELATORIO)}
+    grupos: Dict[str, List[tuple]] = defaultdict(list)
+    for _, valores in linhas:
+        grupos[valores[indice["cargo"]]].append(valores)
+        grupos["Todos"].append(valores)
+
+    def media(valores: List[tuple], campo: str) -> Optional[float]:
+        numeros = [v[indice[campo]] for v in valores if v[indice[campo]] is not None]
+        return round(sum(numeros) / len(numeros), 1) if numeros else None
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Resumo"
+    ws.append(["Cargo", "Candidatos", "Aprovados", "Reprovados", "Pendentes", "Pontuação Média",
+               "Abdominal Médio", "Flexão Média", "Corrida Média (s)"])
+    for cargo in sorted(grupos, key=lambda c: (c == "Todos", c)):
+        valores = grupos[cargo]
+        situacoes = [v[indice["situacao"]] for v in valores]
+        ws.append([cargo, len(valores), situacoes.count("Aprovado"), situacoes.count("Reprovado"),
+                   situacoes.count("Pendente"), media(valores, "total"), media(valores, "abdominal"),
+                   media(valores, "flexao"), media(valores, "corrida")])
+    _gravar(wb, caminho)
+
+
+def gerar_relatorios(linhas: List[tuple], pasta: str, pool: Executor, progresso: Optional[Progresso] = None,
+                     cancelamento: Optional[threading.Event] = None) -> ResultadoRelatorios:
+    """Gera uma planilha por candidato em `pasta`, em lotes distribuídos pelo pool, e o resumo.
+
+    Com um pool de processos, cada núcleo grava seus lotes em paralelo. Ao cancelar, os
+    lotes ainda não iniciados são descartados e os que estão rodando terminam (são pequenos);
+    o resumo só é gravado quando todos os candidatos foram gerados.
+    """
+    os.makedirs(pasta, exist_ok=True)
+    total = len(linhas)
+    pendentes = {
+        pool.submit(_gerar_lote, linhas[inicio:inicio + TAMANHO_LOTE_RELATORIOS], pasta)
+        for inicio in range(0, total, TAMANHO_LOTE_RELATORIOS)
+    }
+    gerados = 0
+    cancelado = False
+    try:
+        while pendentes:
+            prontos, pendentes = wait(pendentes, timeout=0.2, return_when=FIRST_COMPLETED)
+            for futuro in prontos:
+                if not futuro.cancelled():
+                    gerados += futuro.result()
+            if prontos and progresso:
+                progresso(gerados, total)
+            if not cancelado and cancelamento is not None and cancelamento.is_set():
+                cancelado = True
+                for futuro in pendentes:
+                    futuro.cancel()
+    finally:
+        for futuro in pendentes:
+            futuro.cancel()
+
+    if not cancelado:
+        gravar_resumo(linhas, os.path.join(pasta, ARQUIVO_RESUMO))
+    return ResultadoRelatorios(gerados, total, cancelado, pasta)
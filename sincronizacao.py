@@ -0,0 +1,333 @@
+import argparse
+import glob
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from armazenamento import ArmazenamentoPessoas
+from modelos import CAMPOS_CADASTRO, CAMPOS_PESSOA, Pessoa
+
+CAMPO_REMOCAO = "removida"  # Marca de exclusão guardada junto com os campos
+ARQUIVO_DISPOSITIVO = "dispositivo_taf.txt"
+PADRAO_DIARIO = "diario_{}.jsonl"
+TAMANHO_LOTE_MESCLAGEM = 5000  # Eventos aplicados por transação
+
+log = logging.getLogger(__name__)
+
+# Estado da mesclagem, no mesmo banco dos candidatos: o último valor de cada campo com a
+# chave (instante, dispositivo, sequência) do evento que o escreveu, e até onde cada diário
+# já foi lido.
+ESQUEMA_SINCRONIZACAO = """
+CREATE TABLE IF NOT EXISTS sinc_campos (
+    id TEXT NOT NULL,
+    campo TEXT NOT NULL,
+    valor,
+    instante INTEGER NOT NULL,
+    dispositivo TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    PRIMARY KEY (id, campo)
+);
+CREATE TABLE IF NOT EXISTS sinc_diarios (
+    dispositivo TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    posicao INTEGER NOT NULL
+);
+"""
+# Último escritor vence, campo a campo; empates de relógio são decididos pelo dispositivo
+# e pela sequência, então a ordem em que os diários são mesclados não muda o resultado.
+GRAVAR_CAMPO = """
+INSERT INTO sinc_campos (id, campo, valor, instante, dispositivo, seq) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT(id, campo) DO UPDATE SET
+    valor = excluded.valor,
+    instante = excluded.instante,
+    dispositivo = excluded.dispositivo,
+    seq = excluded.seq
+WHERE (excluded.instante, excluded.dispositivo, excluded.seq)
+    > (sinc_campos.instante, sinc_campos.dispositivo, sinc_campos.seq)
+"""
+
+
+def identificador_dispositivo(pasta: str = ".") -> str:
+    """Identificador deste aparelho, criado na primeira vez e guardado num arquivo."""
+    caminho = os.path.join(pasta, ARQUIVO_DISPOSITIVO)
+    if os.path.exists(caminho):
+        with open(caminho, encoding="utf-8") as arquivo:
+            return arquivo.read().strip()
+    dispositivo = uuid.uuid4().hex[:12]
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        arquivo.write(dispositivo)
+    return dispositivo
+
+
+class Diario:
+    """Diário só de acréscimo (JSONL) das alterações feitas neste aparelho.
+
+    Cada linha é um evento {"d": dispositivo, "s": sequência, "t": instante em ms,
+    "id": pessoa, "op": "alterar" | "remover", "campos": {...}}. Só os campos que mudaram
+    entram no evento, para que a mesclagem não sobrescreva resultados lançados em outro
+    aparelho com valores antigos. O arquivo é aberto só no primeiro evento.
+    """
+
+    def __init__(self, pasta: str = ".", dispositivo: Optional[str] = None):
+        self.pasta = pasta
+        self._dispositivo = dispositivo
+        self._arquivo = None
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    @property
+    def dispositivo(self) -> str:
+        if self._dispositivo is None:
+            self._dispositivo = identificador_dispositivo(self.pasta)
+        return self._dispositivo
+
+    @property
+    def caminho(self) -> str:
+        return os.path.join(self.pasta, PADRAO_DIARIO.format(self.dispositivo))
+
+    def _abrir(self):
+        if self._arquivo is None:
+            ultimo = None
+            if os.path.exists(self.caminho):
+                descartar_linha_cortada(self.caminho)
+                ultimo = ultimo_evento(self.caminho)
+            self._seq = ultimo["s"] if ultimo else 0
+            self._arquivo = open(self.caminho, "a", encoding="utf-8")
+        return self._arquivo
+
+    def _evento(self, op: str, id_pessoa: str, campos: dict) -> str:
+        self._seq += 1
+        evento = {"d": self.dispositivo, "s": self._seq, "t": time.time_ns() // 1_000_000,
+                  "id": id_pessoa, "op": op, "campos": campos}
+        return json.dumps(evento, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+    def registrar(self, op: str, id_pessoa: str, campos: Optional[dict] = None):
+        with self._lock:
+            arquivo = self._abrir()
+            arquivo.write(self._evento(op, id_pessoa, campos or {}))
+            arquivo.flush()
+
+    def registrar_lote(self, pessoas: Iterable[Pessoa]):
+        """Um evento de criação por pessoa, numa única escrita (usado na importação)."""
+        self.registrar_alteracoes((p.id, campos_pessoa(p)) for p in pessoas)
+
+    def registrar_alteracoes(self, alteracoes: Iterable[Tuple[str, dict]]):
+        """Vários eventos "alterar" (id, campos alterados) numa única escrita."""
+        with self._lock:
+            arquivo = self._abrir()
+            arquivo.write("".join(self._evento("alterar", id_pessoa, campos) for id_pessoa, campos in alteracoes))
+            arquivo.flush()
+
+    def fechar(self):
+        with self._lock:
+            if self._arquivo is not None:
+                self._arquivo.close()
+                self._arquivo = None
+
+
+def campos_pessoa(pessoa: Pessoa) -> dict:
+    """Campos preenchidos da pessoa, como entram no evento de criação."""
+    campos = {campo: getattr(pessoa, campo) for campo in CAMPOS_PESSOA}
+    return {campo: valor for campo, valor in campos.items() if valor is not None or campo in CAMPOS_CADASTRO}
+
+
+def descartar_linha_cortada(caminho: str):
+    """Apaga a última linha se ela ficou sem quebra (app fechado no meio da escrita).
+
+    Sem isso o próximo evento seria colado nela e as duas linhas se perderiam.
+    """
+    with open(caminho, "r+b") as arquivo:
+        fim = arquivo.seek(0, os.SEEK_END)
+        if fim == 0:
+            return
+        arquivo.seek(fim - 1)
+        if arquivo.read(1) == b"\n":
+            return
+        bloco = 4096
+        while True:
+            inicio = max(fim - bloco, 0)
+            arquivo.seek(inicio)
+            quebra = arquivo.read(fim - inicio).rfind(b"\n")
+            if quebra >= 0 or inicio == 0:
+                arquivo.truncate(inicio + quebra + 1)
+                return
+            bloco *= 2
+
+
+def ultimo_evento(caminho: str) -> Optional[dict]:
+    """Lê só o fim do arquivo para achar o último evento completo."""
+    with open(caminho, "rb") as arquivo:
+        arquivo.seek(0, os.SEEK_END)
+        fim = arquivo.tell()
+        bloco = 4096
+        while True:
+            inicio = max(fim - bloco, 0)
+            arquivo.seek(inicio)
+            linhas = arquivo.read(fim - inicio).split(b"\n")
+            completas = [linha for linha in linhas[1 if inicio else 0:] if linha.strip()]
+            for linha in reversed(completas):
+                try:
+                    return json.loads(linha)
+                except ValueError:  # Última linha cortada (app fechado no meio da escrita)
+                    continue
+            if inicio == 0:
+                return None
+            bloco *= 2
+
+
+def _ler_eventos(caminho: str, posicao: int) -> Iterator[Tuple[dict, int]]:
+    """Eventos a partir de `posicao`, com a posição logo depois de cada um.
+
+    Uma linha sem quebra no fim ainda está sendo escrita e fica para a próxima mesclagem.
+    Uma linha completa que não decodifica (diário danificado) é pulada e registrada no log.
+    """
+    with open(caminho, "rb") as arquivo:
+        arquivo.seek(posicao)
+        for linha in arquivo:
+            if not linha.endswith(b"\n"):
+                return
+            inicio, posicao = posicao, posicao + len(linha)
+            if not linha.strip():
+                continue
+            try:
+                evento = json.loads(linha)
+            except ValueError:
+                log.warning("%s: linha ilegível no byte %d ignorada", caminho, inicio)
+                continue
+            yield evento, posicao
+
+
+class ResultadoMesclagem(NamedTuple):
+    aplicados: int  # Eventos novos lidos dos diários
+    ignorados: int  # Eventos já mesclados antes
+    alterados: int  # Candidatos gravados ou excluídos no banco
+
+
+def _preparar(armazenamento: ArmazenamentoPessoas):
+    armazenamento.conexao.executescript(ESQUEMA_SINCRONIZACAO)
+
+
+def _dispositivo_do_arquivo(caminho: str) -> Optional[str]:
+    for evento, _ in _ler_eventos(caminho, 0):
+        return evento["d"]
+    return None
+
+
+def _materializar(conexao, ids: Dict[str, None]) -> int:
+    """Refaz no banco as linhas das pessoas tocadas, na ordem dos eventos, a partir dos campos vencedores."""
+    alterados = 0
+    lista = list(ids)
+    for inicio in range(0, len(lista), 500):
+        parte = lista[inicio:inicio + 500]
+        campos: Dict[str, dict] = {id_pessoa: {} for id_pessoa in parte}
+        marcadores = ", ".join("?" * len(parte))
+        for id_pessoa, campo, valor in conexao.execute(
+            f"SELECT id, campo, valor FROM sinc_campos WHERE id IN ({marcadores})", parte
+        ):
+            campos[id_pessoa][campo] = valor
+        existentes = {linha[0] for linha in conexao.execute(
+            f"SELECT id FROM pessoas WHERE id IN ({marcadores})", parte
+        )}
+
+        for id_pessoa, valores in campos.items():
+            if valores.pop(CAMPO_REMOCAO, None):
+                # A exclusão vence qualquer alteração, de qualquer aparelho
+                if id_pessoa in existentes:
+                    conexao.execute("DELETE FROM pessoas WHERE id = ?", (id_pessoa,))
+                    alterados += 1
+                continue
+            colunas = [campo for campo in CAMPOS_PESSOA if campo in valores]
+            if id_pessoa in existentes:
+                if colunas:
+                    conexao.execute(
+                        f"UPDATE pessoas SET {', '.join(f'{c} = ?' for c in colunas)} WHERE id = ?",
+                        [valores[c] for c in colunas] + [id_pessoa],
+                    )
+                    alterados += 1
+            elif all(campo in valores for campo in CAMPOS_CADASTRO):
+                conexao.execute(
+                    f"INSERT INTO pessoas (id, {', '.join(colunas)}) VALUES (?{', ?' * len(colunas)})",
+                    [id_pessoa] + [valores[c] for c in colunas],
+                )
+                alterados += 1
+            # Sem os dados de cadastro a pessoa espera o diário que a criou
+    return alterados
+
+
+def mesclar(armazenamento: ArmazenamentoPessoas, caminhos: Iterable[str]) -> ResultadoMesclagem:
+    """Aplica ao banco os eventos novos dos diários informados.
+
+    De cada diário só é lido o trecho depois da última mesclagem, e só as pessoas tocadas
+    por esses eventos são regravadas. O resultado não depende da ordem dos diários nem de
+    quantas vezes cada um é mesclado. Inclua também o diário deste aparelho.
+    """
+    _preparar(armazenamento)
+    conexao = armazenamento.conexao
+    aplicados = ignorados = alterados = 0
+    for caminho in caminhos:
+        dispositivo = _dispositivo_do_arquivo(caminho)
+        if dispositivo is None:
+            continue
+        linha = conexao.execute(
+            "SELECT seq, posicao FROM sinc_diarios WHERE dispositivo = ?", (dispositivo,)
+        ).fetchone()
+        seq, posicao = linha if linha else (0, 0)
+        if posicao > os.path.getsize(caminho):  # Arquivo trocado por um mais curto: relê tudo
+            posicao = 0
+
+        gravacoes: List[tuple] = []
+        tocados: Dict[str, None] = {}  # Na ordem dos eventos: novos cadastros entram na ordem do diário
+
+        def aplicar():
+            nonlocal alterados
+            with conexao:
+                conexao.executemany(GRAVAR_CAMPO, gravacoes)
+                alterados += _materializar(conexao, tocados)
+                conexao.execute(
+                    "INSERT INTO sinc_diarios (dispositivo, seq, posicao) VALUES (?, ?, ?) "
+                    "ON CONFLICT(dispositivo) DO UPDATE SET seq = excluded.seq, posicao = excluded.posicao",
+                    (dispositivo, seq, posicao),
+                )
+            gravacoes.clear()
+            tocados.clear()
+
+        for evento, proxima in _ler_eventos(caminho, posicao):
+            posicao = proxima
+            if evento["s"] <= seq:
+                ignorados += 1
+                continue
+            seq = evento["s"]
+            chave = (evento["t"], dispositivo, evento["s"])
+            if evento["op"] == "remover":
+                gravacoes.append((evento["id"], CAMPO_REMOCAO, 1, *chave))
+            else:
+                gravacoes.extend((evento["id"], campo, valor, *chave) for campo, valor in evento["campos"].items())
+            tocados[evento["id"]] = None
+            aplicados += 1
+            if len(gravacoes) >= TAMANHO_LOTE_MESCLAGEM:
+                aplicar()
+        aplicar()
+    return ResultadoMesclagem(aplicados, ignorados, alterados)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Mescla os diários de vários aparelhos no banco de candidatos (só os eventos novos)"
+    )
+    parser.add_argument("diarios", nargs="*", help="arquivos diario_*.jsonl (padrão: todos os da pasta atual)")
+    parser.add_argument("--banco", default="dados_taf.db", help="banco SQLite de destino (padrão: dados_taf.db)")
+    args = parser.parse_args()
+
+    caminhos = args.diarios or sorted(glob.glob(PADRAO_DIARIO.format("*")))
+    armazenamento = ArmazenamentoPessoas(args.banco)
+    inicio = time.perf_counter()
+    resultado = mesclar(armazenamento, caminhos)
+    armazenamento.fechar()
+    print(
+        f"{len(caminhos)} diários: {resultado.aplicados} eventos novos, {resultado.ignorados} já mesclados, "
+        f"{resultado.alterados} candidatos atualizados em {time.perf_counter() - inicio:.2f}s"
+    )
@@ -0,0 +1,93 @@
+import asyncio
+import multiprocessing
+import queue
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+Progresso = Callable[[int, int], None]
+
+
+class _ProgressoRemoto:
+    """Repassa o progresso de um processo filho por uma fila do multiprocessing."""
+
+    def __init__(self, fila):
+        self.fila = fila
+
+    def __call__(self, feitas: int, total: int):
+        self.fila.put((feitas, total))
+
+
+class ExecutorTarefas:
+    """Tira trabalho lento do loop de eventos do Flet.
+
+    E/S bloqueante (banco, arquivos) vai para um pool de threads; trabalho pesado de CPU
+    vai para um pool de processos, criado só no primeiro uso. Onde não há processos
+    (Android, navegador), o trabalho de CPU também roda nas threads.
+    """
+
+    def __init__(self, max_threads: int = 4, max_processos: Optional[int] = None):
+        self._threads = ThreadPoolExecutor(max_workers=max_threads, thread_name_prefix="taf")
+        self._max_processos = max_processos
+        self._processos: Optional[Executor] = None
+        self._gerenciador = None
+        self._sem_processos = False
+
+    def _pool_processos(self) -> Optional[Executor]:
+        if self._processos is None and not self._sem_processos:
+            try:
+                # "spawn": um fork herdaria as threads do Flet e a conexão SQLite aberta
+                contexto = multiprocessing.get_context("spawn")
+                self._processos = ProcessPoolExecutor(max_workers=self._max_processos, mp_context=contexto)
+                self._gerenciador = contexto.Manager()
+            except (ImportError, NotImplementedError, OSError, ValueError):
+                self._sem_processos = True
+                if self._processos is not None:
+                    self._processos.shutdown(wait=False, cancel_futures=True)
+                    self._processos = None
+        return self._processos
+
+    @property
+    def pool_cpu(self) -> Executor:
+        """Pool para trabalho de CPU distribuído por quem chama: processos ou, sem eles, as threads."""
+        return self._pool_processos() or self._threads
+
+    async def em_thread(self, funcao: Callable[..., Any], *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._threads, partial(funcao, *args, **kwargs))
+
+    async def em_processo(self, funcao: Callable[..., Any], *args, progresso: Optional[Progresso] = None,
+                          **kwargs) -> Any:
+        """Roda `funcao` (que deve aceitar o argumento `progresso`, se informado) em outro processo.
+
+        O progresso enviado pelo processo filho é entregue a `progresso` neste processo.
+        """
+        pool = self._pool_processos()
+        if pool is None:
+            if progresso is not None:
+                kwargs["progresso"] = progresso
+            return await self.em_thread(funcao, *args, **kwargs)
+
+        loop = asyncio.get_running_loop()
+        if progresso is None:
+            return await loop.run_in_executor(pool, partial(funcao, *args, **kwargs))
+
+        fila = self._gerenciador.Queue()
+        futuro = loop.run_in_executor(pool, partial(funcao, *args, progresso=_ProgressoRemoto(fila), **kwargs))
+        while not futuro.done():
+            try:
+                feitas, total = await loop.run_in_executor(self._threads, partial(fila.get, timeout=0.2))
+            except queue.Empty:
+                continue
+            progresso(feitas, total)
+        resultado = await futuro
+        while not fila.empty():  # Avisos que chegaram depois do último get
+            progresso(*fila.get_nowait())
+        return resultado
+
+    def encerrar(self):
+        self._threads.shutdown(wait=False, cancel_futures=True)
+        if self._processos is not None:
+            self._processos.shutdown(wait=False, cancel_futures=True)
+        if self._gerenciador is not None:
+            self._gerenciador.shutdown()
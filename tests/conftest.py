@@ -0,0 +1,64 @@
+import json
+import os
+import random
+import sys
+
+import pytest
+
+# Os módulos do app ficam na raiz do repositório, sem pacote
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from armazenamento import ArmazenamentoPessoas  # noqa: E402
+from cadastro import CadastroPessoas  # noqa: E402
+from modelos import Pessoa  # noqa: E402
+from sincronizacao import Diario  # noqa: E402
+
+
+@pytest.fixture
+def cadastro(tmp_path):
+    """Cadastro num banco temporário, com diário."""
+    armazenamento = ArmazenamentoPessoas(str(tmp_path / "dados_taf.db"))
+    diario = Diario(str(tmp_path), "aparelho")
+    cadastro = CadastroPessoas(armazenamento, diario)
+    yield cadastro
+    diario.fechar()
+    armazenamento.fechar()
+
+
+@pytest.fixture
+def eventos():
+    """Lê os eventos já gravados no diário do cadastro."""
+
+    def ler(diario: Diario) -> list:
+        diario.fechar()
+        with open(diario.caminho, encoding="utf-8") as arquivo:
+            return [json.loads(linha) for linha in arquivo]
+
+    return ler
+
+
+@pytest.fixture
+def cohort():
+    """Gera candidatos sintéticos com ids previsíveis; parte dos resultados fica sem lançar."""
+
+    def gerar(quantidade: int, semente: int = 1) -> list:
+        aleatorio = random.Random(semente)
+
+        def resultado(minimo: int, maximo: int):
+            return None if aleatorio.random() < 0.2 else aleatorio.randint(minimo, maximo)
+
+        return [
+            Pessoa(
+                aleatorio.choice(["Ana", "Ângela", "bruno", "Carla", "Davi"]) + f" {i}",
+                aleatorio.randint(18, 55),
+                aleatorio.choice(["masculino", "feminino"]),
+                aleatorio.choice(["Soldado", "Cabo", "soldado"]),
+                resultado(10, 60),
+                resultado(0, 45),
+                resultado(540, 900),
+                id=f"p{i}",
+            )
+            for i in range(quantidade)
+        ]
+
+    return gerar
@@ -0,0 +1,40 @@
+import pytest
+
+from busca import IndiceBusca, normalizar
+from modelos import Pessoa
+
+
+@pytest.mark.parametrize("texto, esperado", [(" João ", "joao"), ("ÂNGELA", "angela"), ("Cabo", "cabo"), ("", "")])
+def test_normalizar(texto, esperado):
+    assert normalizar(texto) == esperado
+
+
+def busca_linear(pessoas, termo):
+    termo = normalizar(termo)
+    return [p for p in pessoas if termo in normalizar(p.nome) or termo in normalizar(p.cargo)]
+
+
+@pytest.mark.parametrize("termo", ["", "an", "ANG", "ângela 1", "sold", "cabo", "xyz", "a 1"])
+def test_busca_igual_a_percorrer_todos(cohort, termo):
+    pessoas = cohort(500)
+    indice = IndiceBusca()
+    for pessoa in pessoas:
+        indice.adicionar(pessoa)
+    assert indice.buscar(termo) == busca_linear(pessoas, termo)
+
+
+def test_edicao_e_exclusao_reindexam_mantendo_a_ordem():
+    pessoas = [Pessoa(nome, 30, "masculino", "Soldado", id=nome) for nome in ("Ana", "Bruno", "Carla")]
+    indice = IndiceBusca()
+    for pessoa in pessoas:
+        indice.adicionar(pessoa)
+
+    pessoas[0].nome = "Zuleica"
+    indice.atualizar(pessoas[0])
+    assert indice.buscar("ana") == []
+    assert indice.buscar("zul") == [pessoas[0]]
+    assert indice.buscar("soldado") == pessoas  # A edição não muda a posição na lista
+
+    indice.remover(pessoas[1])
+    assert indice.buscar("") == [pessoas[0], pessoas[2]]
+    assert len(indice) == 2
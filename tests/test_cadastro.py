@@ -0,0 +1,55 @@
+import sqlite3
+
+import pytest
+
+from modelos import Pessoa
+
+
+def falhar(*args):
+    raise sqlite3.OperationalError("disk I/O error")
+
+
+def test_exclusao_que_falha_mantem_a_pessoa(cadastro, eventos, monkeypatch):
+    pessoa = Pessoa("Ana", 30, "feminino", "Soldado", id="p1")
+    cadastro.adicionar(pessoa)
+    versao = cadastro.versao
+
+    monkeypatch.setattr(cadastro.armazenamento, "excluir", falhar)
+    with pytest.raises(sqlite3.Error):
+        cadastro.remover("p1")
+    assert cadastro.obter("p1") is pessoa
+    assert cadastro.duplicatas("Ana", 30) == [pessoa]
+    assert cadastro.versao == versao
+    assert [e["op"] for e in eventos(cadastro.diario)] == ["alterar"]
+
+    monkeypatch.undo()
+    assert cadastro.remover("p1") is pessoa
+    assert "p1" not in cadastro
+    assert list(cadastro.armazenamento.carregar()) == []
+    assert [e["op"] for e in eventos(cadastro.diario)] == ["alterar", "remover"]
+
+
+def test_atualizacao_que_falha_nao_altera_memoria_indices_nem_versao(cadastro, monkeypatch):
+    pessoa = Pessoa("Ana", 30, "feminino", "Soldado", id="p1")
+    cadastro.adicionar(pessoa)
+    versao = cadastro.versao
+
+    monkeypatch.setattr(cadastro.armazenamento, "salvar_lote", falhar)
+    with pytest.raises(sqlite3.Error):
+        cadastro.atualizar(pessoa, nome="Beatriz", abdominal=40)
+    assert (pessoa.nome, pessoa.abdominal) == ("Ana", None)
+    assert cadastro.duplicatas("Ana", 30) == [pessoa]
+    assert cadastro.duplicatas("Beatriz", 30) == []
+    assert cadastro.versao == versao
+
+
+def test_atualizacao_repetida_depois_da_falha_entra_no_diario(cadastro, eventos, monkeypatch):
+    pessoa = Pessoa("Ana", 30, "feminino", "Soldado", id="p1")
+    cadastro.adicionar(pessoa)
+
+    monkeypatch.setattr(cadastro.armazenamento, "salvar_lote", falhar)
+    with pytest.raises(sqlite3.Error):
+        cadastro.atualizar(pessoa, abdominal=40)
+    monkeypatch.undo()
+    cadastro.atualizar(pessoa, abdominal=40)
+    assert eventos(cadastro.diario)[-1]["campos"] == {"abdominal": 40}
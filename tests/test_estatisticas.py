@@ -0,0 +1,60 @@
+from estatisticas import Distribuicao, EstatisticasCohort
+from modelos import Pessoa
+from pontuacao import tabelas_padrao
+
+
+def test_cargos_com_grafias_diferentes_formam_um_grupo():
+    estatisticas = EstatisticasCohort(tabelas_padrao())
+    for i, cargo in enumerate(["Soldado", "soldado", " SOLDADO", "Cabo"]):
+        estatisticas.adicionar(Pessoa(f"P{i}", 30, "masculino", cargo, id=f"p{i}"))
+    linhas = estatisticas.linhas("cargo")
+    assert [(linha.grupo, linha.candidatos) for linha in linhas] == [("Cabo", 1), ("Soldado", 3), ("Todos", 4)]
+
+    for i in range(3):  # O nome exibido é o do primeiro cadastro, até o grupo esvaziar
+        estatisticas.remover(Pessoa("", 0, "masculino", "", id=f"p{i}"))
+    estatisticas.adicionar(Pessoa("P9", 30, "masculino", "soldado", id="p9"))
+    assert [linha.grupo for linha in estatisticas.linhas("cargo")] == ["Cabo", "soldado", "Todos"]
+
+
+def test_alteracoes_e_exclusoes_dao_o_mesmo_que_recontar(cohort):
+    tabelas = tabelas_padrao()
+    pessoas = cohort(600)
+    incremental = EstatisticasCohort(tabelas)
+    for pessoa in pessoas:
+        incremental.adicionar(pessoa)
+    for pessoa in pessoas[:100]:
+        pessoa.flexao = None if pessoa.flexao else 20
+        pessoa.cargo = "Cabo"
+        incremental.atualizar(pessoa)
+    for pessoa in pessoas[100:160]:
+        incremental.remover(pessoa)
+
+    recontada = EstatisticasCohort(tabelas)
+    for pessoa in pessoas[:100] + pessoas[160:]:
+        recontada.adicionar(pessoa)
+    for dimensao in ("cargo", "sexo", "faixa"):
+        assert incremental.linhas(dimensao) == recontada.linhas(dimensao)
+
+
+def test_total_confere_com_a_pontuacao(cohort):
+    tabelas = tabelas_padrao()
+    pessoas = cohort(400)
+    estatisticas = EstatisticasCohort(tabelas)
+    for pessoa in pessoas:
+        estatisticas.adicionar(pessoa)
+    situacoes = [tabelas.pontuar_pessoa(p)[-1] for p in pessoas]
+    total = estatisticas.linhas("sexo")[-1]
+    assert total.grupo == "Todos" and total.candidatos == 400
+    assert (total.aprovados, total.reprovados, total.pendentes) == (situacoes.count(1), situacoes.count(0), situacoes.count(-1))
+    assert total.provas["abdominal"][0] == sum(p.abdominal is not None for p in pessoas)
+
+
+def test_distribuicao_media_e_quantis():
+    corrida = Distribuicao(5)
+    for valor in (600, 601, 612, 640):
+        corrida.incluir(valor)
+    corrida.retirar(640)
+    assert corrida.contagem == 3
+    assert corrida.media == (600 + 601 + 612) / 3
+    assert corrida.quantil(0.5) == 602.0  # Centro da faixa 600-604
+    assert Distribuicao(1).quantil(0.5) is None
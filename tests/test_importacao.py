@@ -0,0 +1,43 @@
+import pytest
+
+from importacao import importar_pessoas
+
+
+def importar(tmp_path, conteudo: str):
+    caminho = tmp_path / "candidatos.csv"
+    caminho.write_text(conteudo, encoding="utf-8")
+    lotes = []
+    resultado = importar_pessoas(str(caminho), lotes.append)
+    return resultado, [p for lote in lotes for p in lote]
+
+
+def test_resultados_seguem_as_regras_da_grade(tmp_path):
+    resultado, pessoas = importar(
+        tmp_path,
+        "Nome,Idade,Sexo,Cargo,Abdominal,Flexão,Corrida\n"
+        "Ana,30,F,Soldado,40, ,600\n"
+        "Bruno,25,M,Cabo,35,-3,500\n"
+        "Carla,28,F,Soldado,x,10,550\n",
+    )
+    assert [(p.nome, p.abdominal, p.flexao, p.corrida) for p in pessoas] == [("Ana", 40, None, 600)]
+    assert [numero for numero, _ in resultado.rejeitadas] == [3, 4]
+    assert resultado.importadas == 1
+
+
+def test_colunas_obrigatorias_ausentes(tmp_path):
+    with pytest.raises(ValueError, match="cargo"):
+        importar(tmp_path, "Nome,Idade,Sexo\nAna,30,F\n")
+
+
+def test_xlsx_aceita_numeros_inteiros_gravados_como_float(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    wb = openpyxl.Workbook()
+    wb.active.append(["Nome", "Idade", "Sexo", "Cargo", "Abdominal", "Flexão", "Corrida"])
+    wb.active.append(["Ana", 30.0, "F", "Soldado", 40.0, -3.0, None])
+    wb.active.append(["Bruno", 25, "M", "Cabo", 35.0, 12.0, 510.0])
+    caminho = tmp_path / "candidatos.xlsx"
+    wb.save(caminho)
+    lotes = []
+    resultado = importar_pessoas(str(caminho), lotes.append)
+    assert [(p.nome, p.abdominal, p.flexao, p.corrida) for lote in lotes for p in lote] == [("Bruno", 35, 12, 510)]
+    assert [numero for numero, _ in resultado.rejeitadas] == [2]
@@ -0,0 +1,74 @@
+import sqlite3
+
+import pytest
+
+from lancamento import LancamentosPendentes, converter_resultado
+from modelos import Pessoa
+
+
+@pytest.fixture
+def pessoa(cadastro):
+    pessoa = Pessoa("Ana", 30, "feminino", "Soldado", id="p1")
+    cadastro.adicionar(pessoa)
+    return pessoa
+
+
+def test_gravacao_que_falha_e_repetida_entra_no_diario(cadastro, eventos, pessoa, monkeypatch):
+    pendentes = LancamentosPendentes()
+    pendentes.registrar("p1", "abdominal", 40)
+
+    salvar_lote = cadastro.armazenamento.salvar_lote
+    falhas = []
+
+    def falhar_uma_vez(pessoas):
+        if not falhas:
+            falhas.append(1)
+            raise sqlite3.OperationalError("database is locked")
+        salvar_lote(pessoas)
+
+    monkeypatch.setattr(cadastro.armazenamento, "salvar_lote", falhar_uma_vez)
+
+    with pytest.raises(sqlite3.Error):
+        pendentes.gravar(cadastro)
+    assert pessoa.abdominal is None
+    assert pendentes.valor("p1", "abdominal") == 40
+
+    assert pendentes.gravar(cadastro) == [pessoa]
+    assert pessoa.abdominal == 40
+    assert pendentes.retirar() == {}
+    assert eventos(cadastro.diario)[-1]["campos"] == {"abdominal": 40}
+    assert next(cadastro.armazenamento.carregar()).abdominal == 40
+
+
+def test_devolver_nao_sobrescreve_o_digitado_depois_da_falha(cadastro, pessoa, monkeypatch):
+    pendentes = LancamentosPendentes()
+    pendentes.registrar("p1", "abdominal", 40)
+    pendentes.registrar("p1", "flexao", 10)
+
+    def falhar(pessoas):
+        pendentes.registrar("p1", "abdominal", 41)  # Digitado enquanto a gravação rodava
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(cadastro.armazenamento, "salvar_lote", falhar)
+    with pytest.raises(sqlite3.Error):
+        pendentes.gravar(cadastro)
+    assert pendentes.retirar() == {"p1": {"abdominal": 41, "flexao": 10}}
+
+
+def test_gravar_ignora_pessoa_excluida(cadastro, pessoa):
+    pendentes = LancamentosPendentes()
+    pendentes.registrar("p1", "abdominal", 40)
+    pendentes.registrar("sumiu", "abdominal", 10)
+    assert pendentes.gravar(cadastro) == [pessoa]
+    assert pendentes.gravar(cadastro) == []
+
+
+@pytest.mark.parametrize("texto, esperado", [("", None), ("  ", None), (None, None), ("0", 0), (" 42 ", 42)])
+def test_converter_resultado(texto, esperado):
+    assert converter_resultado(texto) == esperado
+
+
+@pytest.mark.parametrize("texto", ["-1", "abc", "1.5"])
+def test_converter_resultado_rejeita(texto):
+    with pytest.raises(ValueError):
+        converter_resultado(texto)
@@ -0,0 +1,65 @@
+import pytest
+
+from armazenamento import ArmazenamentoPessoas
+from cadastro import CadastroPessoas
+from ordenacao import IndiceOrdenado
+
+
+def test_lote_igual_a_insercoes_uma_a_uma(cohort):
+    pessoas = cohort(500)
+    lote, uma_a_uma = IndiceOrdenado(), IndiceOrdenado()
+    lote.adicionar(pessoas[0])
+    lote.adicionar_lote(pessoas[1:])
+    for pessoa in pessoas:
+        uma_a_uma.adicionar(pessoa)
+    assert lote._colunas == uma_a_uma._colunas
+    assert lote.pagina(None, True, 0, 500) == pessoas
+
+
+def test_lote_com_pessoa_ja_indexada_atualiza(cohort):
+    pessoas = cohort(10)
+    indice = IndiceOrdenado()
+    indice.adicionar_lote(pessoas)
+    pessoas[3].idade = 99
+    indice.adicionar_lote([pessoas[3]])
+    assert len(indice) == 10
+    assert indice.pagina("idade", False, 0, 1) == [pessoas[3]]
+
+
+@pytest.mark.parametrize("coluna", ["nome", "idade", "cargo", "abdominal", "corrida"])
+def test_pagina_ordenada_com_resultados_vazios_no_fim(coluna, cohort):
+    indice = IndiceOrdenado()
+    indice.adicionar_lote(cohort(200))
+    crescente = indice.pagina(coluna, True, 0, 200)
+    chaves = [indice.chaves[coluna](p) for p in crescente]
+    assert chaves == sorted(chaves)
+    assert indice.pagina(coluna, False, 0, 200) == crescente[::-1]
+    if coluna in ("abdominal", "corrida"):
+        lancados = sum(getattr(p, coluna) is not None for p in crescente)
+        assert all(getattr(p, coluna) is None for p in crescente[lancados:])
+
+
+def test_remover_e_atualizar_reposicionam(cohort):
+    pessoas = cohort(50)
+    indice = IndiceOrdenado()
+    indice.adicionar_lote(pessoas)
+    indice.remover(pessoas[0])
+    pessoas[1].abdominal = -1
+    indice.atualizar(pessoas[1])
+    assert pessoas[0] not in indice.pagina("nome", True, 0, 50)
+    assert indice.pagina("abdominal", True, 0, 1) == [pessoas[1]]
+
+
+def test_cadastro_carrega_os_indices_em_lote(tmp_path, cohort):
+    armazenamento = ArmazenamentoPessoas(str(tmp_path / "dados_taf.db"))
+    armazenamento.salvar_lote(cohort(100))
+    cadastro = CadastroPessoas(armazenamento)
+    indice = IndiceOrdenado()
+    lotes = []
+    adicionar_lote = indice.adicionar_lote
+    indice.adicionar_lote = lambda pessoas: (lotes.append(len(pessoas)), adicionar_lote(pessoas))
+    cadastro.ouvir(indice)
+    cadastro.carregar()
+    armazenamento.fechar()
+    assert lotes == [0, 100]
+    assert len(indice) == 100
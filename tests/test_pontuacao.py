@@ -0,0 +1,75 @@
+import math
+
+import pytest
+
+from modelos import Pessoa
+from pontuacao import APROVADO, PENDENTE, REPROVADO, TabelasTAF, tabelas_padrao
+
+
+@pytest.fixture(scope="module")
+def tabelas():
+    return tabelas_padrao()
+
+
+def pessoa(abdominal=50, flexao=40, corrida=570, idade=20, sexo="masculino", cargo="Soldado"):
+    return Pessoa("Ana", idade, sexo, cargo, abdominal, flexao, corrida)
+
+
+def pontos(tabelas, **campos):
+    return tabelas.pontuar_pessoa(pessoa(**campos))
+
+
+@pytest.mark.parametrize("abdominal, esperado", [(29, 0.0), (30, 50.0), (33, 50.0), (34, 60.0), (50, 100.0), (80, 100.0)])
+def test_limites_das_faixas_de_desempenho(tabelas, abdominal, esperado):
+    assert pontos(tabelas, abdominal=abdominal)[0] == esperado
+
+
+@pytest.mark.parametrize("corrida, esperado", [(721, 0.0), (720, 50.0), (691, 50.0), (690, 60.0), (570, 100.0), (400, 100.0)])
+def test_corrida_menor_tempo_e_melhor(tabelas, corrida, esperado):
+    assert pontos(tabelas, corrida=corrida)[2] == esperado
+
+
+def test_faixa_etaria_muda_a_tabela(tabelas):
+    assert tabelas.faixa_etaria(24) == 0 and tabelas.faixa_etaria(25) == 1
+    assert pontos(tabelas, abdominal=27, idade=24)[0] == 0.0
+    assert pontos(tabelas, abdominal=27, idade=25)[0] == 50.0  # Até 29 anos o índice é 3 repetições menor
+
+
+def test_situacao(tabelas):
+    assert pontos(tabelas)[-2:] == (300.0, APROVADO)
+    assert pontos(tabelas, flexao=None)[-2:] == (None, PENDENTE)
+    assert pontos(tabelas, flexao=None, abdominal=0)[-2:] == (None, REPROVADO)  # Reprovado mesmo sem todas as provas
+
+
+def test_sexo_desconhecido_fica_sem_nota(tabelas):
+    assert pontos(tabelas, sexo="outro") == (None, None, None, None, PENDENTE)
+
+
+def test_tabela_do_cargo_e_geral():
+    tabela = {"sexo": "masculino", "faixa": 0, "limites": [10], "pontos": [50]}
+    tabelas = TabelasTAF.de_dicionario({
+        "faixas_etarias": [],
+        "provas": {
+            "abdominal": {"tabelas": [tabela, dict(tabela, cargo="Soldado", limites=[20])]},
+            "flexao": {"tabelas": [tabela]},
+            "corrida": {"maior_melhor": False, "tabelas": [dict(tabela, limites=[600])]},
+        },
+    })
+    assert tabelas.pontuar_pessoa(pessoa(abdominal=15, cargo="Cabo"))[0] == 50.0
+    assert tabelas.pontuar_pessoa(pessoa(abdominal=15, cargo=" SOLDADO"))[0] == 0.0
+    assert tabelas.pontuar_pessoa(pessoa(abdominal=15, sexo="feminino"))[0] is None  # Sem tabela para o grupo
+
+
+def test_pontuar_e_pontuar_pessoa_concordam(tabelas, cohort):
+    pessoas = cohort(3000) + [
+        pessoa(sexo="outro"),
+        pessoa(idade=80, abdominal=0, flexao=None),
+        pessoa(corrida=720, abdominal=30, flexao=20),
+        pessoa(abdominal=None, flexao=None, corrida=None),
+    ]
+    pontuacao = tabelas.pontuar(pessoas)
+    for i, (linha, individual) in enumerate(zip(pontuacao.linhas(), map(tabelas.pontuar_pessoa, pessoas))):
+        *notas, total, situacao = individual
+        assert int(pontuacao.situacao[i]) == situacao
+        assert linha[:-1] == (*notas, total)
+        assert math.isnan(pontuacao.total[i]) == (total is None)
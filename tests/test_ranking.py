@@ -0,0 +1,64 @@
+from armazenamento import ArmazenamentoPessoas
+from busca import normalizar
+from cadastro import CadastroPessoas
+from pontuacao import APROVADO, tabelas_padrao
+from ranking import RankingCargos
+
+
+def esperado(tabelas, pessoas, cargo):
+    entradas = []
+    for pessoa in pessoas:
+        *_, total, situacao = tabelas.pontuar_pessoa(pessoa)
+        if situacao == APROVADO and normalizar(pessoa.cargo) == normalizar(cargo):
+            entradas.append((-total, -pessoa.idade, normalizar(pessoa.nome), pessoa.id))
+    return [entrada[-1] for entrada in sorted(entradas)]
+
+
+def test_lote_igual_a_insercoes_uma_a_uma(cohort):
+    tabelas = tabelas_padrao()
+    pessoas = cohort(2000)
+    lote, uma_a_uma = RankingCargos(tabelas), RankingCargos(tabelas)
+    lote.adicionar_lote(pessoas)
+    for pessoa in pessoas:
+        uma_a_uma.adicionar(pessoa)
+    assert lote._cargos == uma_a_uma._cargos
+    assert lote.cargos() == uma_a_uma.cargos()
+
+
+def test_classificacao_acompanha_alteracoes(cohort):
+    tabelas = tabelas_padrao()
+    pessoas = cohort(1000)
+    ranking = RankingCargos(tabelas, {"soldado": 5})
+    ranking.adicionar_lote(pessoas)
+    for pessoa in pessoas[:100]:
+        pessoa.abdominal = 60 if pessoa.abdominal is None else None
+        ranking.atualizar(pessoa)
+    for pessoa in pessoas[100:150]:
+        ranking.remover(pessoa)
+    vivos = pessoas[150:] + pessoas[:100]
+
+    assert [normalizar(cargo) for cargo in ranking.cargos()] == ["cabo", "soldado"]  # "Soldado" e "soldado" juntos
+    for cargo in ranking.cargos():
+        topo = ranking.topo(cargo, len(vivos))
+        assert [c.pessoa.id for c in topo] == esperado(tabelas, vivos, cargo)
+        assert [c.posicao for c in topo] == list(range(1, len(topo) + 1))
+        for classificado in topo[:20]:
+            assert ranking.posicao(classificado.pessoa.id) == classificado
+    soldados = ranking.topo("soldado", 6)
+    assert [c.dentro_das_vagas for c in soldados] == [True] * 5 + [False]
+    assert all(c.dentro_das_vagas is None for c in ranking.topo("Cabo", 3))
+
+
+def test_cadastro_repassa_a_carga_em_lote(tmp_path, cohort):
+    armazenamento = ArmazenamentoPessoas(str(tmp_path / "dados_taf.db"))
+    pessoas = cohort(300)
+    armazenamento.salvar_lote(pessoas)
+    cadastro = CadastroPessoas(armazenamento)
+    cadastro.carregar()
+    ranking = RankingCargos(tabelas_padrao())
+    cadastro.ouvir(ranking)
+    armazenamento.fechar()
+    referencia = RankingCargos(tabelas_padrao())
+    for pessoa in cadastro:
+        referencia.adicionar(pessoa)
+    assert ranking.posicoes() == referencia.posicoes()
@@ -0,0 +1,103 @@
+import json
+
+import pytest
+
+from armazenamento import ArmazenamentoPessoas
+from sincronizacao import PADRAO_DIARIO, mesclar
+
+CADASTRO = {"nome": "Ana", "idade": 30, "sexo": "feminino", "cargo": "Soldado"}
+
+
+class Escritor:
+    """Monta um diário à mão, com instantes escolhidos pelo teste."""
+
+    def __init__(self, pasta, dispositivo):
+        self.caminho = str(pasta / PADRAO_DIARIO.format(dispositivo))
+        self.dispositivo = dispositivo
+        self.seq = 0
+
+    def __call__(self, t, id_pessoa, op="alterar", **campos):
+        self.seq += 1
+        evento = {"d": self.dispositivo, "s": self.seq, "t": t, "id": id_pessoa, "op": op, "campos": campos}
+        with open(self.caminho, "a", encoding="utf-8") as arquivo:
+            arquivo.write(json.dumps(evento) + "\n")
+
+
+@pytest.fixture
+def banco(tmp_path):
+    armazenamento = ArmazenamentoPessoas(str(tmp_path / "dados_taf.db"))
+    yield armazenamento
+    armazenamento.fechar()
+
+
+def linhas(armazenamento):
+    return [(p.id, p.nome, p.abdominal) for p in armazenamento.carregar()]
+
+
+@pytest.mark.parametrize("ordem", [(0, 1), (1, 0)])
+def test_ultimo_escritor_vence_em_qualquer_ordem(tmp_path, banco, ordem):
+    a, b = Escritor(tmp_path, "aaa"), Escritor(tmp_path, "bbb")
+    a(1, "p1", **CADASTRO)
+    a(5, "p1", abdominal=40)
+    b(3, "p1", abdominal=35, nome="Ana Maria")
+    diarios = [a.caminho, b.caminho]
+    mesclar(banco, [diarios[i] for i in ordem])
+    assert linhas(banco) == [("p1", "Ana Maria", 40)]
+
+
+def test_empate_de_instante_decidido_pelo_dispositivo_e_sequencia(tmp_path, banco):
+    a, b = Escritor(tmp_path, "aaa"), Escritor(tmp_path, "bbb")
+    a(1, "p1", **CADASTRO)
+    b(2, "p1", abdominal=10)
+    a(2, "p1", abdominal=20)
+    a(2, "p1", abdominal=30)  # Mesmo instante e dispositivo "aaa": a sequência maior vence a anterior
+    mesclar(banco, [b.caminho, a.caminho])
+    assert linhas(banco) == [("p1", "Ana", 10)]  # "bbb" > "aaa"
+
+
+def test_mesclar_de_novo_nao_muda_nada(tmp_path, banco):
+    a, b = Escritor(tmp_path, "aaa"), Escritor(tmp_path, "bbb")
+    a(1, "p1", **CADASTRO)
+    b(2, "p1", abdominal=40)
+    mesclar(banco, [a.caminho, b.caminho])
+    antes = linhas(banco)
+
+    resultado = mesclar(banco, [a.caminho, b.caminho])
+    assert (resultado.aplicados, resultado.alterados) == (0, 0)
+
+    banco.conexao.execute("DELETE FROM sinc_diarios")  # Esquece as posições: relê os diários inteiros
+    mesclar(banco, [b.caminho, a.caminho])
+    assert linhas(banco) == antes
+
+
+def test_continua_da_posicao_da_ultima_mesclagem(tmp_path, banco):
+    a = Escritor(tmp_path, "aaa")
+    a(1, "p1", **CADASTRO)
+    a(2, "p1", abdominal=40)
+    assert mesclar(banco, [a.caminho]).aplicados == 2
+
+    a(3, "p1", abdominal=45)
+    with open(a.caminho, "a", encoding="utf-8") as arquivo:
+        arquivo.write('{"d":"aaa","s":4')  # Ainda sendo escrita: fica para a próxima
+    resultado = mesclar(banco, [a.caminho])
+    assert (resultado.aplicados, resultado.ignorados) == (1, 0)
+    assert linhas(banco) == [("p1", "Ana", 45)]
+
+
+def test_exclusao_vence_alteracao_posterior(tmp_path, banco):
+    a, b = Escritor(tmp_path, "aaa"), Escritor(tmp_path, "bbb")
+    a(1, "p1", **CADASTRO)
+    a(2, "p1", op="remover")
+    b(3, "p1", abdominal=40)
+    mesclar(banco, [a.caminho])
+    mesclar(banco, [b.caminho])
+    assert linhas(banco) == []
+
+
+def test_novos_cadastros_entram_na_ordem_do_diario(tmp_path, banco):
+    a = Escritor(tmp_path, "aaa")
+    ids = [f"p{i}" for i in range(50)]
+    for i, id_pessoa in enumerate(ids):
+        a(i, id_pessoa, **CADASTRO)
+    mesclar(banco, [a.caminho])
+    assert [id_pessoa for id_pessoa, *_ in linhas(banco)] == ids